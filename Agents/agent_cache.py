@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import weakref
+from collections import OrderedDict
+
+# Maximum number of idle agent instances kept alive across runs
+DEFAULT_AGENT_CACHE_SIZE = int(os.getenv("AGENT_CACHE_SIZE", "128"))
+
+def make_agent_key(domain, agent_type, params, definition_hash):
+    """Build the cache key of an agent.
+
+    Args:
+        domain (str): The domain of the agent.
+        agent_type (str): The type of the agent.
+        params (dict): The agent's parameters.
+        definition_hash (str): The content hash of the agent's definition file.
+
+    Returns:
+        tuple: A hashable key that identifies the agent.
+    """
+    frozen_params = json.dumps(params or {}, sort_keys=True, default=str)
+    return (domain, agent_type, frozen_params, definition_hash)
+
+def reset_agent(agent):
+    """Drop state an agent accumulated during a previous run."""
+    if isinstance(getattr(agent, 'tools_results', None), list):
+        agent.tools_results.clear()
+
+class AgentCache:
+    """Pool of idle Agent instances shared across network runs and networks.
+
+    An agent is fully determined by its domain, type, parameters and definition
+    file, so identical agents are reused instead of rebuilt. A run checks its
+    agents out and releases them when it is done; until then no other run can
+    get them, so runs never wait on each other or see each other's state. When
+    every cached agent for a key is checked out, a new one is built, and it
+    joins the pool when released. At most max_size idle agents are kept; the
+    least recently released are evicted first.
+    """
+
+    def __init__(self, max_size=DEFAULT_AGENT_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_size (int): Maximum number of idle agents kept in the cache.
+        """
+        self.max_size = max_size
+        # Idle agents keyed by agent key, least recently released keys first
+        self._idle = OrderedDict()
+        self._size = 0
+        # Keys of the agents the cache built, and the generation each checked out agent was
+        # checked out in, keyed by id(agent) and dropped when the agent is garbage collected
+        self._keys = {}
+        self._checked_out = {}
+        # Bumped by clear(), so agents checked out before are not returned to the pool
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def checkout(self, key, create):
+        """Take an idle agent out of the pool, creating one if there is none.
+
+        Args:
+            key (tuple): The key built by make_agent_key.
+            create (callable): Builds the agent when no idle one is cached.
+
+        Returns:
+            Agent: An agent the caller has to itself until it calls release.
+        """
+        with self._lock:
+            agents = self._idle.get(key)
+            agent = agents.pop() if agents else None
+            if agent is not None:
+                self._size -= 1
+                if not agents:
+                    del self._idle[key]
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if agent is not None:
+            reset_agent(agent)
+        else:
+            agent = create()
+            with self._lock:
+                self._keys[id(agent)] = key
+            # The ID can only be reused by another object once this agent is collected
+            weakref.finalize(agent, self._keys.pop, id(agent), None)
+            weakref.finalize(agent, self._checked_out.pop, id(agent), None)
+
+        with self._lock:
+            self._checked_out[id(agent)] = self._generation
+        return agent
+
+    def release(self, agents):
+        """Return checked out agents to the pool.
+
+        Agents that are not checked out, e.g. ones released already, are ignored.
+
+        Args:
+            agents (list): The agents to return.
+        """
+        with self._lock:
+            for agent in agents:
+                generation = self._checked_out.pop(id(agent), None)
+                if generation != self._generation:
+                    continue
+
+                key = self._keys[id(agent)]
+                self._idle.setdefault(key, []).append(agent)
+                self._idle.move_to_end(key)
+                self._size += 1
+
+            while self._size > self.max_size:
+                key, idle = next(iter(self._idle.items()))
+                idle.pop(0)
+                if not idle:
+                    del self._idle[key]
+                self._size -= 1
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every idle agent. Agents checked out now are dropped when released."""
+        with self._lock:
+            self._idle.clear()
+            self._size = 0
+            self._generation += 1
+
+    def stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: The number of idle and checked out agents, hits, misses and evictions.
+        """
+        return {
+            "size": self._size,
+            "max_size": self.max_size,
+            "checked_out": len(self._checked_out),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+# Shared cache used by CrewNetwork.instantiate_agents
+agent_cache = AgentCache()
@@ -1,5 +1,4 @@
-import os
-import re
+from definition_registry import registry
 
 def load_agent_definition(domain, agent_type, params=None):
     """
@@ -14,22 +13,11 @@ def load_agent_definition(domain, agent_type, params=None):
     Returns:
         dict: A dictionary with role, goal, and backstory keys
     """
-    file_path = os.path.join(os.path.dirname(__file__), 'agent_definitions', domain, f'{agent_type}_agent.md')
+    definition = registry.get_agent_definition(domain, agent_type)
     
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Agent definition file not found: {file_path}")
-    
-    with open(file_path, 'r') as file:
-        content = file.read()
-    
-    # Extract role, goal, and backstory using regex
-    role_match = re.search(r'## Role\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    goal_match = re.search(r'## Goal\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    backstory_match = re.search(r'## Backstory\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    
-    role = role_match.group(1).strip() if role_match else ""
-    goal = goal_match.group(1).strip() if goal_match else ""
-    backstory = backstory_match.group(1).strip() if backstory_match else ""
+    role = definition.role
+    goal = definition.goal
+    backstory = definition.backstory
     
     # Replace parameters if provided
     if params:
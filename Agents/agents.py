@@ -1,182 +1,153 @@
-import os
 from textwrap import dedent
-from crewai import Agent, LLM
-from crewai_tools import SerperDevTool, ScrapeWebsiteTool
+# crewai is imported in the factory methods, so loading the catalog doesn't import it
 from agent_utils import load_agent_definition
+from catalog import catalog
+from resource_pool import pool
 
 class CorporateAgents:
-    def __init__(self):
-        # Initialize LLM
-        self.llm = LLM(
-            model="gemini/gemini-2.0-flash",
-            api_key=os.getenv("GEMINI_API_KEY")
-        )
-        # Instantiate tools 
-        self.serper_tool = SerperDevTool()
-        self.scraper_tool = ScrapeWebsiteTool()
+    def __init__(self, resource_pool=None):
+        # LLM clients and tools come from the shared pool and are built on first use
+        self.pool = resource_pool or pool
+    
+    @property
+    def llm(self):
+        return self.pool.get_llm()
+    
+    @property
+    def serper_tool(self):
+        return self.pool.get_tool("serper")
+    
+    @property
+    def scraper_tool(self):
+        return self.pool.get_tool("scrape")
     
-    def create_meeting_summarizer_agent(self):
+    def create_meeting_summarizer_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('corporate_agents', 'meeting_summarizer')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_smart_email_manager_agent(self):
+    def create_smart_email_manager_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('corporate_agents', 'smart_email_manager')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_competitor_watchdog_agent(self):
+    def create_competitor_watchdog_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('corporate_agents', 'competitor_watchdog')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_customer_feedback_analyzer_agent(self):
+    def create_customer_feedback_analyzer_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('corporate_agents', 'customer_feedback_analyzer')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
 
     def get_available_agents(self):
-        return [
-            {
-                'id': 'meeting_summarizer',
-                'name': 'Meeting Summarizer',
-                'description': 'Summarizes meeting content and extracts key points',
-                'type': 'corporate',
-                'parameters': {
-                    'meeting_text': '',
-                    'pdf_path': ''
-                }
-            },
-            {
-                'id': 'smart_email_manager',
-                'name': 'Smart Email Manager',
-                'description': 'Manages and drafts professional emails',
-                'type': 'corporate',
-                'parameters': {
-                    'email_content': ''
-                }
-            },
-            {
-                'id': 'competitor_watchdog',
-                'name': 'Competitor Watchdog',
-                'description': 'Monitors and analyzes competitor activities',
-                'type': 'corporate',
-                'parameters': {
-                    'competitors': []
-                }
-            },
-            {
-                'id': 'customer_feedback_analyzer',
-                'name': 'Customer Feedback Analyzer',
-                'description': 'Analyzes customer feedback and reviews',
-                'type': 'corporate',
-                'parameters': {
-                    'feedback_data': '',
-                    'reviews_url': ''
-                }
-            }
-        ]
+        return catalog.get_agents('corporate')
 
 
 class MarketingAgents:
-    def __init__(self):
-        # Initialize LLM
-        self.llm = LLM(
-            model="gemini/gemini-2.0-flash",
-            api_key=os.getenv("GEMINI_API_KEY")
-        )
-        # Instantiate tools 
-        self.serper_tool = SerperDevTool()
-        self.scraper_tool = ScrapeWebsiteTool()
+    def __init__(self, resource_pool=None):
+        # LLM clients and tools come from the shared pool and are built on first use
+        self.pool = resource_pool or pool
+    
+    @property
+    def llm(self):
+        return self.pool.get_llm()
+    
+    @property
+    def serper_tool(self):
+        return self.pool.get_tool("serper")
+    
+    @property
+    def scraper_tool(self):
+        return self.pool.get_tool("scrape")
     
-    def create_seo_optimizer_agent(self):
+    def create_seo_optimizer_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('marketing_agents', 'seo_optimizer')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_competitor_watchdog_agent(self):
+    def create_competitor_watchdog_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('marketing_agents', 'competitor_watchdog')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_product_recommendation_agent(self):
+    def create_product_recommendation_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('marketing_agents', 'product_recommendation')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_post_creator_agent(self):
+    def create_post_creator_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('marketing_agents', 'post_creator')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
     
-    def create_smart_email_manager_agent(self):
+    def create_smart_email_manager_agent(self, llm=None, **kwargs):
         definition = load_agent_definition('marketing_agents', 'smart_email_manager')
+        from crewai import Agent
         return Agent(
             role=definition['role'],
             goal=definition['goal'],
             backstory=dedent(definition['backstory']),
             tools=[self.serper_tool, self.scraper_tool],
             verbose=True,
-            llm=self.llm
+            llm=self.pool.get_llm(llm)
         )
 
     def get_available_agents(self):
-        return [
-            {
-                'id': 'seo_optimizer',
-                'name': 'SEO Optimizer',
-                'description': 'Optimizes content for search engines',
-                'type': 'marketing',
-                'parameters': {
-                    'website_url': '',
-                    'keywords': []
-                }
-            }
-        ]
\ No newline at end of file
+        return catalog.get_agents('marketing')
\ No newline at end of file
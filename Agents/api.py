@@ -1,5 +1,10 @@
 import os
+import queue
 import sys
+import threading
+import uuid
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import json
 
@@ -9,7 +14,21 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 # Import from main module
-from main import CrewNetwork, from_frontend_data
+from main import CrewNetwork, from_frontend_data, to_frontend_data
+from agent_cache import agent_cache
+from catalog import catalog
+from batch import BatchRun, MAX_BATCH_ITEMS
+from executor import RunCancelled
+import metrics
+from metrics import run_duration
+from jobs import JobManager, QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED
+from network_patch import apply_operations
+from network_registry import DEFAULT_SPILL_DIR, NetworkRegistry
+from network_store import NetworkStore
+from llm_cache import response_cache
+from definition_registry import registry
+from resource_pool import pool
+from tracing import trace_run, trace_store
 
 # Load environment variables
 load_dotenv()
@@ -17,9 +36,22 @@ load_dotenv()
 class CrewAPI:
     """API wrapper for the CrewNetwork to be used by the frontend"""
     
-    def __init__(self):
-        """Initialize the API"""
-        self.active_networks = {}
+    def __init__(self, store=None, spill_dir=DEFAULT_SPILL_DIR):
+        """Initialize the API
+        
+        Args:
+            store (NetworkStore): Where saved networks are kept. Defaults to a store at NETWORK_STORE_PATH.
+            spill_dir (str): Directory idle networks are spilled to.
+        """
+        self._run_locks = {}
+        self._run_locks_guard = threading.Lock()
+        # Copies of running networks holding the edits made during the run, swapped in when it ends
+        self._edited = {}
+        self._edits_guard = threading.Lock()
+        # Bounded registry: idle networks are spilled to disk, but never while running
+        self.active_networks = NetworkRegistry(spill_dir=spill_dir, is_pinned=self._is_running)
+        self.store = store if store is not None else NetworkStore()
+        self.jobs = JobManager()
         
     def create_network(self, network_id=None):
         """Create a new empty network"""
@@ -29,172 +61,210 @@ class CrewAPI:
         return {"network_id": network_id, "status": "created"}
     
     def get_available_agent_types(self, domain=None):
-        """Get the available agent types for a domain"""
-        agent_types = {
-            'corporate': [
-                'meeting_summarizer',
-                'smart_email_manager',
-                'competitor_watchdog',
-                'customer_feedback_analyzer'
-            ],
-            'education': [],
-            'legal': [],
-            'marketing': []
-        }
-        
+        """Get the available agent types for a domain, or for every domain"""
+        agent_types = catalog.get()["agent_types"]
         if domain:
             return agent_types.get(domain, [])
         return agent_types
     
     def get_available_task_types(self, domain=None):
-        """Get the available task types for a domain"""
-        task_types = {
-            'corporate': [
-                'meeting_summarization',
-                'smart_email_management',
-                'competitor_watchdog',
-                'customer_feedback_analysis'
-            ],
-            'education': [],
-            'legal': [],
-            'marketing': []
-        }
-        
+        """Get the available task types for a domain, or for every domain"""
+        task_types = catalog.get()["task_types"]
         if domain:
             return task_types.get(domain, [])
         return task_types
     
     def get_agent_params(self, domain, agent_type):
-        """Get the parameters required for an agent type"""
-        # This would typically load from a config or schema file
-        params = {
-            'corporate': {
-                'meeting_summarizer': [],
-                'smart_email_manager': [],
-                'competitor_watchdog': [],
-                'customer_feedback_analyzer': []
-            }
-        }
-        
-        return params.get(domain, {}).get(agent_type, [])
+        """Get the parameters accepted by an agent type"""
+        return catalog.get()["agent_params"].get(domain, {}).get(agent_type, [])
     
     def get_task_params(self, domain, task_type):
-        """Get the parameters required for a task type"""
-        # This would typically load from a config or schema file
-        params = {
-            'corporate': {
-                'meeting_summarization': ['meeting_text', 'pdf_path'],
-                'smart_email_management': ['email_content'],
-                'competitor_watchdog': ['competitors'],
-                'customer_feedback_analysis': ['feedback_data', 'reviews_url', 'pdf_path']
-            },
-            'marketing': {
-                'seo_optimization': ['website_url', 'keywords', 'pdf_path'],
-                'competitor_watchdog': ['competitors', 'market_segment', 'pdf_path'],
-                'product_recommendation': ['customer_data', 'product_catalog', 'pdf_path'],
-                'social_media_post_creation': ['platform', 'topic', 'audience', 'objectives', 'pdf_path'],
-                'email_campaign': ['campaign_objective', 'audience_segment', 'previous_performance', 'pdf_path']
-            }
-        }
-        
-        return params.get(domain, {}).get(task_type, [])
+        """Get the parameters used by a task type's description template"""
+        return catalog.get()["task_params"].get(domain, {}).get(task_type, [])
     
     def update_network(self, network_id, data):
-        """Update a network with data from the frontend"""
+        """Update a network with data from the frontend
+        
+        While the network is running, the update is made to a copy that replaces
+        the network when the run ends, and the status is "queued".
+        """
         if network_id not in self.active_networks:
             return {"error": f"Network {network_id} not found"}
         
-        # Create a new network from the data
-        network = from_frontend_data(data)
-        self.active_networks[network_id] = network
+        def replace(current):
+            # Create a new network from the data, keeping a copy of the stored task
+            # results: they are keyed by content, so only tasks that actually changed re-run
+            network = from_frontend_data(data)
+            network.task_results = dict(current.task_results)
+            return network
+        
+        queued = self._edit(network_id, replace)
         
-        return {"network_id": network_id, "status": "updated"}
+        return {"network_id": network_id, "status": "queued" if queued else "updated"}
+    
+    def patch_network(self, network_id, operations):
+        """Apply add/update/remove operations to a network in place
+        
+        Unlike update_network, the network is not rebuilt: only the agents and
+        tasks touched by the operations lose their instances. While the network
+        is running, the operations are applied to a copy that replaces the network
+        when the run ends, and the status is "queued".
+        
+        Args:
+            network_id (str): The ID of the network to edit.
+            operations (list): The operations, as described in network_patch.
+        """
+        if network_id not in self.active_networks:
+            return {"error": f"Network {network_id} not found"}
+        
+        if not isinstance(operations, list):
+            return {"error": "operations must be a list"}
+        
+        summary = {}
+        
+        def patch(network):
+            summary.update(apply_operations(network, operations))
+            return network
+        
+        try:
+            queued = self._edit(network_id, patch)
+        except ValueError as e:
+            return {"error": str(e)}
+        
+        return {"network_id": network_id, "status": "queued" if queued else "patched", **summary}
     
     def save_network(self, network_id, filepath=None):
-        """Save a network configuration to a file"""
+        """Save a network configuration to the network store
+        
+        Args:
+            network_id (str): The ID of the network to save.
+            filepath (str): Optionally also export the configuration to this JSON file.
+        """
         if network_id not in self.active_networks:
             return {"error": f"Network {network_id} not found"}
         
-        network = self.active_networks[network_id]
+        # Save the edits made during a run too, as they are what the user sees
+        network = self._edited.get(network_id) or self.active_networks[network_id]
         
         # Convert network to serializable format
-        data = {
-            "agents": [],
-            "tasks": [],
-            "connections": []
-        }
+        data = to_frontend_data(network)
+        saved = self.store.save(network_id, data)
         
-        # Serialize agent nodes
-        for agent_id, agent_node in network.agent_nodes.items():
-            data["agents"].append({
-                "id": agent_node.id,
-                "type": agent_node.agent_type,
-                "domain": agent_node.domain,
-                "params": agent_node.params
-            })
-        
-        # Serialize task nodes
-        for task_id, task_node in network.task_nodes.items():
-            data["tasks"].append({
-                "id": task_node.id,
-                "type": task_node.task_type,
-                "domain": task_node.domain,
-                "agent_id": task_node.agent_node.id,
-                "params": task_node.params
-            })
-        
-        # Serialize connections
-        for task_id, task_node in network.task_nodes.items():
-            for dep in task_node.dependencies:
-                data["connections"].append({
-                    "from": dep.id,
-                    "to": task_id
-                })
-        
-        # Save to file if specified
+        # Export to file if specified
         if filepath:
             with open(filepath, 'w') as f:
                 json.dump(data, f, indent=2)
         
-        return {"network_id": network_id, "config": data}
+        return {**saved, "config": data}
     
-    def load_network(self, network_id, filepath=None, data=None):
-        """Load a network configuration from a file or data"""
+    def load_network(self, network_id, filepath=None, data=None, version=None):
+        """Load a network configuration from data, a file or the network store
+        
+        Args:
+            network_id (str): The ID to load the network as.
+            filepath (str): A JSON file to load the configuration from.
+            data (dict): The configuration itself.
+            version (int): When loading from the store, the version to load (defaults to the latest).
+        """
         if filepath:
             with open(filepath, 'r') as f:
                 data = json.load(f)
-        
-        if not data:
-            return {"error": "No data or filepath provided"}
+        elif not data:
+            data = self.store.load(network_id, version)
+            if data is None:
+                if version is not None:
+                    return {"error": f"Version {version} of network {network_id} not found"}
+                return {"error": "No data or filepath provided and no saved network found"}
         
         network = from_frontend_data(data)
         self.active_networks[network_id] = network
         
         return {"network_id": network_id, "status": "loaded"}
     
-    def run_network(self, network_id, name=None, description=None):
-        """Run a network and return the result"""
+    def list_saved_networks(self, domain=None, agent_type=None, task_type=None, search=None, limit=50, cursor=None):
+        """List saved networks, most recently updated first, one page at a time"""
+        try:
+            return self.store.list(domain, agent_type, task_type, search, limit, cursor)
+        except ValueError as e:
+            return {"error": str(e)}
+    
+    def get_network_versions(self, network_id):
+        """Get the version history of a saved network"""
+        versions = self.store.versions(network_id)
+        if not versions:
+            return {"error": f"Saved network {network_id} not found"}
+        
+        return {"network_id": network_id, "versions": versions}
+    
+    def delete_saved_network(self, network_id):
+        """Delete a saved network and its version history"""
+        if not self.store.delete(network_id):
+            return {"error": f"Saved network {network_id} not found"}
+        
+        return {"network_id": network_id, "status": "deleted"}
+    
+    def run_network(self, network_id, name=None, description=None, mode="sequential", max_workers=None, cancel_event=None, on_event=None, reuse_results=True, run_id=None):
+        """Run a network and return the result
+
+        Args:
+            network_id (str): The ID of the network to run.
+            name (str): The name of the crew.
+            description (str): The description of the crew.
+            mode (str): "sequential" to run a single crew, or "concurrent" to run
+                independent tasks in parallel following the dependency graph.
+            max_workers (int): Maximum number of concurrent tasks in "concurrent" mode.
+            cancel_event (threading.Event): When set, a "concurrent" run stops starting new tasks.
+            on_event (callable): Called with per-task events in "concurrent" mode.
+            reuse_results (bool): In "concurrent" mode, reuse outputs of tasks unchanged
+                since the previous run and only execute what changed.
+            run_id (str): The ID the run's trace is stored under, generated if not given.
+        """
         if network_id not in self.active_networks:
             return {"error": f"Network {network_id} not found"}
         
-        network = self.active_networks[network_id]
+        if mode not in ("sequential", "concurrent"):
+            return {"error": f"Unknown run mode {mode}"}
         
+        run_id = run_id or uuid.uuid4().hex
+        start = time.perf_counter()
         try:
-            # Instantiate agents and tasks
-            network.instantiate_agents()
-            network.instantiate_tasks()
+            # A network's nodes hold per-run task instances, so runs of the same network are
+            # serialized; holding the lock also keeps the registry from evicting the network
+            with self._running(network_id), trace_run(run_id, "run_network", network_id=network_id, mode=mode):
+                start = time.perf_counter()
+                network = self.active_networks[network_id]
+                
+                # Instantiate agents and tasks; the agents are checked out of the shared cache
+                network.instantiate_agents()
+                try:
+                    network.instantiate_tasks()
+                    
+                    if mode == "concurrent":
+                        result = network.run_concurrent(
+                            name=name or f"Crew {network_id}",
+                            max_workers=max_workers,
+                            cancel_event=cancel_event,
+                            on_event=on_event,
+                            reuse_results=reuse_results
+                        )
+                    else:
+                        # Build and run the crew
+                        crew = network.build_crew(
+                            name=name or f"Crew {network_id}",
+                            description=description
+                        )
+                        result = crew.kickoff()
+                finally:
+                    # Other networks can use the agents once the run is over
+                    network.release_agents()
             
-            # Build the crew
-            crew = network.build_crew(
-                name=name or f"Crew {network_id}",
-                description=description
-            )
-            
-            # Run the crew
-            result = crew.kickoff()
+            # Stored task results make the network bigger
+            self.active_networks.refresh(network_id)
             
             # Convert CrewOutput to dictionary
-            if hasattr(result, 'dict'):
+            if isinstance(result, dict):
+                result_dict = result
+            elif hasattr(result, 'dict'):
                 result_dict = result.dict()
             elif hasattr(result, '__dict__'):
                 result_dict = result.__dict__
@@ -202,9 +272,326 @@ class CrewAPI:
                 # If it's a string or primitive type
                 result_dict = {"output": str(result)}
             
-            return {"network_id": network_id, "result": result_dict}
+            run_duration.observe(time.perf_counter() - start, network_id=network_id, mode=mode, status="succeeded")
+            return {"network_id": network_id, "run_id": run_id, "result": result_dict}
+        except Exception as e:
+            status = "cancelled" if isinstance(e, RunCancelled) else "failed"
+            run_duration.observe(time.perf_counter() - start, network_id=network_id, mode=mode, status=status)
+            return {"error": str(e), "run_id": run_id}
+    
+    def _is_running(self, network_id):
+        """Check whether a network is being run or edited"""
+        lock = self._run_locks.get(network_id)
+        return lock is not None and lock.locked()
+    
+    def get_network_registry_stats(self):
+        """Get memory accounting of the active networks and the ones spilled to disk"""
+        return self.active_networks.stats()
+    
+    def _run_lock(self, network_id):
+        """Get the lock serializing runs of a network"""
+        with self._run_locks_guard:
+            return self._run_locks.setdefault(network_id, threading.Lock())
+    
+    @contextmanager
+    def _running(self, network_id):
+        """Hold a network's run lock, then swap in the copy edited during the run"""
+        lock = self._run_lock(network_id)
+        lock.acquire()
+        try:
+            yield
+        finally:
+            # Swap and release together, so an edit either reaches the copy or sees the run over
+            with self._edits_guard:
+                try:
+                    edited = self._edited.pop(network_id, None)
+                    if edited is not None:
+                        # Keep this run's outputs; they only get reused if their task is unchanged
+                        for task_id, stored in self.active_networks[network_id].task_results.items():
+                            if task_id in edited.task_nodes:
+                                edited.task_results[task_id] = stored
+                        self.active_networks[network_id] = edited
+                finally:
+                    lock.release()
+    
+    def _edit(self, network_id, edit):
+        """Edit a network, or a copy of it while it is running
+        
+        A run keeps the network it started with until it ends, so the frontend
+        can keep editing it meanwhile: the edits are made to a copy that
+        _running swaps in after the run.
+        
+        Args:
+            network_id (str): The ID of the network to edit.
+            edit (callable): Takes the network and returns the edited network,
+                which may be the same one edited in place.
+        
+        Returns:
+            bool: Whether the edit was queued until the end of a run.
+        """
+        lock = self._run_lock(network_id)
+        with self._edits_guard:
+            if lock.acquire(blocking=False):
+                try:
+                    # Setting it again also re-estimates its size, which added or removed nodes change
+                    self.active_networks[network_id] = edit(self.active_networks[network_id])
+                finally:
+                    lock.release()
+                return False
+            
+            network = self._edited.get(network_id)
+            if network is None:
+                current = self.active_networks[network_id]
+                network = from_frontend_data(to_frontend_data(current))
+                network.task_results = dict(current.task_results)
+            self._edited[network_id] = edit(network)
+            return True
+    
+    def submit_run(self, network_id, name=None, description=None, mode="sequential", max_workers=None, reuse_results=True):
+        """Queue a network run in the background and return its job ID immediately"""
+        if network_id not in self.active_networks:
+            return {"error": f"Network {network_id} not found"}
+        
+        if mode not in ("sequential", "concurrent"):
+            return {"error": f"Unknown run mode {mode}"}
+        
+        job = self.jobs.submit(
+            network_id, self.run_network, network_id, name, description, mode, max_workers,
+            reuse_results=reuse_results,
+            run_id=uuid.uuid4().hex
+        )
+        return job.to_dict()
+    
+    def stream_run(self, network_id, name=None, mode="sequential", max_workers=None, reuse_results=True, keepalive=15):
+        """Run a network in the background and yield an event as each task starts and finishes
+        
+        Tasks are scheduled from the dependency graph so that per-task events are
+        available; "sequential" mode runs one task at a time.
+        
+        Args:
+            network_id (str): The ID of the network to run.
+            name (str): The name of the workflow.
+            mode (str): "sequential" or "concurrent".
+            max_workers (int): Maximum number of concurrent tasks in "concurrent" mode.
+            reuse_results (bool): Reuse outputs of tasks unchanged since the previous run.
+            keepalive (float): Seconds without events after which None is yielded,
+                so the caller can keep the connection alive.
+        
+        Returns:
+            generator: Event dicts, ending with a run_succeeded, run_failed or run_cancelled event.
+        """
+        if network_id not in self.active_networks:
+            return {"error": f"Network {network_id} not found"}
+        
+        if mode not in ("sequential", "concurrent"):
+            return {"error": f"Unknown run mode {mode}"}
+        
+        events = queue.Queue()
+        job = self.jobs.submit(
+            network_id, self.run_network, network_id, name, None, "concurrent",
+            max_workers if mode == "concurrent" else 1,
+            on_event=events.put,
+            reuse_results=reuse_results,
+            run_id=uuid.uuid4().hex
+        )
+        return self._stream_job(job, events, "run", keepalive)
+    
+    def _stream_job(self, job, events, prefix, keepalive):
+        """Yield the events a background job puts on a queue, ending with its final status
+        
+        Args:
+            job (Job): The job, whose callable puts event dicts on the queue.
+            events (queue.Queue): The queue of events.
+            prefix (str): Prefix of the first (queued) and last (status) event names.
+            keepalive (float): Seconds without events after which None is yielded.
+        """
+        job.future.add_done_callback(lambda _: events.put(None))
+        
+        def generate():
+            try:
+                yield {"event": f"{prefix}_queued", "job_id": job.id, "run_id": job.run_id, "network_id": job.network_id}
+                while True:
+                    try:
+                        event = events.get(timeout=keepalive)
+                    except queue.Empty:
+                        yield None
+                        continue
+                    if event is None:
+                        break
+                    yield event
+                
+                final = job.to_dict(include_result=True)
+                final["event"] = f"{prefix}_{job.status}"
+                yield final
+            finally:
+                # Stop the run if the client disconnects before it has finished
+                self.jobs.cancel(job.id)
+        
+        return generate()
+    
+    def run_batch(self, network_id, items, concurrency=None, max_workers=None, cancel_event=None, on_item=None, run_id=None):
+        """Run a network once per batch item, several items at a time
+        
+        The network is copied once as a template, so edits made while the batch
+        runs do not affect it. Each item runs independently: a failing item is
+        reported in its result and the others carry on.
+        
+        Args:
+            network_id (str): The ID of the network to use as a template.
+            items (list): Param overrides keyed by task ID, one dict per item (see batch).
+            concurrency (int): Maximum number of items running at the same time.
+            max_workers (int): Maximum number of concurrent tasks within an item.
+            cancel_event (threading.Event): When set, no further items are started.
+            on_item (callable): Called with each item's result as it finishes.
+            run_id (str): The ID the batch's trace is stored under, generated if not given.
+        """
+        if network_id not in self.active_networks:
+            return {"error": f"Network {network_id} not found"}
+        
+        error = self._validate_batch(items)
+        if error:
+            return {"error": error}
+        
+        run_id = run_id or uuid.uuid4().hex
+        try:
+            with trace_run(run_id, "run_batch", network_id=network_id, items=len(items)):
+                with self._running(network_id):
+                    template = from_frontend_data(to_frontend_data(self.active_networks[network_id]))
+                template.name = f"Batch {network_id}"
+                
+                batch = BatchRun(template, items, concurrency, max_workers or 1, cancel_event, on_item)
+                result = batch.run()
+            return {"network_id": network_id, "run_id": run_id, "result": result}
         except Exception as e:
+            return {"error": str(e), "run_id": run_id}
+    
+    def submit_batch(self, network_id, items, concurrency=None, max_workers=None):
+        """Queue a batch run in the background and return its job ID immediately"""
+        if network_id not in self.active_networks:
+            return {"error": f"Network {network_id} not found"}
+        
+        error = self._validate_batch(items)
+        if error:
+            return {"error": error}
+        
+        job = self.jobs.submit(
+            network_id, self.run_batch, network_id, items, concurrency, max_workers,
+            run_id=uuid.uuid4().hex
+        )
+        return job.to_dict()
+    
+    def stream_batch(self, network_id, items, concurrency=None, max_workers=None, keepalive=15):
+        """Run a batch in the background and yield each item's result as it finishes
+        
+        Returns:
+            generator: item_succeeded, item_failed and item_cancelled events, ending with
+                a batch_succeeded, batch_failed or batch_cancelled event carrying the statistics.
+        """
+        if network_id not in self.active_networks:
+            return {"error": f"Network {network_id} not found"}
+        
+        error = self._validate_batch(items)
+        if error:
+            return {"error": error}
+        
+        events = queue.Queue()
+        job = self.jobs.submit(
+            network_id, self.run_batch, network_id, items, concurrency, max_workers,
+            on_item=lambda result: events.put({"event": f"item_{result['status']}", **result}),
+            run_id=uuid.uuid4().hex
+        )
+        
+        stream = self._stream_job(job, events, "batch", keepalive)
+        
+        def generate():
+            try:
+                for event in stream:
+                    # Item results were already streamed, so the final event only carries the statistics
+                    if event is not None and isinstance(event.get("result"), dict):
+                        event["result"] = {"stats": event["result"].get("stats")}
+                    yield event
+            finally:
+                stream.close()
+        
+        return generate()
+    
+    def _validate_batch(self, items):
+        """Get the error of an invalid list of batch items, or None"""
+        if not isinstance(items, list) or not items:
+            return "items must be a non-empty list"
+        if len(items) > MAX_BATCH_ITEMS:
+            return f"A batch holds at most {MAX_BATCH_ITEMS} items"
+        return None
+    
+    def get_cache_stats(self):
+        """Get hit/miss statistics of the LLM response, agent and definition caches"""
+        return {
+            "llm_responses": response_cache.stats() if response_cache else {"enabled": False},
+            "agents": agent_cache.stats(),
+            "definitions": {"hits": registry.hits, "misses": registry.misses}
+        }
+    
+    def collect_metrics(self):
+        """Copy network registry, job, rate limiter and cache statistics into the metrics"""
+        in_memory, spilled = self.active_networks.counts()
+        metrics.active_networks.set(in_memory, location="memory")
+        metrics.active_networks.set(spilled, location="disk")
+        
+        statuses = [job.status for job in self.jobs.list()]
+        for status in (QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED):
+            metrics.jobs.set(statuses.count(status), status=status)
+        
+        for limiter in pool.rate_limit_stats():
+            metrics.llm_in_flight.set(limiter["in_flight"], model=limiter["name"])
+            for priority, count in limiter["queued"].items():
+                metrics.llm_queue_depth.set(count, model=limiter["name"], priority=priority)
+        
+        if response_cache:
+            cache_stats = response_cache.stats()
+            metrics.record_cache("llm_responses", cache_stats["hits"], cache_stats["misses"])
+        metrics.record_cache("agents", agent_cache.hits, agent_cache.misses)
+        metrics.record_cache("definitions", registry.hits, registry.misses)
+    
+    def get_llm_stats(self):
+        """Get queue depth and throttling statistics of the LLM rate limiters"""
+        return {"rate_limiters": pool.rate_limit_stats()}
+    
+    def get_run_trace(self, run_id, format="chrome"):
+        """Get the span trace of a run or batch
+        
+        Args:
+            run_id (str): The run ID returned when the run was started.
+            format (str): "chrome" for Chrome trace_event JSON or "otlp" for OTLP-style JSON.
+        """
+        try:
+            trace = trace_store.get(run_id, format)
+        except ValueError as e:
             return {"error": str(e)}
+        
+        if trace is None:
+            return {"error": f"Trace of run {run_id} not found"}
+        
+        return trace
+    
+    def get_job(self, job_id, include_result=False):
+        """Get the status, and optionally the result, of a background run"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return {"error": f"Job {job_id} not found"}
+        
+        return job.to_dict(include_result=include_result)
+    
+    def list_jobs(self):
+        """Get the status of every tracked background run"""
+        return {"jobs": [job.to_dict() for job in self.jobs.list()]}
+    
+    def cancel_job(self, job_id):
+        """Cancel a queued or running background run"""
+        job = self.jobs.cancel(job_id)
+        if job is None:
+            return {"error": f"Job {job_id} not found"}
+        
+        return job.to_dict()
 
 # Example usage
 if __name__ == "__main__":
@@ -243,7 +630,7 @@ if __name__ == "__main__":
     api.update_network(network_id, test_config)
     
     # Save the network configuration
-    api.save_network(network_id, "test_network.json")
+    print(api.save_network(network_id)["version"])
     
     # Run the network
     # This is commented out to prevent actual execution which requires API keys
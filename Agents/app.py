@@ -1,10 +1,15 @@
 import os
 import sys
-from flask import Flask, request, jsonify
+import json
+import time
+
+# Startup is timed from here, so the timings include importing Flask and the API modules
+_startup_started = time.perf_counter()
+
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
 from dotenv import load_dotenv
-from main import CrewNetwork, from_frontend_data
-from agents import CorporateAgents, MarketingAgents
+from main import from_frontend_data
 
 # Add the current directory to the path so imports work correctly
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -12,6 +17,10 @@ if current_dir not in sys.path:
     sys.path.append(current_dir)
 
 from api import CrewAPI
+from catalog import catalog
+from definition_registry import registry
+from metrics import metrics, http_request_duration
+import startup
 
 # Load environment variables
 load_dotenv()
@@ -21,23 +30,81 @@ app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})  # Enable CORS for all routes
 
 # Initialize the CrewAPI
-api = CrewAPI()
+with startup.timed("api_init"):
+    api = CrewAPI()
+
+# Parse every agent and task definition once at startup
+with startup.timed("definitions_preload"):
+    print(f"Loaded {registry.preload()} agent and task definitions")
+with startup.timed("catalog_build"):
+    catalog.get()
+
+# Copy cache, queue and registry statistics into the metrics on every scrape
+metrics.on_collect(api.collect_metrics)
+
+# crewai is not imported yet; routes that don't run agents are served right away
+startup.record("app_import", time.perf_counter() - _startup_started)
+print(f"Ready in {startup.timings['app_import']:.2f}s (agent stack deferred)")
+if startup.AGENT_STACK_WARMUP:
+    startup.warm_up_in_background()
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_duration(response):
+    # Label by route pattern rather than path, so network IDs don't create a series each
+    route = request.url_rule.rule if request.url_rule else "unmatched"
+    http_request_duration.observe(
+        time.perf_counter() - g.request_start,
+        method=request.method,
+        route=route,
+        status=response.status_code
+    )
+    return response
 
 @app.route('/', methods=['GET'])
 def index():
     """Simple test route to check if the server is running"""
     return jsonify({"status": "API is running", "available_routes": [
+        "/health [GET]",
         "/networks [POST]",
         "/agents/types [GET]",
         "/tasks/types [GET]",
         "/agents/params [GET]",
         "/tasks/params [GET]",
         "/networks/<network_id> [PUT]",
+        "/networks/<network_id> [PATCH]",
         "/networks/<network_id>/save [POST]",
         "/networks/<network_id>/load [POST]",
-        "/networks/<network_id>/run [POST]"
+        "/saved-networks [GET]",
+        "/saved-networks/<network_id>/versions [GET]",
+        "/saved-networks/<network_id> [DELETE]",
+        "/networks/<network_id>/run [POST]",
+        "/networks/<network_id>/run/stream [GET, POST]",
+        "/networks/<network_id>/batch [POST]",
+        "/networks/<network_id>/batch/stream [POST]",
+        "/runs/<run_id>/trace [GET]",
+        "/jobs [GET]",
+        "/jobs/<job_id> [GET]",
+        "/jobs/<job_id>/result [GET]",
+        "/jobs/<job_id>/cancel [POST]",
+        "/cache/stats [GET]",
+        "/llm/stats [GET]",
+        "/metrics [GET]",
+        "/admin/networks [GET]"
     ]})
 
+@app.route('/health', methods=['GET'])
+def health():
+    """Report readiness and the measured startup timings"""
+    return jsonify({
+        "status": "ok",
+        "agent_stack_loaded": startup.agent_stack_loaded(),
+        "startup_seconds": startup.timings
+    })
+
 @app.route('/networks', methods=['POST'])
 def create_network():
     """Create a new network"""
@@ -46,19 +113,29 @@ def create_network():
     response = api.create_network(network_id)
     return jsonify(response)
 
+def catalog_response(key, select):
+    """Serve part of the catalog with a strong ETag, answering 304 when the client's copy is current"""
+    body, etag = catalog.render(key, select)
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    # Clients may keep the response but must revalidate it on every use
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 @app.route('/agents/types', methods=['GET'])
 def get_agent_types():
     """Get available agent types"""
     domain = request.args.get('domain')
-    types = api.get_available_agent_types(domain)
-    return jsonify(types)
+    return catalog_response(("agent_types", domain), lambda: api.get_available_agent_types(domain))
 
 @app.route('/tasks/types', methods=['GET'])
 def get_task_types():
     """Get available task types"""
     domain = request.args.get('domain')
-    types = api.get_available_task_types(domain)
-    return jsonify(types)
+    return catalog_response(("task_types", domain), lambda: api.get_available_task_types(domain))
 
 @app.route('/agents/params', methods=['GET'])
 def get_agent_params():
@@ -69,8 +146,7 @@ def get_agent_params():
     if not domain or not agent_type:
         return jsonify({"error": "Domain and type are required"}), 400
     
-    params = api.get_agent_params(domain, agent_type)
-    return jsonify(params)
+    return catalog_response(("agent_params", domain, agent_type), lambda: api.get_agent_params(domain, agent_type))
 
 @app.route('/tasks/params', methods=['GET'])
 def get_task_params():
@@ -81,8 +157,7 @@ def get_task_params():
     if not domain or not task_type:
         return jsonify({"error": "Domain and type are required"}), 400
     
-    params = api.get_task_params(domain, task_type)
-    return jsonify(params)
+    return catalog_response(("task_params", domain, task_type), lambda: api.get_task_params(domain, task_type))
 
 @app.route('/networks/<network_id>', methods=['PUT'])
 def update_network(network_id):
@@ -95,10 +170,24 @@ def update_network(network_id):
     
     return jsonify(response)
 
+@app.route('/networks/<network_id>', methods=['PATCH'])
+def patch_network(network_id):
+    """Apply incremental add/update/remove operations to a network"""
+    if network_id not in api.active_networks:
+        return jsonify({"error": f"Network {network_id} not found"}), 404
+    
+    data = request.json or {}
+    response = api.patch_network(network_id, data.get('operations', []))
+    
+    if 'error' in response:
+        return jsonify(response), 400
+    
+    return jsonify(response)
+
 @app.route('/networks/<network_id>/save', methods=['POST'])
 def save_network(network_id):
-    """Save a network configuration"""
-    data = request.json
+    """Save a network configuration to the network store"""
+    data = request.json or {}
     filepath = data.get('filepath')
     response = api.save_network(network_id, filepath)
     
@@ -109,43 +198,233 @@ def save_network(network_id):
 
 @app.route('/networks/<network_id>/load', methods=['POST'])
 def load_network(network_id):
-    """Load a network configuration"""
-    data = request.json
+    """Load a network configuration from data, a file or the network store"""
+    data = request.json or {}
     filepath = data.get('filepath')
     config = data.get('config')
+    version = data.get('version')
+    
+    response = api.load_network(network_id, filepath, config, version)
+    
+    if 'error' in response:
+        return jsonify(response), 400
     
-    response = api.load_network(network_id, filepath, config)
+    return jsonify(response)
+
+@app.route('/saved-networks', methods=['GET'])
+def list_saved_networks():
+    """List saved networks, filtered by domain, agent/task type or ID text"""
+    response = api.list_saved_networks(
+        domain=request.args.get('domain'),
+        agent_type=request.args.get('agent_type'),
+        task_type=request.args.get('task_type'),
+        search=request.args.get('q'),
+        limit=request.args.get('limit', 50, type=int),
+        cursor=request.args.get('cursor')
+    )
     
     if 'error' in response:
         return jsonify(response), 400
     
     return jsonify(response)
 
+@app.route('/saved-networks/<network_id>/versions', methods=['GET'])
+def get_network_versions(network_id):
+    """Get the version history of a saved network"""
+    response = api.get_network_versions(network_id)
+    
+    if 'error' in response:
+        return jsonify(response), 404
+    
+    return jsonify(response)
+
+@app.route('/saved-networks/<network_id>', methods=['DELETE'])
+def delete_saved_network(network_id):
+    """Delete a saved network and its version history"""
+    response = api.delete_saved_network(network_id)
+    
+    if 'error' in response:
+        return jsonify(response), 404
+    
+    return jsonify(response)
+
 @app.route('/networks/<network_id>/run', methods=['POST'])
 def run_network(network_id):
     """Run a network and return the result"""
     data = request.json
     name = data.get('name')
     description = data.get('description')
+    mode = data.get('mode', 'sequential')
+    max_workers = data.get('max_workers')
+    # "force" re-executes every task instead of reusing unchanged results
+    reuse_results = not data.get('force', False)
+    
+    # Runs can take minutes, so clients may ask for a background job instead of waiting
+    if data.get('async'):
+        response = api.submit_run(network_id, name, description, mode, max_workers, reuse_results)
+        
+        if 'error' in response:
+            return jsonify(response), 400
+        
+        return jsonify(response), 202
     
-    response = api.run_network(network_id, name, description)
+    response = api.run_network(network_id, name, description, mode, max_workers, reuse_results=reuse_results)
     
     if 'error' in response:
         return jsonify(response), 400
     
     return jsonify(response)
 
+@app.route('/networks/<network_id>/run/stream', methods=['GET', 'POST'])
+def stream_network_run(network_id):
+    """Run a network and stream per-task results as server-sent events"""
+    # EventSource can only send GET requests, so options may also come as query args
+    if request.method == 'POST':
+        data = request.json or {}
+        max_workers = data.get('max_workers')
+        force = bool(data.get('force', False))
+    else:
+        data = request.args
+        max_workers = request.args.get('max_workers', type=int)
+        force = request.args.get('force', 'false').lower() in ('1', 'true')
+    name = data.get('name')
+    mode = data.get('mode', 'sequential')
+    
+    events = api.stream_run(network_id, name, mode, max_workers, reuse_results=not force)
+    
+    if isinstance(events, dict):
+        return jsonify(events), 400
+    
+    return event_stream(events)
+
+@app.route('/networks/<network_id>/batch', methods=['POST'])
+def run_batch(network_id):
+    """Run a network once per item of a list of param overrides"""
+    data = request.json or {}
+    items = data.get('items')
+    concurrency = data.get('concurrency')
+    max_workers = data.get('max_workers')
+    
+    # Large batches can take a long time, so clients may ask for a background job instead of waiting
+    if data.get('async'):
+        response = api.submit_batch(network_id, items, concurrency, max_workers)
+        
+        if 'error' in response:
+            return jsonify(response), 400
+        
+        return jsonify(response), 202
+    
+    response = api.run_batch(network_id, items, concurrency, max_workers)
+    
+    if 'error' in response:
+        return jsonify(response), 400
+    
+    return jsonify(response)
+
+@app.route('/networks/<network_id>/batch/stream', methods=['POST'])
+def stream_batch(network_id):
+    """Run a batch and stream each item's result as server-sent events"""
+    data = request.json or {}
+    events = api.stream_batch(network_id, data.get('items'), data.get('concurrency'), data.get('max_workers'))
+    
+    if isinstance(events, dict):
+        return jsonify(events), 400
+    
+    return event_stream(events)
+
+def event_stream(events):
+    """Send the events of a run or batch as server-sent events"""
+    def generate():
+        try:
+            for event in events:
+                if event is None:
+                    # Comment line that keeps proxies from closing an idle connection
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+        finally:
+            # Cancels the run if the client disconnected early
+            events.close()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/runs/<run_id>/trace', methods=['GET'])
+def get_run_trace(run_id):
+    """Get the span trace of a run as Chrome trace_event JSON (default) or OTLP-style JSON"""
+    response = api.get_run_trace(run_id, request.args.get('format', 'chrome'))
+    
+    if 'error' in response:
+        return jsonify(response), 404 if 'not found' in response['error'] else 400
+    
+    return jsonify(response)
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    """List background runs"""
+    return jsonify(api.list_jobs())
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get the status of a background run"""
+    response = api.get_job(job_id)
+    
+    if 'error' in response and 'job_id' not in response:
+        return jsonify(response), 404
+    
+    return jsonify(response)
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """Get the result of a background run"""
+    response = api.get_job(job_id, include_result=True)
+    
+    if 'error' in response and 'job_id' not in response:
+        return jsonify(response), 404
+    
+    # The result is not available until the job has finished
+    if response['status'] in ('queued', 'running'):
+        return jsonify(response), 202
+    
+    return jsonify(response)
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a background run"""
+    response = api.cancel_job(job_id)
+    
+    if 'error' in response and 'job_id' not in response:
+        return jsonify(response), 404
+    
+    return jsonify(response)
+
+@app.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get cache hit/miss statistics"""
+    return jsonify(api.get_cache_stats())
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Expose metrics in the Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/llm/stats', methods=['GET'])
+def get_llm_stats():
+    """Get queue depth and throttling statistics of the LLM rate limiters"""
+    return jsonify(api.get_llm_stats())
+
+@app.route('/admin/networks', methods=['GET'])
+def get_network_registry_stats():
+    """Get per-network memory accounting of the network registry"""
+    return jsonify(api.get_network_registry_stats())
+
 @app.route('/agents', methods=['GET'])
 def get_agents():
     try:
-        corporate_agents = CorporateAgents()
-        marketing_agents = MarketingAgents()
-        
-        agents = []
-        agents.extend(corporate_agents.get_available_agents())
-        agents.extend(marketing_agents.get_available_agents())
-        
-        return jsonify(agents)
+        return catalog_response(("agents",), catalog.get_agents)
     except Exception as e:
         print(f"Error getting agents: {str(e)}")
         return jsonify({"error": str(e)}), 500
@@ -0,0 +1,191 @@
+"""Run one network over many parameter sets.
+
+A batch takes a template network and a list of items. Each item maps task
+IDs to param overrides, merged into the template's params the same way as
+PATCH updates (a null value removes a param):
+
+    [{"summarize": {"meeting_text": "..."}}, {"summarize": {"meeting_text": "..."}}]
+
+Items run concurrently on a bounded pool. Every worker lane owns one set of
+agent instances, checked out of the agent cache once and reused for all the
+items it runs, so only the per-item tasks are created for each item. A
+failing item does not affect the others.
+"""
+import os
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from agent_cache import agent_cache
+from executor import DAGExecutor, RunCancelled
+from main import CrewNetwork
+from network_patch import merge_params
+from rate_limiter import BATCH, llm_priority
+from tracing import span
+
+# Number of batch items running at the same time
+DEFAULT_BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+# Largest batch accepted in one request
+MAX_BATCH_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+def build_item_network(template, overrides, agents):
+    """Build the network of one batch item from the template.
+
+    Args:
+        template (CrewNetwork): The template network.
+        overrides (dict): Param overrides keyed by task ID.
+        agents (dict): Agent instances keyed by agent ID.
+
+    Returns:
+        CrewNetwork: A network sharing the given agents, with the item's task params.
+    """
+    if not isinstance(overrides, dict):
+        raise ValueError("A batch item must map task IDs to param overrides")
+
+    unknown = [task_id for task_id in overrides if task_id not in template.task_nodes]
+    if unknown:
+        raise ValueError(f"Unknown task IDs in batch item: {', '.join(unknown)}")
+
+    network = CrewNetwork()
+    network.name = template.name
+    for agent_id, node in template.agent_nodes.items():
+        network.add_agent_node(agent_id, node.agent_type, node.domain, node.params)
+        network.agent_nodes[agent_id].agent_instance = agents[agent_id]
+
+    for task_id, node in template.task_nodes.items():
+        changes = overrides.get(task_id) or {}
+        if not isinstance(changes, dict):
+            raise ValueError(f"Overrides of task {task_id} must be an object")
+        network.add_task_node(task_id, node.task_type, node.agent_node.id, node.domain, merge_params(node.params, changes))
+
+    for task_id, node in template.task_nodes.items():
+        for dep in node.dependencies:
+            network.add_task_dependency(task_id, dep.id)
+
+    return network
+
+def percentile(values, fraction):
+    """Get a percentile of a list of values by nearest rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class BatchRun:
+    """Executes a template network once per batch item."""
+
+    def __init__(self, template, items, concurrency=None, max_workers=1, cancel_event=None, on_item=None):
+        """Initialize the batch.
+
+        Args:
+            template (CrewNetwork): The template network. It is not modified.
+            items (list): Param overrides keyed by task ID, one dict per item.
+            concurrency (int): Maximum number of items running at the same time.
+            max_workers (int): Maximum number of concurrent tasks within an item.
+            cancel_event (threading.Event): When set, no further items are started.
+            on_item (callable): Called from worker threads with each item's result as it finishes.
+        """
+        self.template = template
+        self.items = items
+        self.concurrency = max(1, min(concurrency or DEFAULT_BATCH_CONCURRENCY, len(items) or 1))
+        self.max_workers = max_workers
+        self.cancel_event = cancel_event or threading.Event()
+        self.on_item = on_item
+        self._lanes = queue.Queue()
+        self._lane_agents = {}
+
+    def run(self):
+        """Run every item.
+
+        Returns:
+            dict: The per-item results in input order and the batch statistics.
+        """
+        # Lane 0 uses the template's agents; other lanes check theirs out on first use
+        self.template.instantiate_agents()
+        self._lane_agents[0] = {agent_id: node.agent_instance for agent_id, node in self.template.agent_nodes.items()}
+        for lane in range(self.concurrency):
+            self._lanes.put(lane)
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="crew-batch") as pool:
+                futures = [
+                    pool.submit(contextvars.copy_context().run, self._run_item, index, item)
+                    for index, item in enumerate(self.items)
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            for agents in self._lane_agents.values():
+                agent_cache.release(agents.values())
+            self.template.release_agents()
+
+        return {"items": results, "stats": self.stats(results, time.perf_counter() - start)}
+
+    def stats(self, results, duration):
+        """Summarize the outcome and throughput of the batch.
+
+        Args:
+            results (list): The per-item results.
+            duration (float): Wall-clock seconds the batch took.
+
+        Returns:
+            dict: Item counts by status, throughput and item latency percentiles.
+        """
+        latencies = [result["duration"] for result in results if result["status"] != CANCELLED]
+        counts = {status: sum(1 for result in results if result["status"] == status) for status in (SUCCEEDED, FAILED, CANCELLED)}
+        return {
+            "items": len(results),
+            **counts,
+            "concurrency": self.concurrency,
+            "agent_sets": len(self._lane_agents),
+            "duration": duration,
+            "items_per_second": (counts[SUCCEEDED] + counts[FAILED]) / duration if duration else 0.0,
+            "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+            "latency_p50": percentile(latencies, 0.5),
+            "latency_p95": percentile(latencies, 0.95),
+            "latency_max": max(latencies, default=0.0)
+        }
+
+    def _agents_for_lane(self, lane):
+        if lane not in self._lane_agents:
+            # Each lane has its own instances, so items on different lanes never wait on an agent lock
+            self._lane_agents[lane] = {
+                agent_id: self.template.checkout_agent(node) for agent_id, node in self.template.agent_nodes.items()
+            }
+        return self._lane_agents[lane]
+
+    def _run_item(self, index, overrides):
+        result = {"index": index}
+        if self.cancel_event.is_set():
+            result.update(status=CANCELLED, duration=0.0)
+            return self._finish(result)
+
+        lane = self._lanes.get()
+        start = time.perf_counter()
+        try:
+            with span("batch_item", index=index, lane=lane):
+                network = build_item_network(self.template, overrides, self._agents_for_lane(lane))
+                network.instantiate_tasks()
+                executor = DAGExecutor(network, max_workers=self.max_workers, cancel_event=self.cancel_event)
+                # Interactive runs sharing the LLM quota are served before batch items
+                with llm_priority(BATCH):
+                    result.update(status=SUCCEEDED, outputs=executor.run())
+        except RunCancelled:
+            result.update(status=CANCELLED)
+        except Exception as e:
+            result.update(status=FAILED, error=str(e))
+        finally:
+            self._lanes.put(lane)
+
+        result["duration"] = time.perf_counter() - start
+        return self._finish(result)
+
+    def _finish(self, result):
+        if self.on_item is not None:
+            self.on_item(result)
+        return result
@@ -0,0 +1,72 @@
+"""Benchmark of edit latency on large networks: full PUT rebuild vs PATCH.
+
+Each edit changes one task's params, as the frontend does on every keystroke.
+The PUT path rebuilds the whole network with from_frontend_data, the PATCH
+path applies a single update_task operation in place.
+
+Usage:
+    python benchmark_network_edits.py [--sizes 100 1000 10000] [--edits 200]
+"""
+import argparse
+import os
+import tempfile
+import time
+from api import CrewAPI
+from network_store import NetworkStore
+
+def generate_config(size, width=20):
+    """Generate a layered frontend network config with `size` tasks."""
+    config = {"agents": [], "tasks": [], "connections": []}
+    for i in range(size):
+        config["agents"].append({"id": f"agent_{i}", "type": "competitor_watchdog", "domain": "corporate"})
+        config["tasks"].append({
+            "id": f"task_{i}",
+            "type": "competitor_watchdog",
+            "domain": "corporate",
+            "agent_id": f"agent_{i}",
+            "params": {"competitors": f"Competitor {i}"}
+        })
+        if i >= width:
+            config["connections"].append({"from": f"task_{i - width}", "to": f"task_{i}"})
+    return config
+
+def time_edits(edit, edits):
+    """Return the mean latency of `edits` calls to edit(i), in milliseconds."""
+    start = time.perf_counter()
+    for i in range(edits):
+        edit(i)
+    return (time.perf_counter() - start) * 1000 / edits
+
+def run_benchmark(sizes, edits):
+    print(f"{'tasks':>8} {'PUT (ms)':>10} {'PATCH (ms)':>11} {'speedup':>8}")
+    for size in sizes:
+        # Keep the network store and spilled networks out of the working tree
+        with tempfile.TemporaryDirectory() as directory:
+            api = CrewAPI(
+                store=NetworkStore(path=os.path.join(directory, 'networks.sqlite3')),
+                spill_dir=os.path.join(directory, 'networks')
+            )
+            api.create_network("bench")
+            config = generate_config(size)
+            api.update_network("bench", config)
+
+            def put_edit(i):
+                config["tasks"][i % size]["params"] = {"competitors": f"Edited {i}"}
+                api.update_network("bench", config)
+
+            def patch_edit(i):
+                api.patch_network("bench", [
+                    {"op": "update_task", "id": f"task_{i % size}", "params": {"competitors": f"Edited {i}"}}
+                ])
+
+            put = time_edits(put_edit, max(1, edits // 10) if size >= 10000 else edits)
+            patch = time_edits(patch_edit, edits)
+            print(f"{size:>8} {put:>10.3f} {patch:>11.3f} {put / patch:>7.0f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--edits", type=int, default=200, help="Edits measured per network size")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.edits)
@@ -0,0 +1,244 @@
+"""Deterministic benchmark suite for framework overhead.
+
+Builds seeded synthetic networks and times each stage of a run with the fake
+LLM and tools from fakes.py, so no API keys or network access are needed and
+results are comparable between commits:
+
+- from_frontend_data: building the network from frontend JSON
+- instantiate_agents: creating agents with an empty and with a warm agent cache
+- instantiate_tasks: creating tasks, including rendering their descriptions
+- get_all_tasks: ordering the instantiated tasks
+- render_templates: rendering every task description alone
+- run_network: an end-to-end concurrent CrewAPI run, reported as tasks/s
+
+Results can be written as JSON and compared against a baseline; the run fails
+when a benchmark got slower than the threshold allows.
+
+Usage:
+    python benchmark_suite.py [--sizes 2 10 100 1000 10000] [--run-max 1000]
+        [--llm-latency 0.0] [--output-tokens 64] [--output results.json]
+        [--compare baseline.json] [--threshold 0.25]
+"""
+import os
+
+# Keep CrewAI from sending telemetry during benchmark runs
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+import argparse
+import contextlib
+import json
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from agent_cache import agent_cache
+from api import CrewAPI
+from definition_registry import registry
+from fakes import FakeResourcePool, use_resource_pool
+from main import from_frontend_data
+from network_store import NetworkStore
+from tracing import trace_store
+
+# Agent and task types paired the way the frontend pairs them
+CORPORATE_PAIRS = (
+    ("meeting_summarizer", "meeting_summarization", {"meeting_text": "Alice: We agreed to revisit the pro tier pricing."}),
+    ("smart_email_manager", "smart_email_management", {"email_content": "Can we move the review to Friday?"}),
+    ("competitor_watchdog", "competitor_watchdog", {"competitors": "Acme Corp"}),
+    ("customer_feedback_analyzer", "customer_feedback_analysis", {"feedback_data": "Great app, but sync is slow."}),
+)
+
+def generate_config(size, width=50, max_deps=3, seed=42):
+    """Generate a layered frontend network config with one agent per task.
+
+    Args:
+        size (int): Number of tasks.
+        width (int): Number of tasks per layer.
+        max_deps (int): Maximum number of dependencies per task, drawn from the previous layer.
+        seed (int): Random seed so runs are comparable.
+
+    Returns:
+        dict: The network config as sent by the frontend.
+    """
+    rng = random.Random(seed)
+    config = {"agents": [], "tasks": [], "connections": []}
+    previous_layer, layer = [], []
+    for i in range(size):
+        agent_type, task_type, params = CORPORATE_PAIRS[i % len(CORPORATE_PAIRS)]
+        task_id = f"task_{i}"
+        config["agents"].append({"id": f"agent_{i}", "type": agent_type, "domain": "corporate"})
+        config["tasks"].append({
+            "id": task_id,
+            "type": task_type,
+            "domain": "corporate",
+            "agent_id": f"agent_{i}",
+            "params": dict(params, company=f"Company {i}")
+        })
+        if previous_layer:
+            for dep in rng.sample(previous_layer, min(len(previous_layer), rng.randint(1, max_deps))):
+                config["connections"].append({"from": dep, "to": task_id})
+        layer.append(task_id)
+        if len(layer) == width:
+            previous_layer, layer = layer, []
+    return config
+
+def time_call(func, *args, repeat=3, setup=None):
+    """Return the best wall-clock time of `repeat` calls, in seconds, running setup() untimed before each."""
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def render_all(network):
+    for node in network.task_nodes.values():
+        definition = registry.get_task_definition(node.domain, node.task_type)
+        definition.description_template.render(node.params)
+
+def make_api(directory):
+    """Create a CrewAPI whose store, spilled networks and traces live in `directory`."""
+    return CrewAPI(
+        store=NetworkStore(path=os.path.join(directory, 'networks.sqlite3')),
+        spill_dir=os.path.join(directory, 'networks')
+    )
+
+def run_end_to_end(api, network_id, max_workers, repeat):
+    """Run a network end to end and return the best run time in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        # CrewAI prints every step of verbose agents
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            result = api.run_network(network_id, mode="concurrent", max_workers=max_workers, reuse_results=False)
+            elapsed = time.perf_counter() - start
+        if "error" in result:
+            raise RuntimeError(f"Benchmark run failed: {result['error']}")
+        best = min(best, elapsed)
+    return best
+
+def run_benchmark(sizes, run_max, llm_latency, output_tokens, max_workers, repeat):
+    """Time every stage for every network size.
+
+    Returns:
+        list: One result per benchmark and size, with the best time in seconds
+            and the time per task in microseconds.
+    """
+    results = []
+
+    def record(name, size, seconds, **extra):
+        result = {"name": name, "size": size, "seconds": seconds, "us_per_task": seconds * 1e6 / size}
+        result.update(extra)
+        results.append(result)
+        print(f"{name:>26} {size:>8} {seconds * 1000:>12.3f} {result['us_per_task']:>12.1f}")
+
+    print(f"{'benchmark':>26} {'tasks':>8} {'best (ms)':>12} {'us/task':>12}")
+    fake_pool = FakeResourcePool(llm_latency=llm_latency, output_tokens=output_tokens)
+    with use_resource_pool(fake_pool), tempfile.TemporaryDirectory() as directory:
+        previous_trace_dir, trace_store.directory = trace_store.directory, os.path.join(directory, 'traces')
+        try:
+            registry.preload()
+            for size in sizes:
+                config = generate_config(size)
+                record("from_frontend_data", size, time_call(from_frontend_data, config, repeat=repeat))
+
+                network = from_frontend_data(config)
+                record("instantiate_agents_cold", size,
+                       time_call(network.instantiate_agents, repeat=repeat, setup=agent_cache.clear))
+                record("instantiate_agents_warm", size, time_call(network.instantiate_agents, repeat=repeat))
+                record("instantiate_tasks", size, time_call(network.instantiate_tasks, repeat=repeat))
+                record("get_all_tasks", size, time_call(network.get_all_tasks, repeat=repeat))
+                record("render_templates", size, time_call(render_all, network, repeat=repeat))
+
+                if size <= run_max:
+                    api = make_api(directory)
+                    network_id = api.create_network(f"bench_{size}")["network_id"]
+                    api.update_network(network_id, config)
+                    calls_before = fake_pool.llm_calls()
+                    seconds = run_end_to_end(api, network_id, max_workers, repeat)
+                    record("run_network", size, seconds, tasks_per_second=size / seconds,
+                           llm_calls=(fake_pool.llm_calls() - calls_before) // repeat)
+        finally:
+            trace_store.directory = previous_trace_dir
+    return results
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, threshold):
+    """Compare results against a baseline run.
+
+    Args:
+        results (list): Results of this run.
+        baseline (dict): A previous run as written with --output.
+        threshold (float): Allowed slowdown, e.g. 0.25 for 25%.
+
+    Returns:
+        list: The (name, size, ratio) of every benchmark slower than the threshold allows.
+    """
+    previous = {(result["name"], result["size"]): result["seconds"] for result in baseline["results"]}
+    regressions = []
+    print(f"\n{'benchmark':>26} {'tasks':>8} {'baseline (ms)':>14} {'now (ms)':>10} {'ratio':>7}")
+    for result in results:
+        key = (result["name"], result["size"])
+        if key not in previous:
+            continue
+        ratio = result["seconds"] / previous[key] if previous[key] else 1.0
+        flag = " REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{key[0]:>26} {key[1]:>8} {previous[key] * 1000:>14.3f} {result['seconds'] * 1000:>10.3f} {ratio:>6.2f}x{flag}")
+        if flag:
+            regressions.append((key[0], key[1], ratio))
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 10, 100, 1000, 10000])
+    parser.add_argument("--run-max", type=int, default=1000,
+                        help="Largest network to run end to end")
+    parser.add_argument("--llm-latency", type=float, default=0.0,
+                        help="Seconds every fake LLM call takes")
+    parser.add_argument("--output-tokens", type=int, default=64,
+                        help="Words in every fake LLM answer")
+    parser.add_argument("--max-workers", type=int, default=None,
+                        help="Maximum number of concurrent tasks in end-to-end runs")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="Compare against results previously written with --output")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed slowdown against the baseline before failing")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.run_max, args.llm_latency, args.output_tokens, args.max_workers, args.repeat)
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "llm_latency": args.llm_latency,
+            "output_tokens": args.output_tokens,
+            "max_workers": args.max_workers,
+            "repeat": args.repeat
+        },
+        "results": results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print(f"\nWarning: the baseline was run with a different config: {baseline.get('config')}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) slower than the {args.threshold:.0%} threshold")
+            sys.exit(1)
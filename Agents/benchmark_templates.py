@@ -0,0 +1,74 @@
+"""Throughput benchmark for rendering task descriptions.
+
+Compares the original renderer (one str.replace per parameter followed by a
+regex pass for {#if} blocks) against the compiled single-pass template engine,
+using the shipped task definitions and large meeting_text / feedback_data payloads.
+
+Usage:
+    python benchmark_templates.py [--payload-kb 16 256 1024] [--seconds 1.0]
+"""
+import argparse
+import re
+import time
+from definition_registry import registry
+
+def legacy_render(description, params):
+    """The original load_task_definition rendering, kept here for comparison."""
+    for key, value in params.items():
+        placeholder = '{' + key + '}'
+        description = description.replace(placeholder, str(value) if value is not None else "")
+
+    def replace_conditional(match):
+        param_name = match.group(1)
+        if param_name in params and params[param_name]:
+            return match.group(2)
+        return ""
+
+    return re.sub(r'{#if (\w+)}(.*?){\/if}', replace_conditional, description, flags=re.DOTALL)
+
+def make_payload(size_kb):
+    """Build a transcript-like payload of roughly `size_kb` kilobytes."""
+    line = "Alice: We reviewed the Q3 numbers and agreed to revisit the pricing of the pro tier.\n"
+    return line * max(1, (size_kb * 1024) // len(line))
+
+def throughput(func, seconds):
+    """Return how many times `func` runs per second over at least `seconds`."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return calls / elapsed
+
+def run_benchmark(payload_sizes, seconds):
+    cases = [
+        ('meeting_summarization', 'meeting_text', {'pdf_path': ''}),
+        ('customer_feedback_analysis', 'feedback_data', {'reviews_url': 'https://example.com/reviews', 'pdf_path': ''}),
+    ]
+    # Extra unused params, as sent by the frontend, each costing a full scan in the legacy renderer
+    extra_params = {f'extra_param_{i}': f'value {i}' for i in range(20)}
+
+    print(f"{'task':>28} {'payload':>8} {'legacy/s':>10} {'compiled/s':>11} {'speedup':>8}")
+    for task_type, payload_param, params in cases:
+        definition = registry.get_task_definition('corporate', task_type)
+        for size_kb in payload_sizes:
+            render_params = {'company': 'Default Company', payload_param: make_payload(size_kb)}
+            render_params.update(params)
+            render_params.update(extra_params)
+
+            expected = legacy_render(definition.description, render_params)
+            assert definition.description_template.render(render_params) == expected
+
+            legacy = throughput(lambda: legacy_render(definition.description, render_params), seconds)
+            compiled = throughput(lambda: definition.description_template.render(render_params), seconds)
+            print(f"{task_type:>28} {size_kb:>6}KB {legacy:>10.0f} {compiled:>11.0f} {compiled / legacy:>7.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payload-kb", type=int, nargs="+", default=[16, 256, 1024])
+    parser.add_argument("--seconds", type=float, default=1.0, help="Time spent measuring each case")
+    args = parser.parse_args()
+
+    run_benchmark(args.payload_kb, args.seconds)
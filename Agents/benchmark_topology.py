@@ -0,0 +1,107 @@
+"""Micro-benchmark for ordering the tasks of large generated networks.
+
+Compares the original DFS-based `get_all_tasks` (which rescans every node's
+dependency list to find roots) against the Kahn-style ordering in graph_utils.
+
+Usage:
+    python benchmark_topology.py [--sizes 1000 10000 50000] [--legacy-max 5000]
+"""
+import argparse
+import random
+import sys
+import time
+from graph_utils import topological_order, execution_levels
+
+class BenchTaskNode:
+    def __init__(self, id):
+        self.id = id
+        self.dependencies = []
+
+def generate_network(size, width=50, max_deps=3, seed=42):
+    """Generate a layered DAG similar to the frontend's large generated templates.
+
+    Args:
+        size (int): Number of tasks.
+        width (int): Number of tasks per layer.
+        max_deps (int): Maximum number of dependencies per task, drawn from the previous layer.
+        seed (int): Random seed so runs are comparable.
+
+    Returns:
+        dict: Task nodes keyed by task ID.
+    """
+    rng = random.Random(seed)
+    task_nodes = {}
+    previous_layer = []
+    layer = []
+    for i in range(size):
+        node = BenchTaskNode(f"task_{i}")
+        if previous_layer:
+            for dep in rng.sample(previous_layer, min(len(previous_layer), rng.randint(1, max_deps))):
+                node.dependencies.append(dep)
+        task_nodes[node.id] = node
+        layer.append(node)
+        if len(layer) == width:
+            previous_layer, layer = layer, []
+    return task_nodes
+
+def legacy_get_all_tasks(task_nodes):
+    """The original CrewNetwork.get_all_tasks ordering, kept here for comparison."""
+    visited = set()
+    task_ordering = []
+
+    def dfs(task_id):
+        if task_id in visited:
+            return
+        visited.add(task_id)
+        for dep in task_nodes[task_id].dependencies:
+            dfs(dep.id)
+        task_ordering.append(task_id)
+
+    for task_id in task_nodes:
+        if not any(task_id in [dep.id for dep in node.dependencies]
+                 for node in task_nodes.values()):
+            dfs(task_id)
+
+    for task_id in task_nodes:
+        if task_id not in visited:
+            dfs(task_id)
+
+    return task_ordering
+
+def time_call(func, *args, repeat=3):
+    """Return the best wall-clock time of `repeat` calls, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmark(sizes, legacy_max):
+    print(f"{'tasks':>8} {'shape':>8} {'legacy (ms)':>12} {'kahn (ms)':>10} {'levels (ms)':>12} {'speedup':>8}")
+    for size in sizes:
+        for shape, width in (("layered", 50), ("chain", 1)):
+            task_nodes = generate_network(size, width=width)
+            kahn = time_call(topological_order, task_nodes)
+            levels = time_call(execution_levels, task_nodes)
+
+            legacy_text, speedup_text = "skipped", "-"
+            if size <= legacy_max:
+                try:
+                    legacy = time_call(legacy_get_all_tasks, task_nodes, repeat=1)
+                    legacy_text = f"{legacy * 1000:.1f}"
+                    speedup_text = f"{legacy / kahn:.0f}x"
+                except RecursionError:
+                    legacy_text = "RecursionError"
+
+            print(f"{size:>8} {shape:>8} {legacy_text:>12} {kahn * 1000:>10.1f} {levels * 1000:>12.1f} {speedup_text:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000, 50000])
+    parser.add_argument("--legacy-max", type=int, default=5000,
+                        help="Largest network to run the quadratic legacy ordering on")
+    args = parser.parse_args()
+
+    print(f"Python recursion limit: {sys.getrecursionlimit()}")
+    run_benchmark(args.sizes, args.legacy_max)
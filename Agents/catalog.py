@@ -0,0 +1,174 @@
+"""Catalog of the available agent and task types, derived from the definition files.
+
+The catalog lists every agent definition in agent_definitions/ and every task
+definition in task_definitions/, with the parameters of each task taken from
+the `{param}` placeholders and `{#if param}` blocks of its description. Each
+agent's task type is the one declared in the `## Task` section of its
+definition file. The catalog is built once and rebuilt only when a definition
+file is added, removed or modified; the definition directories are checked at
+most once every CATALOG_CHECK_INTERVAL seconds.
+
+Serialized responses are cached too, each with a strong ETag derived from its
+body, so polling clients can be answered with 304 Not Modified.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from definition_registry import registry
+
+# Seconds between checks of the definition directories for changes
+DEFAULT_CHECK_INTERVAL = float(os.getenv("CATALOG_CHECK_INTERVAL", "5"))
+
+# Accepted by every agent factory method, to select a pooled LLM client
+AGENT_PARAMS = ["llm"]
+
+def display_name(type_id):
+    """Turn a type ID such as seo_optimizer into a display name (Seo Optimizer)."""
+    return type_id.replace('_', ' ').title()
+
+def template_params(template):
+    """List the parameters of a compiled template in order of first appearance.
+
+    Args:
+        template (Template): The compiled task description.
+
+    Returns:
+        list: The parameter names.
+    """
+    return sorted(template.variables, key=lambda name: (template.source.find(name), name))
+
+def build_catalog(definitions):
+    """Build the catalog from the definition files.
+
+    Args:
+        definitions (DefinitionRegistry): The registry the definitions are read from.
+
+    Returns:
+        dict: The "agents" list served by /agents, and the "agent_types",
+            "task_types", "agent_params" and "task_params" lookups keyed by domain.
+
+    Raises:
+        ValueError: If an agent definition declares a task type its domain doesn't have.
+    """
+    agent_types = definitions.list_agent_types()
+    task_types = definitions.list_task_types()
+
+    task_params = {
+        domain: {
+            task_type: template_params(definitions.get_task_definition(domain, task_type).description_template)
+            for task_type in types
+        }
+        for domain, types in task_types.items()
+    }
+
+    agents = []
+    for domain, types in agent_types.items():
+        for agent_type in types:
+            definition = definitions.get_agent_definition(f"{domain}_agents", agent_type)
+            task_type = definition.task_type
+            if task_type is not None and task_type not in task_params.get(domain, {}):
+                raise ValueError(f"Agent definition {definition.path} declares unknown {domain} task type '{task_type}'")
+            params = task_params[domain][task_type] if task_type else []
+            agents.append({
+                'id': agent_type,
+                'name': display_name(agent_type),
+                'description': definition.role.splitlines()[0].strip() if definition.role else "",
+                'type': domain,
+                'task_type': task_type,
+                'parameters': {param: '' for param in params}
+            })
+
+    return {
+        "agents": agents,
+        "agent_types": agent_types,
+        "task_types": task_types,
+        "agent_params": {domain: {agent_type: list(AGENT_PARAMS) for agent_type in types}
+                         for domain, types in agent_types.items()},
+        "task_params": task_params
+    }
+
+class Catalog:
+    """The cached catalog and its serialized responses."""
+
+    def __init__(self, definitions=registry, check_interval=DEFAULT_CHECK_INTERVAL):
+        """Initialize the catalog. It is built on first use.
+
+        Args:
+            definitions (DefinitionRegistry): The registry the definitions are read from.
+            check_interval (float): Seconds between checks of the definition directories for changes.
+        """
+        self.definitions = definitions
+        self.check_interval = check_interval
+        self.builds = 0
+        self._data = None
+        self._signature = None
+        self._checked_at = 0.0
+        self._responses = {}
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get the catalog, rebuilding it if the definition files changed.
+
+        Returns:
+            dict: The catalog, as returned by build_catalog. Callers must not modify it.
+        """
+        now = time.monotonic()
+        if self._data is not None and now - self._checked_at < self.check_interval:
+            return self._data
+
+        with self._lock:
+            if self._data is not None and now - self._checked_at < self.check_interval:
+                return self._data
+            signature = self._files_signature()
+            if signature != self._signature:
+                self._data = build_catalog(self.definitions)
+                self._signature = signature
+                self._responses = {}
+                self.builds += 1
+            self._checked_at = now
+            return self._data
+
+    def render(self, key, select):
+        """Serialize part of the catalog, reusing the body and ETag until the catalog changes.
+
+        Args:
+            key (tuple): Identifies the response, e.g. ("task_params", "corporate", "competitor_watchdog").
+            select (callable): Returns the value to serialize. Only called when the response is not cached.
+
+        Returns:
+            tuple: The JSON body (bytes) and its strong ETag (str, unquoted).
+        """
+        self.get()
+        responses = self._responses
+        response = responses.get(key)
+        if response is None:
+            body = json.dumps(select()).encode('utf-8')
+            response = (body, hashlib.sha256(body).hexdigest()[:32])
+            responses[key] = response
+        return response
+
+    def get_agents(self, domain=None):
+        """Get the /agents entries, optionally only those of one domain."""
+        agents = self.get()["agents"]
+        return [agent for agent in agents if domain is None or agent['type'] == domain]
+
+    def _files_signature(self):
+        """Get the names and modification times of every definition file."""
+        signature = []
+        for root in (self.definitions.agent_root, self.definitions.task_root):
+            if not os.path.isdir(root):
+                continue
+            for folder in sorted(os.listdir(root)):
+                domain_dir = os.path.join(root, folder)
+                if not os.path.isdir(domain_dir):
+                    continue
+                for filename in sorted(os.listdir(domain_dir)):
+                    if filename.endswith('.md'):
+                        path = os.path.join(domain_dir, filename)
+                        signature.append((path, os.stat(path).st_mtime_ns))
+        return tuple(signature)
+
+# Shared catalog served by the catalog routes
+catalog = Catalog()
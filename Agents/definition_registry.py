@@ -0,0 +1,194 @@
+import hashlib
+import os
+import re
+import threading
+from template_engine import compile_template
+from tracing import span
+
+AGENT_DEFINITIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'agent_definitions')
+TASK_DEFINITIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'task_definitions')
+
+# Section patterns, compiled once for every definition file
+ROLE_PATTERN = re.compile(r'## Role\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+GOAL_PATTERN = re.compile(r'## Goal\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+BACKSTORY_PATTERN = re.compile(r'## Backstory\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+TASK_PATTERN = re.compile(r'## Task\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+DESCRIPTION_PATTERN = re.compile(r'## Description\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+EXPECTED_OUTPUT_PATTERN = re.compile(r'## Expected Output\s*\n(.*?)(?=\n##|\Z)', re.DOTALL)
+
+def extract_section(pattern, content):
+    """Return the stripped body of a markdown section, or an empty string if it is missing."""
+    match = pattern.search(content)
+    return match.group(1).strip() if match else ""
+
+class AgentDefinition:
+    """A parsed agent definition file."""
+
+    def __init__(self, path, content, mtime):
+        """Parse an agent definition.
+
+        Args:
+            path (str): The path of the markdown file.
+            content (str): The content of the markdown file.
+            mtime (int): The modification time of the file in nanoseconds.
+        """
+        self.path = path
+        self.mtime = mtime
+        self.content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self.role = extract_section(ROLE_PATTERN, content)
+        self.goal = extract_section(GOAL_PATTERN, content)
+        self.backstory = extract_section(BACKSTORY_PATTERN, content)
+        # The task type of the agent's domain it is meant for, declared in its Task section
+        self.task_type = extract_section(TASK_PATTERN, content) or None
+
+class TaskDefinition:
+    """A parsed task definition file."""
+
+    def __init__(self, path, content, mtime):
+        """Parse a task definition.
+
+        Args:
+            path (str): The path of the markdown file.
+            content (str): The content of the markdown file.
+            mtime (int): The modification time of the file in nanoseconds.
+        """
+        self.path = path
+        self.mtime = mtime
+        self.content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self.description = extract_section(DESCRIPTION_PATTERN, content)
+        self.expected_output = extract_section(EXPECTED_OUTPUT_PATTERN, content)
+        self.description_template = compile_template(self.description)
+
+class DefinitionRegistry:
+    """Process-wide cache of parsed agent and task definition files.
+
+    Each markdown file is read and parsed once. Later lookups only stat the file
+    and reuse the parsed definition until the file's modification time changes.
+    """
+
+    def __init__(self, agent_root=AGENT_DEFINITIONS_DIR, task_root=TASK_DEFINITIONS_DIR):
+        """Initialize the registry.
+
+        Args:
+            agent_root (str): Directory containing the agent definition domains.
+            task_root (str): Directory containing the task definition domains.
+        """
+        self.agent_root = agent_root
+        self.task_root = task_root
+        self._definitions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def agent_path(self, domain, agent_type):
+        """Get the path of an agent definition (e.g. corporate_agents, meeting_summarizer)."""
+        return os.path.join(self.agent_root, domain, f'{agent_type}_agent.md')
+
+    def task_path(self, domain, task_type):
+        """Get the path of a task definition (e.g. corporate, meeting_summarization)."""
+        return os.path.join(self.task_root, f"{domain}_tasks", f'{task_type}.md')
+
+    def get_agent_definition(self, domain, agent_type):
+        """Get a parsed agent definition.
+
+        Args:
+            domain (str): The domain folder of the agent (e.g., corporate_agents)
+            agent_type (str): The type of agent within the domain (e.g., meeting_summarizer)
+
+        Returns:
+            AgentDefinition: The parsed definition.
+        """
+        path = self.agent_path(domain, agent_type)
+        return self._get(path, AgentDefinition, "Agent definition file not found")
+
+    def get_task_definition(self, domain, task_type):
+        """Get a parsed task definition.
+
+        Args:
+            domain (str): The domain of the task (e.g., corporate, marketing)
+            task_type (str): The type of task within the domain (e.g., meeting_summarization)
+
+        Returns:
+            TaskDefinition: The parsed definition.
+        """
+        path = self.task_path(domain, task_type)
+        return self._get(path, TaskDefinition, "Task definition file not found")
+
+    def preload(self):
+        """Parse every agent and task definition file up front.
+
+        Returns:
+            int: The number of definitions loaded.
+        """
+        count = 0
+        for root, definition_class in ((self.agent_root, AgentDefinition), (self.task_root, TaskDefinition)):
+            if not os.path.isdir(root):
+                continue
+            for domain in sorted(os.listdir(root)):
+                domain_dir = os.path.join(root, domain)
+                if not os.path.isdir(domain_dir):
+                    continue
+                for filename in sorted(os.listdir(domain_dir)):
+                    if filename.endswith('.md'):
+                        self._get(os.path.join(domain_dir, filename), definition_class, "Definition file not found")
+                        count += 1
+        return count
+
+    def list_agent_types(self):
+        """List the agent types that have a definition file.
+
+        Returns:
+            dict: Sorted agent types keyed by domain (e.g. corporate).
+        """
+        return self._list_types(self.agent_root, '_agents', '_agent.md')
+
+    def list_task_types(self):
+        """List the task types that have a definition file.
+
+        Returns:
+            dict: Sorted task types keyed by domain (e.g. corporate).
+        """
+        return self._list_types(self.task_root, '_tasks', '.md')
+
+    def _list_types(self, root, folder_suffix, file_suffix):
+        types = {}
+        if not os.path.isdir(root):
+            return types
+        for folder in sorted(os.listdir(root)):
+            domain_dir = os.path.join(root, folder)
+            if folder.endswith(folder_suffix) and os.path.isdir(domain_dir):
+                types[folder[:-len(folder_suffix)]] = sorted(
+                    filename[:-len(file_suffix)] for filename in os.listdir(domain_dir) if filename.endswith(file_suffix)
+                )
+        return types
+
+    def clear(self):
+        """Drop every cached definition."""
+        with self._lock:
+            self._definitions.clear()
+
+    def _get(self, path, definition_class, missing_message):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._definitions.pop(path, None)
+            raise FileNotFoundError(f"{missing_message}: {path}")
+
+        definition = self._definitions.get(path)
+        if definition is not None and definition.mtime == mtime:
+            self.hits += 1
+            return definition
+
+        with span("load_definition", path=os.path.basename(path)):
+            with open(path, 'r') as file:
+                content = file.read()
+            definition = definition_class(path, content, mtime)
+
+        with self._lock:
+            self._definitions[path] = definition
+            self.misses += 1
+        return definition
+
+# Shared registry used by load_agent_definition and load_task_definition
+registry = DefinitionRegistry()
@@ -0,0 +1,218 @@
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from agent_cache import make_agent_key
+from definition_registry import registry
+from graph_utils import build_dependency_index, topological_order
+from metrics import agent_context, task_duration, tasks_reused
+from tracing import span
+
+# Default size of the worker pool used for concurrent runs
+DEFAULT_MAX_WORKERS = int(os.getenv("CREW_MAX_WORKERS", "4"))
+
+class RunCancelled(Exception):
+    """Raised when a run is cancelled before all of its tasks have been scheduled."""
+
+class DAGExecutor:
+    """Executes the tasks of a CrewNetwork concurrently, following their dependencies.
+
+    Every task whose dependencies have completed is submitted to a bounded worker
+    pool, so independent branches of the network run side by side and the whole
+    run finishes in critical-path time. Each task receives the outputs of its
+    upstream tasks as context.
+
+    When given a results store, the executor also memoizes task outputs: a task
+    whose params, agent and upstream outputs are unchanged since its last run
+    reuses its stored output instead of calling the LLM again.
+    """
+
+    def __init__(self, network, max_workers=None, cancel_event=None, on_event=None, results=None, reuse=True):
+        """Initialize the executor.
+
+        Args:
+            network (CrewNetwork): The network to execute. Agents and tasks must be instantiated.
+            max_workers (int): Maximum number of tasks running at the same time.
+            cancel_event (threading.Event): When set, no further tasks are started.
+            on_event (callable): Called from worker threads with a dict for every
+                task_started, task_completed, task_failed and task_reused event.
+            results (dict): Store of (key, output) pairs keyed by task ID, updated after every task.
+            reuse (bool): Whether stored outputs with a matching key are reused.
+        """
+        self.network = network
+        self.max_workers = max(1, max_workers or DEFAULT_MAX_WORKERS)
+        self.cancel_event = cancel_event
+        self.on_event = on_event
+        self.results = results
+        self.reuse = reuse
+        self.reused = []
+        self._agent_locks = {}
+
+    def run(self):
+        """Run every task in the network.
+
+        Returns:
+            dict: Task outputs keyed by task ID, in the order the tasks completed.
+
+        Raises:
+            RunCancelled: If the cancel event was set during the run.
+        """
+        task_nodes = self.network.task_nodes
+
+        # Reject cycles before anything starts running
+        topological_order(task_nodes)
+        remaining, dependents = build_dependency_index(task_nodes)
+
+        # A single agent may be assigned to several tasks, but an agent instance
+        # must not execute two tasks at the same time. Agents checked out of the
+        # cache belong to this network alone, so a lock per node is enough.
+        self._agent_locks = {agent_id: threading.Lock() for agent_id in self.network.agent_nodes}
+
+        outputs = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            def submit(task_id):
+                if self.cancel_event is not None and self.cancel_event.is_set():
+                    return
+                node = task_nodes[task_id]
+                upstream = [(dep, outputs[dep.id]) for dep in {dep.id: dep for dep in node.dependencies}.values()]
+                # Run in a copy of the caller's context, so settings such as the LLM priority carry over
+                future = pool.submit(contextvars.copy_context().run, self._execute_task, node, upstream)
+                running[future] = task_id
+
+            for task_id, count in remaining.items():
+                if count == 0:
+                    submit(task_id)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    try:
+                        outputs[task_id] = future.result()
+                    except Exception:
+                        # Don't start anything new once a task has failed
+                        for pending in running:
+                            pending.cancel()
+                        raise
+
+                    for dependent_id in dependents[task_id]:
+                        remaining[dependent_id] -= 1
+                        if remaining[dependent_id] == 0:
+                            submit(dependent_id)
+
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise RunCancelled(f"Run cancelled after {len(outputs)} of {len(task_nodes)} tasks")
+
+        return outputs
+
+    def _execute_task(self, node, upstream):
+        """Execute a single task with the outputs of its dependencies as context.
+
+        Args:
+            node (TaskNode): The task node to execute.
+            upstream (list): (TaskNode, output) pairs for the task's dependencies.
+
+        Returns:
+            str: The raw output of the task.
+        """
+        with span("task", task_id=node.id, task_type=node.task_type, agent_id=node.agent_node.id) as task_span:
+            return self._run_task(node, upstream, task_span)
+
+    def _run_task(self, node, upstream, task_span):
+        if not node.task_instance:
+            raise ValueError(f"Task {node.id} is not instantiated.")
+
+        key = None
+        if self.results is not None:
+            key = make_task_key(node, upstream)
+            stored = self.results.get(node.id)
+            if self.reuse and stored is not None and stored[0] == key:
+                self.reused.append(node.id)
+                if task_span is not None:
+                    task_span.set_attribute("reused", True)
+                tasks_reused.inc(task_type=node.task_type)
+                self._emit("task_reused", node, output=stored[1], duration=0.0)
+                return stored[1]
+
+        context = build_context(upstream)
+        agent = node.agent_node.agent_instance
+        with self._agent_locks[node.agent_node.id]:
+            self._emit("task_started", node)
+            start = time.perf_counter()
+            try:
+                with agent_context(node.agent_node.agent_type):
+                    output = node.task_instance.execute_sync(
+                        agent=agent,
+                        context=context
+                    )
+            except Exception as e:
+                duration = time.perf_counter() - start
+                task_duration.observe(duration, task_type=node.task_type, status="failed")
+                self._emit("task_failed", node, error=str(e), duration=duration)
+                raise
+
+        duration = time.perf_counter() - start
+        raw = output.raw if hasattr(output, 'raw') else str(output)
+        if self.results is not None:
+            self.results[node.id] = (key, raw)
+        task_duration.observe(duration, task_type=node.task_type, status="succeeded")
+        self._emit("task_completed", node, output=raw, duration=duration)
+        return raw
+
+    def _emit(self, event, node, **fields):
+        if self.on_event is None:
+            return
+
+        payload = {
+            "event": event,
+            "task_id": node.id,
+            "task_type": node.task_type,
+            "agent_id": node.agent_node.id,
+            "timestamp": time.time()
+        }
+        payload.update(fields)
+        self.on_event(payload)
+
+def make_task_key(node, upstream):
+    """Build the memoization key of a task run.
+
+    The key covers everything that determines the task's output: its type,
+    params and definition, its agent, and the outputs of its dependencies.
+
+    Args:
+        node (TaskNode): The task node.
+        upstream (list): (TaskNode, output) pairs for the task's dependencies.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    agent_node = node.agent_node
+    task_definition = registry.get_task_definition(node.domain, node.task_type)
+    agent_definition = registry.get_agent_definition(f"{agent_node.domain}_agents", agent_node.agent_type)
+    payload = json.dumps({
+        "task": [node.domain, node.task_type, node.params, task_definition.content_hash],
+        "agent": make_agent_key(agent_node.domain, agent_node.agent_type, agent_node.params, agent_definition.content_hash),
+        "upstream": {dep.id: hashlib.sha256(output.encode('utf-8')).hexdigest() for dep, output in upstream}
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def build_context(upstream):
+    """Format the outputs of upstream tasks as context for a downstream task.
+
+    Args:
+        upstream (list): (TaskNode, output) pairs for the task's dependencies.
+
+    Returns:
+        str: The combined context, or None if the task has no dependencies.
+    """
+    if not upstream:
+        return None
+
+    sections = []
+    for dep, output in upstream:
+        sections.append(f"Output of task '{dep.id}' ({dep.task_type}):\n{output}")
+    return "\n\n".join(sections)
@@ -0,0 +1,141 @@
+"""Deterministic stand-ins for the LLM and tools, for benchmarks.
+
+The fake LLM answers every prompt after a fixed latency with a fixed number
+of tokens derived from the prompt, formatted as a final answer so agents
+finish in one step. The fake Serper and scrape tools return canned results.
+Nothing leaves the process, so runs measure framework overhead and are
+comparable between commits.
+
+Install them into the domain factories with `use_resource_pool`:
+
+    with use_resource_pool(FakeResourcePool(llm_latency=0.05)):
+        api.run_network(...)
+"""
+import hashlib
+import time
+from contextlib import contextmanager
+from agent_cache import agent_cache
+from main import get_domain_factories
+from resource_pool import DEFAULT_MODEL, ResourcePool
+
+WORDS = (
+    "revenue", "pricing", "competitor", "launch", "customer", "feedback", "meeting", "action",
+    "summary", "market", "segment", "campaign", "email", "follow-up", "quarter", "growth"
+)
+
+def fake_text(seed_text, tokens):
+    """Build deterministic filler text of `tokens` words chosen from the hash of seed_text."""
+    digest = hashlib.sha256(seed_text.encode('utf-8')).digest()
+    return " ".join(WORDS[digest[i % len(digest)] % len(WORDS)] for i in range(tokens))
+
+_fake_classes = {}
+
+def get_fake_llm_class():
+    """Get a BaseLLM subclass that answers locally. Built on first use, like the other LLM wrappers.
+
+    crewai's LLM(...) hands models like gemini/... to their native provider
+    client whatever class it is called on, so the fake implements BaseLLM
+    directly rather than subclassing LLM.
+    """
+    if "llm" not in _fake_classes:
+        from crewai.llms.base_llm import BaseLLM
+
+        class FakeLLM(BaseLLM):
+            """An LLM client that sleeps for a fixed latency and returns a fixed-size final answer."""
+
+            latency: float = 0.0
+            output_tokens: int = 64
+            calls: int = 0
+
+            def call(self, messages, tools=None, callbacks=None, available_functions=None,
+                     from_task=None, from_agent=None, response_model=None):
+                self.calls += 1
+                if self.latency:
+                    time.sleep(self.latency)
+                prompt = messages if isinstance(messages, str) else str(messages)
+                return f"Thought: I now know the final answer\nFinal Answer: {fake_text(prompt, self.output_tokens)}"
+
+        _fake_classes["llm"] = FakeLLM
+    return _fake_classes["llm"]
+
+def get_fake_tool_classes():
+    """Get BaseTool subclasses standing in for SerperDevTool and ScrapeWebsiteTool."""
+    if "tools" not in _fake_classes:
+        from crewai.tools import BaseTool
+
+        class FakeSerperTool(BaseTool):
+            name: str = "Search the internet"
+            description: str = "Search the internet for a query and return the top results."
+            latency: float = 0.0
+
+            def _run(self, search_query: str = "", **kwargs) -> str:
+                if self.latency:
+                    time.sleep(self.latency)
+                return "\n".join(
+                    f"Title: Result {i}\nLink: https://example.com/{i}\nSnippet: {fake_text(search_query + str(i), 20)}"
+                    for i in range(5)
+                )
+
+        class FakeScrapeTool(BaseTool):
+            name: str = "Read website content"
+            description: str = "Read the text content of a website."
+            latency: float = 0.0
+
+            def _run(self, website_url: str = "", **kwargs) -> str:
+                if self.latency:
+                    time.sleep(self.latency)
+                return fake_text(website_url, 200)
+
+        _fake_classes["tools"] = (FakeSerperTool, FakeScrapeTool)
+    return _fake_classes["tools"]
+
+class FakeResourcePool(ResourcePool):
+    """Resource pool handing out the fake LLM and fake tools."""
+
+    def __init__(self, llm_latency=0.0, output_tokens=64, tool_latency=0.0):
+        """Initialize the pool.
+
+        Args:
+            llm_latency (float): Seconds every LLM call takes.
+            output_tokens (int): Words in every LLM answer.
+            tool_latency (float): Seconds every tool invocation takes.
+        """
+        super().__init__(rate_limit=False)
+        self.llm_latency = llm_latency
+        self.output_tokens = output_tokens
+        serper_class, scrape_class = get_fake_tool_classes()
+        self.tool_factories = {
+            "serper": lambda: serper_class(latency=tool_latency),
+            "scrape": lambda: scrape_class(latency=tool_latency),
+        }
+
+    def get_llm(self, model=None, api_key=None):
+        model = model or DEFAULT_MODEL
+        # Same (model, fingerprint) keys as the real pool, without credentials
+        key = (model, None)
+        with self._lock:
+            if key not in self._llms:
+                self._llms[key] = get_fake_llm_class()(
+                    model=model, latency=self.llm_latency, output_tokens=self.output_tokens
+                )
+            return self._llms[key]
+
+    def llm_calls(self):
+        """Get the number of LLM calls answered so far."""
+        return sum(llm.calls for llm in list(self._llms.values()))
+
+@contextmanager
+def use_resource_pool(resource_pool):
+    """Make every domain agent factory use another resource pool within this context."""
+    factories = [domain["agents"] for domain in get_domain_factories().values()]
+    previous = [factory.pool for factory in factories]
+    # Cached agents hold clients from the pool they were built with
+    agent_cache.clear()
+    for factory in factories:
+        factory.pool = resource_pool
+    try:
+        yield resource_pool
+    finally:
+        for factory, pool in zip(factories, previous):
+            factory.pool = pool
+        agent_cache.clear()
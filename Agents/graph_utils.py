@@ -0,0 +1,130 @@
+from collections import deque
+
+class CycleError(ValueError):
+    """Raised when the task dependency graph contains a cycle."""
+
+    def __init__(self, cycle):
+        """Initialize the error.
+
+        Args:
+            cycle (list): The task IDs forming the cycle, with the first ID repeated at the end.
+        """
+        self.cycle = cycle
+        super().__init__(f"Task dependency cycle detected: {' -> '.join(cycle)}")
+
+def build_dependency_index(task_nodes):
+    """Index the dependency graph of a set of task nodes.
+
+    Args:
+        task_nodes (dict): Task nodes keyed by task ID. Each node has a `dependencies` list of nodes.
+
+    Returns:
+        tuple: (in_degree, dependents) where in_degree maps each task ID to its number of
+            distinct dependencies and dependents maps each task ID to the IDs of the tasks
+            that depend on it.
+    """
+    in_degree = {}
+    dependents = {task_id: [] for task_id in task_nodes}
+    for task_id, node in task_nodes.items():
+        dep_ids = {dep.id for dep in node.dependencies}
+        in_degree[task_id] = len(dep_ids)
+        for dep_id in dep_ids:
+            if dep_id not in dependents:
+                raise ValueError(f"Task {task_id} depends on unknown task {dep_id}.")
+            dependents[dep_id].append(task_id)
+    return in_degree, dependents
+
+def execution_levels(task_nodes):
+    """Group tasks into levels that can be executed in parallel.
+
+    Every task in a level depends only on tasks in earlier levels, so the levels
+    can be run one after another with all tasks of a level running concurrently.
+    Runs in O(tasks + dependencies).
+
+    Args:
+        task_nodes (dict): Task nodes keyed by task ID.
+
+    Returns:
+        list: A list of levels, each a list of task IDs in insertion order.
+
+    Raises:
+        CycleError: If the dependency graph contains a cycle.
+    """
+    in_degree, dependents = build_dependency_index(task_nodes)
+
+    levels = []
+    current = [task_id for task_id, count in in_degree.items() if count == 0]
+    scheduled = 0
+    while current:
+        levels.append(current)
+        scheduled += len(current)
+        following = []
+        for task_id in current:
+            for dependent_id in dependents[task_id]:
+                in_degree[dependent_id] -= 1
+                if in_degree[dependent_id] == 0:
+                    following.append(dependent_id)
+        current = following
+
+    if scheduled != len(task_nodes):
+        raise CycleError(find_cycle(task_nodes, {task_id for task_id, count in in_degree.items() if count > 0}))
+
+    return levels
+
+def topological_order(task_nodes):
+    """Order tasks so that every task comes after all of its dependencies.
+
+    Uses Kahn's algorithm, so it runs in O(tasks + dependencies) without recursion.
+    Ties are broken by insertion order, which keeps the ordering stable.
+
+    Args:
+        task_nodes (dict): Task nodes keyed by task ID.
+
+    Returns:
+        list: Task IDs in execution order.
+
+    Raises:
+        CycleError: If the dependency graph contains a cycle.
+    """
+    in_degree, dependents = build_dependency_index(task_nodes)
+
+    queue = deque(task_id for task_id, count in in_degree.items() if count == 0)
+    ordering = []
+    while queue:
+        task_id = queue.popleft()
+        ordering.append(task_id)
+        for dependent_id in dependents[task_id]:
+            in_degree[dependent_id] -= 1
+            if in_degree[dependent_id] == 0:
+                queue.append(dependent_id)
+
+    if len(ordering) != len(task_nodes):
+        raise CycleError(find_cycle(task_nodes, {task_id for task_id, count in in_degree.items() if count > 0}))
+
+    return ordering
+
+def find_cycle(task_nodes, candidates):
+    """Find one dependency cycle among tasks that could not be ordered.
+
+    Every task left over by Kahn's algorithm still has an unresolved dependency
+    among the leftovers, so following those dependencies must revisit a task.
+
+    Args:
+        task_nodes (dict): Task nodes keyed by task ID.
+        candidates (set): IDs of the tasks left with unresolved dependencies.
+
+    Returns:
+        list: The task IDs forming the cycle, with the first ID repeated at the end.
+    """
+    task_id = next(task_id for task_id in task_nodes if task_id in candidates)
+    path = []
+    position = {}
+    while task_id not in position:
+        position[task_id] = len(path)
+        path.append(task_id)
+        task_id = next(dep.id for dep in task_nodes[task_id].dependencies if dep.id in candidates)
+
+    cycle = path[position[task_id]:]
+    # Report the cycle in execution direction: dependency -> dependent
+    cycle.reverse()
+    return cycle + [cycle[0]]
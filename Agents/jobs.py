@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+# Number of runs executed at the same time in the background
+DEFAULT_JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# How many finished jobs are kept, and for how long, so clients can fetch their results
+DEFAULT_MAX_FINISHED_JOBS = int(os.getenv("JOB_MAX_FINISHED", "100"))
+DEFAULT_JOB_TTL = float(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATUSES = (SUCCEEDED, FAILED, CANCELLED)
+
+def format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+class Job:
+    """A network run executing in the background."""
+
+    def __init__(self, network_id, run_id=None):
+        """Initialize the job.
+
+        Args:
+            network_id (str): The ID of the network being run.
+            run_id (str): The ID the run's trace is stored under.
+        """
+        self.id = uuid.uuid4().hex
+        self.network_id = network_id
+        self.run_id = run_id
+        self.status = QUEUED
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    def to_dict(self, include_result=False):
+        """Serialize the job's status.
+
+        Args:
+            include_result (bool): Whether to include the run result.
+
+        Returns:
+            dict: The job's status, timings and optionally its result.
+        """
+        data = {
+            "job_id": self.id,
+            "network_id": self.network_id,
+            "run_id": self.run_id,
+            "status": self.status,
+            "created_at": format_timestamp(self.created_at),
+            "started_at": format_timestamp(self.started_at),
+            "finished_at": format_timestamp(self.finished_at),
+        }
+        if self.started_at:
+            data["duration"] = (self.finished_at or time.time()) - self.started_at
+        if self.error:
+            data["error"] = self.error
+        if include_result and self.status == SUCCEEDED:
+            data["result"] = self.result
+        return data
+
+class JobManager:
+    """Runs network runs on a bounded background executor and tracks their status."""
+
+    def __init__(self, max_workers=DEFAULT_JOB_WORKERS, max_finished=DEFAULT_MAX_FINISHED_JOBS, ttl=DEFAULT_JOB_TTL):
+        """Initialize the job manager.
+
+        Args:
+            max_workers (int): Maximum number of jobs running at the same time.
+            max_finished (int): Maximum number of finished jobs whose results are kept.
+            ttl (float): Seconds a finished job is kept before it is discarded.
+        """
+        self.max_finished = max_finished
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crew-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, network_id, func, *args, **kwargs):
+        """Queue a run in the background.
+
+        The callable receives the job's cancel event as the `cancel_event`
+        keyword argument and should return a response dict; a response with
+        an "error" key marks the job as failed. A `run_id` keyword argument
+        is also recorded on the job.
+
+        Args:
+            network_id (str): The ID of the network being run.
+            func (callable): The function performing the run.
+
+        Returns:
+            Job: The queued job.
+        """
+        job = Job(network_id, run_id=kwargs.get("run_id"))
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        job.future = self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        """Get a job by ID.
+
+        Returns:
+            Job: The job, or None if it is unknown or was discarded.
+        """
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def list(self):
+        """Get every job that is still tracked, oldest first."""
+        with self._lock:
+            self._prune()
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        """Cancel a job.
+
+        A queued job never starts. A running job is asked to stop: concurrent
+        runs stop scheduling new tasks, and the result of any run that
+        completes anyway is discarded.
+
+        Returns:
+            Job: The job, or None if it is unknown.
+        """
+        job = self.get(job_id)
+        if job is None or job.status in FINISHED_STATUSES:
+            return job
+
+        job.cancel_event.set()
+        if job.future.cancel():
+            self._finish(job, CANCELLED)
+        return job
+
+    def active_count(self):
+        """Get the number of queued and running jobs."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.status in (QUEUED, RUNNING))
+
+    def _run(self, job, func, args, kwargs):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            response = func(*args, cancel_event=job.cancel_event, **kwargs)
+        except Exception as e:
+            job.error = str(e)
+            self._finish(job, CANCELLED if job.cancel_event.is_set() else FAILED)
+            return
+
+        if job.cancel_event.is_set():
+            self._finish(job, CANCELLED)
+        elif isinstance(response, dict) and "error" in response:
+            job.error = response["error"]
+            self._finish(job, FAILED)
+        else:
+            job.result = response.get("result", response) if isinstance(response, dict) else response
+            self._finish(job, SUCCEEDED)
+
+    def _finish(self, job, status):
+        job.status = status
+        job.finished_at = time.time()
+        with self._lock:
+            self._prune()
+
+    def _prune(self):
+        """Discard expired finished jobs, then the oldest beyond max_finished. Caller holds the lock."""
+        now = time.time()
+        finished = [job for job in self._jobs.values() if job.status in FINISHED_STATUSES]
+        excess = len(finished) - self.max_finished
+        for job in finished:
+            if excess > 0 or now - job.finished_at > self.ttl:
+                del self._jobs[job.id]
+                excess -= 1
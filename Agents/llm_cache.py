@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+# The cache is opt-in: responses are only reused when LLM_CACHE_ENABLED is set
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "").lower() in ("1", "true", "yes")
+DEFAULT_CACHE_PATH = os.getenv(
+    "LLM_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db', 'llm_cache.sqlite3')
+)
+DEFAULT_MAX_BYTES = int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024)
+DEFAULT_TTL = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+def make_cache_key(model, messages, tools=None, temperature=None):
+    """Build the content address of an LLM request.
+
+    The messages carry the rendered task prompt and the agent's system prompt,
+    which embeds its role, goal, backstory and the descriptions of its tools.
+
+    Args:
+        model (str): The model name.
+        messages (str or list): The prompt or chat messages.
+        tools (list): Tool schemas passed for native function calling.
+        temperature (float): The sampling temperature.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the request.
+    """
+    payload = json.dumps(
+        {"model": model, "messages": messages, "tools": tools, "temperature": temperature},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses with TTL and size-bounded LRU eviction."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        """Open the cache, creating the database if needed.
+
+        Args:
+            path (str): The SQLite database file, or ":memory:".
+            max_bytes (int): Total response size kept before least recently used entries are evicted.
+            ttl (float): Seconds after which an entry is no longer served.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, size INTEGER, "
+            "created_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        """Get a cached response.
+
+        Returns:
+            str: The response, or None on a miss or an expired entry.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key, model, response):
+        """Store a response and evict least recently used entries beyond the size limit."""
+        now = time.time()
+        size = len(response.encode('utf-8'))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: Entry count, total size, hits, misses, hit rate and evictions.
+        """
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "enabled": True,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+    def _evict(self):
+        """Drop expired entries, then the least recently used until under max_bytes. Caller holds the lock."""
+        self._conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.evictions += 1
+
+_cached_llm_classes = {}
+
+def get_cached_llm_class(base=None):
+    """Get an LLM wrapper subclass that serves repeated requests from a ResponseCache.
+
+    Built on first use so crewai is only imported when an LLM is actually needed.
+
+    Args:
+        base (type): The wrapper class to extend, defaults to LLMWrapper.
+    """
+    if base is None:
+        from llm_wrapper import get_llm_wrapper_class
+        base = get_llm_wrapper_class()
+
+    if base not in _cached_llm_classes:
+        class CachedLLM(base):
+            """An LLM client that reuses responses for identical requests."""
+
+            response_cache: Any = None
+
+            def call(self, messages, tools=None, *args, **kwargs):
+                key = make_cache_key(self.model, messages, tools, getattr(self, 'temperature', None))
+                cached = self.response_cache.get(key)
+                if cached is not None:
+                    return cached
+
+                response = super().call(messages, tools, *args, **kwargs)
+                # Only plain text answers are cached; function call results depend on live tools
+                if isinstance(response, str) and response:
+                    self.response_cache.set(key, self.model, response)
+                return response
+
+        _cached_llm_classes[base] = CachedLLM
+    return _cached_llm_classes[base]
+
+# Shared cache used by the resource pool when LLM_CACHE_ENABLED is set
+response_cache = ResponseCache() if LLM_CACHE_ENABLED else None
@@ -0,0 +1,141 @@
+"""Metrics of the LLM calls sent to the provider.
+
+Every pooled LLM client records its calls, latency and token usage, whether
+or not it is rate limited. Token counts are the usage the provider reports
+for the call. crewai's provider clients hand the usage of each response to
+their _track_token_usage_internal method, in the thread making the call;
+MeteredLLM hooks that method to add the usage to the UsageReport of the call
+in progress in that context, so concurrent calls never see each other's
+usage. Calls whose usage is not reported fall back to an estimate of about 4
+characters per token; llm_tokens_total labels the two with source="reported"
+or source="estimated".
+"""
+import contextvars
+import time
+from metrics import current_agent_type, llm_call_duration, llm_calls, llm_tokens
+from rate_limiter import estimate_tokens, is_rate_limit_error
+from tracing import span
+
+# Usage key names of the providers crewai supports (OpenAI, Gemini, Anthropic, Bedrock)
+PROMPT_TOKEN_KEYS = ("prompt_tokens", "prompt_token_count", "input_tokens", "inputTokens")
+COMPLETION_TOKEN_KEYS = ("completion_tokens", "candidates_token_count", "output_tokens", "outputTokens")
+
+_call_usage = contextvars.ContextVar("llm_call_usage", default=None)
+
+def read_usage(usage):
+    """Get the token counts of a provider's usage data.
+
+    Args:
+        usage: A usage dict or object, with the key names of any supported provider.
+
+    Returns:
+        tuple: (prompt_tokens, completion_tokens), or None if the usage has no token counts.
+    """
+    def first(names):
+        for name in names:
+            value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+            if value is not None:
+                return int(value)
+        return None
+
+    if usage is None:
+        return None
+    prompt, completion = first(PROMPT_TOKEN_KEYS), first(COMPLETION_TOKEN_KEYS)
+    if prompt is None and completion is None:
+        return None
+    return prompt or 0, completion or 0
+
+class UsageReport:
+    """The token usage a provider reported during one LLM call.
+
+    A call may report several times, e.g. once per tool round trip, so the
+    counts add up.
+    """
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.reported = False
+
+    def add(self, usage):
+        tokens = read_usage(usage)
+        if tokens is not None:
+            self.prompt_tokens += tokens[0]
+            self.completion_tokens += tokens[1]
+            self.reported = True
+
+def report_usage_to_calls(llm):
+    """Make a provider's client add the usage of its responses to the UsageReport of the call in progress.
+
+    Args:
+        llm (BaseLLM): The provider's client.
+    """
+    track = getattr(llm, '_track_token_usage_internal', None)
+    if track is None or getattr(track, 'reports_usage', False):
+        return
+
+    def track_usage(usage, *args, **kwargs):
+        result = track(usage, *args, **kwargs)
+        report = _call_usage.get()
+        if report is not None:
+            report.add(usage)
+        return result
+
+    track_usage.reports_usage = True
+    # Set on the instance, bypassing pydantic's validation of BaseLLM attributes
+    object.__setattr__(llm, '_track_token_usage_internal', track_usage)
+
+_metered_llm_classes = {}
+
+def get_metered_llm_class(base=None):
+    """Get an LLM wrapper subclass that records the metrics of every call it sends to the provider.
+
+    Built on first use so crewai is only imported when an LLM is actually needed.
+
+    Args:
+        base (type): The wrapper class to extend, defaults to LLMWrapper.
+    """
+    if base is None:
+        from llm_wrapper import get_llm_wrapper_class
+        base = get_llm_wrapper_class()
+
+    if base not in _metered_llm_classes:
+        class MeteredLLM(base):
+            """An LLM client that records call counts, latency and token usage."""
+
+            def __init__(self, llm, **kwargs):
+                super().__init__(llm, **kwargs)
+                report_usage_to_calls(llm)
+
+            def call(self, messages, tools=None, *args, **kwargs):
+                agent_type = current_agent_type()
+                usage = UsageReport()
+                token = _call_usage.set(usage)
+
+                start = time.perf_counter()
+                try:
+                    with span("llm_request", model=self.model):
+                        response = super().call(messages, tools, *args, **kwargs)
+                except Exception as e:
+                    status = "rate_limited" if is_rate_limit_error(e) else "failed"
+                    llm_calls.inc(model=self.model, agent_type=agent_type, status=status)
+                    raise
+                finally:
+                    _call_usage.reset(token)
+                    llm_call_duration.observe(time.perf_counter() - start, model=self.model, agent_type=agent_type)
+
+                llm_calls.inc(model=self.model, agent_type=agent_type, status="succeeded")
+                if usage.reported:
+                    prompt_tokens, completion_tokens, source = usage.prompt_tokens, usage.completion_tokens, "reported"
+                else:
+                    # Fall back to an estimate when the provider reported no usage
+                    prompt_tokens = estimate_tokens(messages)
+                    completion_tokens = estimate_tokens(response) if isinstance(response, str) else 0
+                    source = "estimated"
+                labels = {"model": self.model, "agent_type": agent_type, "source": source}
+                llm_tokens.inc(prompt_tokens, kind="prompt", **labels)
+                llm_tokens.inc(completion_tokens, kind="completion", **labels)
+                return response
+
+        _metered_llm_classes[base] = MeteredLLM
+    return _metered_llm_classes[base]
@@ -0,0 +1,70 @@
+"""Base of the LLM clients the resource pool layers around a provider's client.
+
+crewai's LLM(...) returns the client of the model's native provider (e.g.
+GeminiCompletion for gemini/ models) whatever class it is called on, so
+behaviour can't be added by subclassing LLM: the subclass is silently
+dropped. Instead LLMWrapper is a BaseLLM holding the provider's client and
+delegating to it, and the metrics, rate limiting and response cache layers
+extend it, each calling the next with super().call().
+"""
+from typing import Any
+
+_wrapper_classes = {}
+
+def get_llm_wrapper_class():
+    """Get the BaseLLM subclass that delegates every call to the client it wraps.
+
+    Built on first use so crewai is only imported when an LLM is actually needed.
+    """
+    if "wrapper" not in _wrapper_classes:
+        from crewai.llms.base_llm import BaseLLM, call_stop_override
+
+        class LLMWrapper(BaseLLM):
+            """An LLM client delegating to the client it wraps."""
+
+            llm: Any
+
+            def __init__(self, llm, **kwargs):
+                """Wrap a client.
+
+                Args:
+                    llm (BaseLLM): The wrapped client.
+                    **kwargs: The fields of the layer, e.g. its rate limiter.
+                """
+                super().__init__(
+                    llm=llm,
+                    model=llm.model,
+                    provider=getattr(llm, 'provider', None),
+                    temperature=getattr(llm, 'temperature', None),
+                    stop=list(getattr(llm, 'stop', None) or []),
+                    is_litellm=getattr(llm, 'is_litellm', False),
+                    **kwargs
+                )
+
+            def call(self, messages, tools=None, callbacks=None, available_functions=None,
+                     from_task=None, from_agent=None, response_model=None):
+                # Agents override the stop words of the client they hold, which is this layer
+                with call_stop_override(self.llm, self.stop_sequences):
+                    return self.llm.call(
+                        messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                        from_task=from_task, from_agent=from_agent, response_model=response_model
+                    )
+
+            def supports_function_calling(self):
+                supports = getattr(self.llm, 'supports_function_calling', None)
+                return bool(supports and supports())
+
+            def supports_stop_words(self):
+                return self.llm.supports_stop_words()
+
+            def supports_multimodal(self):
+                return self.llm.supports_multimodal()
+
+            def get_context_window_size(self):
+                return self.llm.get_context_window_size()
+
+            def get_token_usage_summary(self):
+                return self.llm.get_token_usage_summary()
+
+        _wrapper_classes["wrapper"] = LLMWrapper
+    return _wrapper_classes["wrapper"]
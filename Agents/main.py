@@ -1,15 +1,41 @@
 import os
 from dotenv import load_dotenv
-from crewai import Crew, Task, Agent
-from crewai import LLM
 from agents import CorporateAgents, MarketingAgents
 from tasks import CorporateTasks, MarketingTasks
+from executor import DAGExecutor
+from graph_utils import topological_order, execution_levels
+from agent_cache import agent_cache, make_agent_key
+from definition_registry import registry
+from tracing import span
 from datetime import datetime
 import json
 
 # Load environment variables
 load_dotenv()
 
+# Domain factories are stateless, so every network shares the same instances
+_domain_factories = None
+
+def get_domain_factories():
+    """Get the process-wide agent and task factories for each domain.
+    
+    Returns:
+        dict: The "agents" and "tasks" factories keyed by domain.
+    """
+    global _domain_factories
+    if _domain_factories is None:
+        _domain_factories = {
+            "corporate": {
+                "agents": CorporateAgents(),
+                "tasks": CorporateTasks()
+            },
+            "marketing": {
+                "agents": MarketingAgents(),
+                "tasks": MarketingTasks()
+            }
+        }
+    return _domain_factories
+
 class AgentNode:
     """Represents a node in the agent network graph."""
     
@@ -68,18 +94,12 @@ class CrewNetwork:
     
     def __init__(self):
         """Initialize the crew network."""
+        self.name = "Dynamic Crew"
         self.agent_nodes = {}
         self.task_nodes = {}
-        self.domain_factories = {
-            "corporate": {
-                "agents": CorporateAgents(),
-                "tasks": CorporateTasks()
-            },
-            "marketing": {
-                "agents": MarketingAgents(),
-                "tasks": MarketingTasks()
-            }
-        }
+        # Last (key, output) of each task, so re-runs only execute what changed
+        self.task_results = {}
+        self.domain_factories = get_domain_factories()
     
     def add_agent_node(self, id, agent_type, domain="corporate", params=None):
         """Add an agent node to the network.
@@ -125,46 +145,200 @@ class CrewNetwork:
         
         self.task_nodes[task_id].add_dependency(self.task_nodes[depends_on_task_id])
     
+    def remove_agent_node(self, id):
+        """Remove an agent node from the network.
+        
+        Args:
+            id (str): The ID of the agent to remove.
+        
+        Returns:
+            AgentNode: The removed node.
+        """
+        if id not in self.agent_nodes:
+            raise ValueError(f"Agent {id} not found.")
+        
+        assigned = [task_id for task_id, node in self.task_nodes.items() if node.agent_node.id == id]
+        if assigned:
+            raise ValueError(f"Agent {id} is still assigned to tasks: {', '.join(assigned)}")
+        
+        return self.agent_nodes.pop(id)
+    
+    def update_agent_node(self, id, agent_type=None, domain=None, params=None):
+        """Update an agent node in place and invalidate what was built from it.
+        
+        Args:
+            id (str): The ID of the agent.
+            agent_type (str): The new type of the agent, if it changes.
+            domain (str): The new domain of the agent, if it changes.
+            params (dict): The new parameters of the agent, if they change.
+        
+        Returns:
+            list: The IDs of the tasks whose instances were invalidated.
+        """
+        if id not in self.agent_nodes:
+            raise ValueError(f"Agent {id} not found.")
+        
+        node = self.agent_nodes[id]
+        if agent_type is not None:
+            node.agent_type = agent_type
+        if domain is not None:
+            node.domain = domain
+        if params is not None:
+            node.params = params
+        node.agent_instance = None
+        
+        # Tasks are bound to their agent instance, so they must be rebuilt too
+        invalidated = []
+        for task_id, task_node in self.task_nodes.items():
+            if task_node.agent_node is node:
+                task_node.task_instance = None
+                invalidated.append(task_id)
+        return invalidated
+    
+    def remove_task_node(self, id):
+        """Remove a task node and every connection to it from the network.
+        
+        Args:
+            id (str): The ID of the task to remove.
+        
+        Returns:
+            tuple: The removed node and the IDs of the tasks that depended on it.
+        """
+        if id not in self.task_nodes:
+            raise ValueError(f"Task {id} not found.")
+        
+        node = self.task_nodes.pop(id)
+        dependents = []
+        for task_id, task_node in self.task_nodes.items():
+            if any(dep is node for dep in task_node.dependencies):
+                task_node.dependencies = [dep for dep in task_node.dependencies if dep is not node]
+                dependents.append(task_id)
+        self.task_results.pop(id, None)
+        return node, dependents
+    
+    def update_task_node(self, id, task_type=None, agent_id=None, domain=None, params=None):
+        """Update a task node in place and invalidate its instance.
+        
+        Args:
+            id (str): The ID of the task.
+            task_type (str): The new type of the task, if it changes.
+            agent_id (str): The ID of the agent that will now perform the task, if it changes.
+            domain (str): The new domain of the task, if it changes.
+            params (dict): The new parameters of the task, if they change.
+        """
+        if id not in self.task_nodes:
+            raise ValueError(f"Task {id} not found.")
+        if agent_id is not None and agent_id not in self.agent_nodes:
+            raise ValueError(f"Agent {agent_id} not found.")
+        
+        node = self.task_nodes[id]
+        if task_type is not None:
+            node.task_type = task_type
+        if agent_id is not None:
+            node.agent_node = self.agent_nodes[agent_id]
+        if domain is not None:
+            node.domain = domain
+        if params is not None:
+            node.params = params
+        node.task_instance = None
+    
+    def remove_task_dependency(self, task_id, depends_on_task_id):
+        """Remove a dependency between tasks.
+        
+        Args:
+            task_id (str): The ID of the task.
+            depends_on_task_id (str): The ID of the task that task_id no longer depends on.
+        """
+        if task_id not in self.task_nodes:
+            raise ValueError(f"Task {task_id} not found.")
+        
+        node = self.task_nodes[task_id]
+        remaining = [dep for dep in node.dependencies if dep.id != depends_on_task_id]
+        if len(remaining) == len(node.dependencies):
+            raise ValueError(f"Task {task_id} does not depend on {depends_on_task_id}.")
+        node.dependencies = remaining
+    
     def instantiate_agents(self):
-        """Instantiate all agents in the network."""
-        for agent_id, node in self.agent_nodes.items():
-            factory = self.domain_factories.get(node.domain, {}).get("agents")
-            if not factory:
-                raise ValueError(f"No agent factory found for domain {node.domain}")
-            
-            # Get the method for creating this type of agent
-            method_name = f"create_{node.agent_type}_agent"
-            if not hasattr(factory, method_name):
-                raise ValueError(f"No method {method_name} found in factory for domain {node.domain}")
-            
-            # Create the agent
-            create_method = getattr(factory, method_name)
-            node.agent_instance = create_method()
+        """Instantiate all agents in the network, checking them out of the agent cache.
+
+        The agents are the network's own until release_agents is called.
+        """
+        # Agents of a previous call go back first, so they can be checked out again
+        self.release_agents()
+        with span("instantiate_agents", agents=len(self.agent_nodes)):
+            for agent_id, node in self.agent_nodes.items():
+                node.agent_instance = self.checkout_agent(node)
+
+    def checkout_agent(self, node):
+        """Check an agent for an agent node out of the agent cache.
+
+        Args:
+            node (AgentNode): The agent node.
+
+        Returns:
+            Agent: An idle agent identical to the node's from a previous run, or a new one.
+        """
+        definition = registry.get_agent_definition(f"{node.domain}_agents", node.agent_type)
+        key = make_agent_key(node.domain, node.agent_type, node.params, definition.content_hash)
+        return agent_cache.checkout(key, lambda: self.create_agent(node))
+
+    def release_agents(self):
+        """Return the network's agents to the agent cache, for other runs and networks to use.
+
+        The tasks built with the agents are dropped too; the next run instantiates both again.
+        """
+        agent_cache.release(self.get_all_agents())
+        for node in self.agent_nodes.values():
+            node.agent_instance = None
+        for node in self.task_nodes.values():
+            node.task_instance = None
+    
+    def create_agent(self, node):
+        """Create a new agent instance for an agent node, bypassing the agent cache.
+        
+        Args:
+            node (AgentNode): The agent node.
+        
+        Returns:
+            Agent: The agent, created with the node's params (such as "llm" to select a pooled client).
+        """
+        factory = self.domain_factories.get(node.domain, {}).get("agents")
+        if not factory:
+            raise ValueError(f"No agent factory found for domain {node.domain}")
+        
+        # Get the method for creating this type of agent
+        method_name = f"create_{node.agent_type}_agent"
+        if not hasattr(factory, method_name):
+            raise ValueError(f"No method {method_name} found in factory for domain {node.domain}")
+        
+        with span("create_agent", agent_id=node.id, agent_type=node.agent_type):
+            return getattr(factory, method_name)(**node.params)
     
     def instantiate_tasks(self):
         """Instantiate all tasks in the network."""
-        for task_id, node in self.task_nodes.items():
-            factory = self.domain_factories.get(node.domain, {}).get("tasks")
-            if not factory:
-                raise ValueError(f"No task factory found for domain {node.domain}")
+        with span("instantiate_tasks", tasks=len(self.task_nodes)):
+            for task_id, node in self.task_nodes.items():
+                factory = self.domain_factories.get(node.domain, {}).get("tasks")
+                if not factory:
+                    raise ValueError(f"No task factory found for domain {node.domain}")
             
-            # Ensure the agent is instantiated
-            if not node.agent_node.agent_instance:
-                raise ValueError(f"Agent {node.agent_node.id} is not instantiated.")
+                # Ensure the agent is instantiated
+                if not node.agent_node.agent_instance:
+                    raise ValueError(f"Agent {node.agent_node.id} is not instantiated.")
             
-            # Get the method for creating this type of task
-            method_name = f"create_{node.task_type}_task"
-            if not hasattr(factory, method_name):
-                raise ValueError(f"No method {method_name} found in factory for domain {node.domain}")
+                # Get the method for creating this type of task
+                method_name = f"create_{node.task_type}_task"
+                if not hasattr(factory, method_name):
+                    raise ValueError(f"No method {method_name} found in factory for domain {node.domain}")
             
-            # Create the task
-            create_method = getattr(factory, method_name)
+                # Create the task
+                create_method = getattr(factory, method_name)
             
-            # Create the task with the agent and parameters
-            node.task_instance = create_method(
-                agent=node.agent_node.agent_instance, 
-                **node.params
-            )
+                # Create the task with the agent and parameters
+                node.task_instance = create_method(
+                    agent=node.agent_node.agent_instance, 
+                    **node.params
+                )
     
     def get_all_agents(self):
         """Get all instantiated agents in the network."""
@@ -175,38 +349,28 @@ class CrewNetwork:
         
         Returns:
             list: A list of tasks in the order they should be executed.
-        """
-        # Implement topological sort to get tasks in order
-        visited = set()
-        task_ordering = []
-        
-        def dfs(task_id):
-            if task_id in visited:
-                return
-            visited.add(task_id)
-            
-            # Visit all dependencies first
-            for dep in self.task_nodes[task_id].dependencies:
-                dfs(dep.id)
-            
-            # Add the task after all dependencies
-            task_ordering.append(self.task_nodes[task_id].task_instance)
         
-        # Start DFS from tasks with no dependent tasks
-        for task_id in self.task_nodes:
-            if not any(task_id in [dep.id for dep in node.dependencies] 
-                     for node in self.task_nodes.values()):
-                dfs(task_id)
+        Raises:
+            CycleError: If the task dependencies contain a cycle.
+        """
+        return [self.task_nodes[task_id].task_instance for task_id in topological_order(self.task_nodes)]
+    
+    def get_execution_levels(self):
+        """Group the network's tasks into levels that can run in parallel.
         
-        # For any remaining tasks (in case of cycles, though we should avoid them)
-        for task_id in self.task_nodes:
-            if task_id not in visited:
-                dfs(task_id)
+        Returns:
+            list: A list of levels, each a list of task IDs whose dependencies
+                are all in earlier levels.
         
-        return task_ordering
+        Raises:
+            CycleError: If the task dependencies contain a cycle.
+        """
+        return execution_levels(self.task_nodes)
     
     def build_crew(self, name="Dynamic Crew", description=None):
         """Build a crew from the network."""
+        self.name = name
+
         # Make sure agents and tasks are instantiated
         if not all(node.agent_instance for node in self.agent_nodes.values()):
             self.instantiate_agents()
@@ -219,6 +383,7 @@ class CrewNetwork:
         tasks = self.get_all_tasks()
         
         # Create the crew with a callback to combine outputs
+        from crewai import Crew
         crew = Crew(
             agents=agents,
             tasks=tasks,
@@ -231,6 +396,53 @@ class CrewNetwork:
         
         return crew
 
+    def run_concurrent(self, name="Dynamic Crew", max_workers=None, cancel_event=None, on_event=None, reuse_results=True):
+        """Run the network by executing independent tasks concurrently.
+
+        Unlike the sequential crew, tasks are scheduled from the dependency graph:
+        every task whose dependencies are complete runs on a bounded worker pool
+        and receives its upstream outputs as context. Tasks whose params, agent
+        and upstream outputs are unchanged since the previous run reuse their
+        stored output, so only edited tasks and their downstream closure execute.
+
+        Args:
+            name (str): The name of the workflow, used in the combined report.
+            max_workers (int): Maximum number of tasks running at the same time.
+            cancel_event (threading.Event): When set, no further tasks are started.
+            on_event (callable): Called with a dict as each task starts, completes, fails or is reused.
+            reuse_results (bool): Whether to reuse outputs stored by previous runs.
+
+        Returns:
+            dict: The combined report of all task outputs.
+        """
+        self.name = name
+
+        # Make sure agents and tasks are instantiated
+        if not all(node.agent_instance for node in self.agent_nodes.values()):
+            self.instantiate_agents()
+
+        if not all(node.task_instance for node in self.task_nodes.values()):
+            self.instantiate_tasks()
+
+        executor = DAGExecutor(
+            self,
+            max_workers=max_workers,
+            cancel_event=cancel_event,
+            on_event=on_event,
+            results=self.task_results,
+            reuse=reuse_results
+        )
+        outputs = executor.run()
+        
+        # Forget results of tasks that were removed from the network
+        for task_id in list(self.task_results):
+            if task_id not in self.task_nodes:
+                del self.task_results[task_id]
+        
+        report = self.combine_outputs(outputs)
+        report["reused_tasks"] = executor.reused
+        return report
+
     def combine_outputs(self, outputs):
         """Combine sequential task outputs into a single coherent report."""
         combined_report = {
@@ -333,6 +545,50 @@ def from_frontend_data(data):
     
     return network
 
+def to_frontend_data(network):
+    """Convert a network back into the data structure sent by the frontend.
+    
+    Args:
+        network (CrewNetwork): The network to serialize.
+    
+    Returns:
+        dict: The agents, tasks and connections of the network.
+    """
+    data = {
+        "agents": [],
+        "tasks": [],
+        "connections": []
+    }
+    
+    # Serialize agent nodes
+    for agent_id, agent_node in network.agent_nodes.items():
+        data["agents"].append({
+            "id": agent_node.id,
+            "type": agent_node.agent_type,
+            "domain": agent_node.domain,
+            "params": agent_node.params
+        })
+    
+    # Serialize task nodes
+    for task_id, task_node in network.task_nodes.items():
+        data["tasks"].append({
+            "id": task_node.id,
+            "type": task_node.task_type,
+            "domain": task_node.domain,
+            "agent_id": task_node.agent_node.id,
+            "params": task_node.params
+        })
+    
+    # Serialize connections
+    for task_id, task_node in network.task_nodes.items():
+        for dep in task_node.dependencies:
+            data["connections"].append({
+                "from": dep.id,
+                "to": task_id
+            })
+    
+    return data
+
 if __name__ == "__main__":
     # Example 1: Create a network programmatically
     network = example_corporate_network()
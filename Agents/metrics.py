@@ -0,0 +1,271 @@
+"""Process-wide metrics exposed in the Prometheus text format.
+
+Components record into the metrics defined at the bottom of this module.
+Values owned by other components (cache counters, queue depths) are copied
+into gauges by collectors registered with `metrics.on_collect`, which run
+every time the metrics are rendered.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from tracing import span
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# Type of the agent executing the current task, used to attribute LLM and tool calls
+_agent_type = contextvars.ContextVar("metrics_agent_type", default="none")
+
+@contextmanager
+def agent_context(agent_type):
+    """Attribute the LLM and tool calls made in this context to an agent type."""
+    token = _agent_type.set(agent_type)
+    try:
+        yield
+    finally:
+        _agent_type.reset(token)
+
+def current_agent_type():
+    return _agent_type.get()
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=None):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    """A metric family: one series per combination of label values."""
+
+    type = None
+
+    def __init__(self, name, help, labelnames=()):
+        """Initialize the metric.
+
+        Args:
+            name (str): The metric name.
+            help (str): The description shown in the HELP line.
+            labelnames (tuple): The names of the metric's labels.
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self):
+        """Drop every series, e.g. before a collector sets the current values."""
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value):
+        return [f"{self.name}{format_labels(self.labelnames, key)} {format_value(value)}"]
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    type = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Set the total directly, for counters mirrored from another component."""
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+class Gauge(Metric):
+    """A value that can go up and down."""
+
+    type = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0}
+            series["counts"][bisect.bisect_left(self.buckets, value)] += 1
+            series["sum"] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _render_series(self, key, series):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), series["counts"]):
+            cumulative += count
+            labels = format_labels(self.labelnames, key, f'le="{format_value(float(bound))}"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {format_value(series['sum'])}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class MetricsRegistry:
+    """Holds every metric and renders them in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def counter(self, name, help, labelnames=()):
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name, help, labelnames=()):
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def on_collect(self, collector):
+        """Register a callable run before every render, to copy current values into gauges."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self):
+        """Render every metric.
+
+        Returns:
+            str: The metrics in the Prometheus text format.
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+            metrics = list(self._metrics.values())
+        for collector in collectors:
+            collector()
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+# Shared registry served at /metrics
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "Latency of HTTP requests.", ("method", "route", "status"))
+run_duration = metrics.histogram(
+    "crew_run_duration_seconds", "Duration of network runs.", ("network_id", "mode", "status"))
+task_duration = metrics.histogram(
+    "crew_task_duration_seconds", "Duration of executed tasks.", ("task_type", "status"))
+tasks_reused = metrics.counter(
+    "crew_tasks_reused_total", "Tasks whose stored output was reused instead of executed.", ("task_type",))
+llm_calls = metrics.counter(
+    "llm_calls_total", "LLM calls sent to the provider.", ("model", "agent_type", "status"))
+llm_call_duration = metrics.histogram(
+    "llm_call_duration_seconds", "Latency of LLM calls sent to the provider.", ("model", "agent_type"))
+llm_tokens = metrics.counter(
+    "llm_tokens_total", "Prompt and completion tokens of LLM calls, as reported by the provider or estimated.",
+    ("model", "agent_type", "kind", "source"))
+tool_calls = metrics.counter(
+    "tool_calls_total", "Tool invocations.", ("tool", "agent_type", "status"))
+tool_call_duration = metrics.histogram(
+    "tool_call_duration_seconds", "Latency of tool invocations.", ("tool",))
+startup_duration = metrics.gauge(
+    "startup_duration_seconds", "Time spent in each startup phase.", ("phase",))
+# Values owned by other components, copied in by collectors
+active_networks = metrics.gauge(
+    "crew_active_networks", "Networks in the network registry.", ("location",))
+jobs = metrics.gauge(
+    "crew_jobs", "Tracked background runs by status.", ("status",))
+llm_queue_depth = metrics.gauge(
+    "llm_queue_depth", "LLM calls waiting for quota.", ("model", "priority"))
+llm_in_flight = metrics.gauge(
+    "llm_in_flight", "LLM calls in flight.", ("model",))
+cache_hits = metrics.counter(
+    "cache_hits_total", "Cache hits.", ("cache",))
+cache_misses = metrics.counter(
+    "cache_misses_total", "Cache misses.", ("cache",))
+cache_hit_ratio = metrics.gauge(
+    "cache_hit_ratio", "Share of cache lookups that were hits.", ("cache",))
+
+def record_cache(cache, hits, misses):
+    """Copy the hit and miss counts of a cache into the cache metrics."""
+    cache_hits.set(hits, cache=cache)
+    cache_misses.set(misses, cache=cache)
+    cache_hit_ratio.set(hits / (hits + misses) if hits + misses else 0.0, cache=cache)
+
+def instrument_tool(tool, name):
+    """Count, time and trace every invocation of a tool instance.
+
+    Tools are pydantic models that reject unknown attributes, so the wrapper is
+    stored with object.__setattr__ and shadows the class's _run.
+
+    Args:
+        tool (BaseTool): The tool.
+        name (str): The tool name used as label.
+
+    Returns:
+        BaseTool: The same tool.
+    """
+    run = tool._run
+
+    def instrumented_run(*args, **kwargs):
+        status = "succeeded"
+        start = time.perf_counter()
+        try:
+            with span(f"tool:{name}", agent_type=current_agent_type()):
+                return run(*args, **kwargs)
+        except Exception:
+            status = "failed"
+            raise
+        finally:
+            tool_call_duration.observe(time.perf_counter() - start, tool=name)
+            tool_calls.inc(tool=name, agent_type=current_agent_type(), status=status)
+
+    object.__setattr__(tool, '_run', instrumented_run)
+    return tool
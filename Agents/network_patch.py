@@ -0,0 +1,222 @@
+"""Apply incremental edits to a CrewNetwork in place.
+
+A patch is a list of operations, applied in order:
+
+    {"op": "add_agent", "agent": {"id", "type", "domain", "params"}}
+    {"op": "update_agent", "id", "type"?, "domain"?, "params"?}
+    {"op": "remove_agent", "id"}
+    {"op": "add_task", "task": {"id", "type", "agent_id", "domain", "params"}}
+    {"op": "update_task", "id", "type"?, "agent_id"?, "domain"?, "params"?}
+    {"op": "remove_task", "id"}
+    {"op": "add_connection", "from", "to"}
+    {"op": "remove_connection", "from", "to"}
+
+"params" in update operations are merged into the existing params, and a
+null value removes a param (JSON merge patch semantics). A patch is atomic:
+if any operation fails, the ones already applied are undone.
+"""
+
+def check_operation(operation):
+    """Check that an operation and the agent, task and params it carries are objects.
+
+    Raises:
+        ValueError: If one of them is not.
+    """
+    if not isinstance(operation, dict):
+        raise ValueError("An operation must be an object")
+    for field in ("agent", "task"):
+        if field in operation and not isinstance(operation[field], dict):
+            raise ValueError(f"{field} must be an object")
+    for fields in (operation, operation.get("agent") or {}, operation.get("task") or {}):
+        if fields.get("params") is not None and not isinstance(fields["params"], dict):
+            raise ValueError("params must be an object")
+
+def merge_params(params, changes):
+    """Merge changed params into a copy of the existing params.
+
+    Args:
+        params (dict): The existing params.
+        changes (dict): The changed params; None values remove a param.
+
+    Returns:
+        dict: The merged params.
+    """
+    merged = dict(params)
+    for key, value in changes.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = value
+    return merged
+
+def depends_on(network, task_id, target_id):
+    """Check whether a task depends, directly or transitively, on another task."""
+    stack = [network.task_nodes[task_id]]
+    seen = set()
+    while stack:
+        node = stack.pop()
+        if node.id == target_id:
+            return True
+        if node.id in seen:
+            continue
+        seen.add(node.id)
+        stack.extend(node.dependencies)
+    return False
+
+class NetworkPatch:
+    """Applies a list of operations to a network and tracks what was invalidated."""
+
+    def __init__(self, network):
+        """Initialize the patch.
+
+        Args:
+            network (CrewNetwork): The network to edit in place.
+        """
+        self.network = network
+        self.invalidated_agents = set()
+        self.invalidated_tasks = set()
+        self._undo = []
+
+    def apply(self, operations):
+        """Apply operations in order, undoing all of them if one fails.
+
+        Args:
+            operations (list): The operations to apply.
+
+        Returns:
+            dict: The number of operations applied and the invalidated agent and task IDs.
+        """
+        for index, operation in enumerate(operations):
+            op = operation.get("op") if isinstance(operation, dict) else None
+            try:
+                check_operation(operation)
+                handler = getattr(self, f"_{op}", None) if isinstance(op, str) else None
+                if handler is None:
+                    raise ValueError(f"Unknown operation {op}")
+                handler(operation)
+            except Exception as e:
+                # Whatever failed, the operations already applied must not stay half done
+                self.rollback()
+                message = f"missing field {e}" if isinstance(e, KeyError) else str(e)
+                raise ValueError(f"Operation {index} ({op}) failed: {message}") from e
+
+        return {
+            "applied": len(operations),
+            "invalidated_agents": sorted(self.invalidated_agents),
+            "invalidated_tasks": sorted(self.invalidated_tasks)
+        }
+
+    def rollback(self):
+        """Undo every operation applied so far, most recent first."""
+        while self._undo:
+            self._undo.pop()()
+
+    def _add_agent(self, operation):
+        agent = operation["agent"]
+        if agent["id"] in self.network.agent_nodes:
+            raise ValueError(f"Agent {agent['id']} already exists.")
+
+        self.network.add_agent_node(agent["id"], agent["type"], agent.get("domain", "corporate"), agent.get("params", {}))
+        self.invalidated_agents.add(agent["id"])
+        self._undo.append(lambda: self.network.agent_nodes.pop(agent["id"]))
+
+    def _update_agent(self, operation):
+        agent_id = operation["id"]
+        node = self.network.agent_nodes.get(agent_id)
+        if node is None:
+            raise ValueError(f"Agent {agent_id} not found.")
+
+        snapshot = dict(vars(node))
+        task_instances = {task_id: task_node.task_instance for task_id, task_node in self.network.task_nodes.items()}
+        params = merge_params(node.params, operation["params"]) if "params" in operation else None
+
+        invalidated = self.network.update_agent_node(agent_id, operation.get("type"), operation.get("domain"), params)
+        self.invalidated_agents.add(agent_id)
+        self.invalidated_tasks.update(invalidated)
+
+        def undo():
+            vars(node).update(snapshot)
+            for task_id in invalidated:
+                self.network.task_nodes[task_id].task_instance = task_instances[task_id]
+        self._undo.append(undo)
+
+    def _remove_agent(self, operation):
+        agent_id = operation["id"]
+        node = self.network.remove_agent_node(agent_id)
+        self.invalidated_agents.discard(agent_id)
+        self._undo.append(lambda: self.network.agent_nodes.__setitem__(agent_id, node))
+
+    def _add_task(self, operation):
+        task = operation["task"]
+        if task["id"] in self.network.task_nodes:
+            raise ValueError(f"Task {task['id']} already exists.")
+
+        self.network.add_task_node(task["id"], task["type"], task["agent_id"], task.get("domain", "corporate"), task.get("params", {}))
+        self.invalidated_tasks.add(task["id"])
+        self._undo.append(lambda: self.network.task_nodes.pop(task["id"]))
+
+    def _update_task(self, operation):
+        task_id = operation["id"]
+        node = self.network.task_nodes.get(task_id)
+        if node is None:
+            raise ValueError(f"Task {task_id} not found.")
+
+        snapshot = dict(vars(node))
+        params = merge_params(node.params, operation["params"]) if "params" in operation else None
+
+        self.network.update_task_node(task_id, operation.get("type"), operation.get("agent_id"), operation.get("domain"), params)
+        self.invalidated_tasks.add(task_id)
+        self._undo.append(lambda: vars(node).update(snapshot))
+
+    def _remove_task(self, operation):
+        task_id = operation["id"]
+        if task_id not in self.network.task_nodes:
+            raise ValueError(f"Task {task_id} not found.")
+
+        # remove_task_node replaces the dependents' dependency lists, so the old lists can be restored
+        dependencies = {other_id: node.dependencies for other_id, node in self.network.task_nodes.items()}
+        result = self.network.task_results.get(task_id)
+        removed, dependents = self.network.remove_task_node(task_id)
+        self.invalidated_tasks.discard(task_id)
+
+        def undo():
+            self.network.task_nodes[task_id] = removed
+            for dependent_id in dependents:
+                self.network.task_nodes[dependent_id].dependencies = dependencies[dependent_id]
+            if result is not None:
+                self.network.task_results[task_id] = result
+        self._undo.append(undo)
+
+    def _add_connection(self, operation):
+        from_id, to_id = operation["from"], operation["to"]
+        if from_id not in self.network.task_nodes:
+            raise ValueError(f"Task {from_id} not found.")
+        if to_id not in self.network.task_nodes:
+            raise ValueError(f"Task {to_id} not found.")
+        if any(dep.id == from_id for dep in self.network.task_nodes[to_id].dependencies):
+            return
+        if from_id == to_id or depends_on(self.network, from_id, to_id):
+            raise ValueError(f"Connecting {from_id} to {to_id} would create a cycle.")
+
+        self.network.add_task_dependency(to_id, from_id)
+        self._undo.append(lambda: self.network.remove_task_dependency(to_id, from_id))
+
+    def _remove_connection(self, operation):
+        from_id, to_id = operation["from"], operation["to"]
+        self.network.remove_task_dependency(to_id, from_id)
+        self._undo.append(lambda: self.network.add_task_dependency(to_id, from_id))
+
+def apply_operations(network, operations):
+    """Apply a patch to a network in place.
+
+    Args:
+        network (CrewNetwork): The network to edit.
+        operations (list): The operations to apply.
+
+    Returns:
+        dict: The number of operations applied and the invalidated agent and task IDs.
+
+    Raises:
+        ValueError: If an operation is invalid; the network is left unchanged.
+    """
+    return NetworkPatch(network).apply(operations)
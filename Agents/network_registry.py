@@ -0,0 +1,231 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote, unquote
+from main import from_frontend_data, to_frontend_data
+
+DEFAULT_SPILL_DIR = os.getenv(
+    "NETWORK_SPILL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db', 'networks')
+)
+DEFAULT_MAX_ENTRIES = int(os.getenv("NETWORK_REGISTRY_MAX_ENTRIES", "256"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("NETWORK_REGISTRY_MAX_MB", "512")) * 1024 * 1024)
+DEFAULT_TTL = float(os.getenv("NETWORK_REGISTRY_TTL_SECONDS", "3600"))
+
+# Rough in-memory cost of a node beyond its serialized config (objects, instances, indexes)
+NODE_OVERHEAD_BYTES = 2048
+
+def estimate_size(network):
+    """Estimate the memory held by a network, in bytes.
+
+    Args:
+        network (CrewNetwork): The network.
+
+    Returns:
+        int: The size of its serialized config and stored task outputs plus a per-node overhead.
+    """
+    config_size = len(json.dumps(to_frontend_data(network), default=str))
+    results_size = sum(len(output) for _, output in network.task_results.values())
+    node_count = len(network.agent_nodes) + len(network.task_nodes)
+    return config_size + results_size + node_count * NODE_OVERHEAD_BYTES
+
+class NetworkRegistry:
+    """Bounded registry of active networks that spills evicted networks to disk.
+
+    Networks are kept in memory in least recently used order. When the registry
+    holds more than max_entries networks or max_bytes of estimated memory, or a
+    network has not been accessed for ttl seconds, it is serialized to the spill
+    directory and dropped from memory. Accessing a spilled network transparently
+    loads it back.
+
+    Supports the dict operations CrewAPI uses: `in`, `[]`, `[] =`, `del`, `len` and `get`.
+    """
+
+    def __init__(self, spill_dir=DEFAULT_SPILL_DIR, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, is_pinned=None):
+        """Initialize the registry.
+
+        Args:
+            spill_dir (str): Directory where evicted networks are written.
+            max_entries (int): Maximum number of networks kept in memory.
+            max_bytes (int): Maximum estimated memory of the networks kept in memory.
+            ttl (float): Seconds of inactivity after which a network is evicted.
+            is_pinned (callable): Called with a network ID; networks for which it
+                returns True (e.g. while running) are never evicted.
+        """
+        self.spill_dir = spill_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.is_pinned = is_pinned or (lambda network_id: False)
+        self.evictions = 0
+        self.rehydrations = 0
+        self._networks = OrderedDict()
+        self._sizes = {}
+        self._last_access = {}
+        self._lock = threading.RLock()
+
+        os.makedirs(spill_dir, exist_ok=True)
+        self._spilled = {
+            unquote(filename[:-len('.json')])
+            for filename in os.listdir(spill_dir) if filename.endswith('.json')
+        }
+
+    def __contains__(self, network_id):
+        with self._lock:
+            return network_id in self._networks or network_id in self._spilled
+
+    def __getitem__(self, network_id):
+        with self._lock:
+            if network_id not in self._networks:
+                if network_id not in self._spilled:
+                    raise KeyError(network_id)
+                self._rehydrate(network_id)
+            self._touch(network_id)
+            network = self._networks[network_id]
+            self._enforce_limits(keep=network_id)
+            return network
+
+    def __setitem__(self, network_id, network):
+        with self._lock:
+            self._networks[network_id] = network
+            self._discard_spill(network_id)
+            self._sizes[network_id] = estimate_size(network)
+            self._touch(network_id)
+            self._enforce_limits(keep=network_id)
+
+    def __delitem__(self, network_id):
+        with self._lock:
+            if network_id not in self:
+                raise KeyError(network_id)
+            self._networks.pop(network_id, None)
+            self._sizes.pop(network_id, None)
+            self._last_access.pop(network_id, None)
+            self._discard_spill(network_id)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._networks) + len(self._spilled)
+
+    def get(self, network_id, default=None):
+        try:
+            return self[network_id]
+        except KeyError:
+            return default
+
+    def refresh(self, network_id):
+        """Re-estimate a network's size after it changed (e.g. after a run) and enforce the limits."""
+        with self._lock:
+            if network_id in self._networks:
+                self._sizes[network_id] = estimate_size(self._networks[network_id])
+                self._enforce_limits(keep=network_id)
+
+    def counts(self):
+        """Get the number of networks held in memory and spilled to disk.
+
+        Returns:
+            tuple: (in_memory, spilled)
+        """
+        with self._lock:
+            return len(self._networks), len(self._spilled)
+
+    def stats(self):
+        """Get per-network size accounting.
+
+        Returns:
+            dict: Limits, totals and, for every network, its location, size and last access.
+        """
+        with self._lock:
+            networks = []
+            for network_id, network in self._networks.items():
+                networks.append({
+                    "network_id": network_id,
+                    "in_memory": True,
+                    "estimated_bytes": self._sizes.get(network_id, 0),
+                    "agents": len(network.agent_nodes),
+                    "tasks": len(network.task_nodes),
+                    "stored_results": len(network.task_results),
+                    "idle_seconds": time.time() - self._last_access.get(network_id, time.time()),
+                    "pinned": self.is_pinned(network_id)
+                })
+            for network_id in sorted(self._spilled):
+                path = self._spill_path(network_id)
+                networks.append({
+                    "network_id": network_id,
+                    "in_memory": False,
+                    "spilled_bytes": os.path.getsize(path) if os.path.exists(path) else 0
+                })
+
+            return {
+                "in_memory": len(self._networks),
+                "spilled": len(self._spilled),
+                "estimated_bytes": sum(self._sizes.values()),
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "evictions": self.evictions,
+                "rehydrations": self.rehydrations,
+                "networks": networks
+            }
+
+    def _touch(self, network_id):
+        self._networks.move_to_end(network_id)
+        self._last_access[network_id] = time.time()
+
+    def _enforce_limits(self, keep=None):
+        """Spill expired networks, then least recently used ones while over a limit."""
+        now = time.time()
+        for network_id in list(self._networks):
+            if network_id != keep and now - self._last_access[network_id] > self.ttl:
+                self._evict(network_id)
+
+        for network_id in list(self._networks):
+            over_entries = len(self._networks) > self.max_entries
+            over_bytes = sum(self._sizes.values()) > self.max_bytes
+            if not (over_entries or over_bytes):
+                break
+            if network_id != keep:
+                self._evict(network_id)
+
+    def _evict(self, network_id):
+        if self.is_pinned(network_id):
+            return
+
+        network = self._networks.pop(network_id)
+        data = {
+            "network_id": network_id,
+            "config": to_frontend_data(network),
+            "task_results": {task_id: list(result) for task_id, result in network.task_results.items()}
+        }
+        path = self._spill_path(network_id)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(data, f)
+        os.replace(path + '.tmp', path)
+
+        self._spilled.add(network_id)
+        self._sizes.pop(network_id, None)
+        self._last_access.pop(network_id, None)
+        self.evictions += 1
+
+    def _rehydrate(self, network_id):
+        with open(self._spill_path(network_id), 'r') as f:
+            data = json.load(f)
+
+        network = from_frontend_data(data["config"])
+        network.task_results = {task_id: tuple(result) for task_id, result in data.get("task_results", {}).items()}
+        self._networks[network_id] = network
+        self._sizes[network_id] = estimate_size(network)
+        self._discard_spill(network_id)
+        self.rehydrations += 1
+
+    def _discard_spill(self, network_id):
+        if network_id in self._spilled:
+            self._spilled.discard(network_id)
+            path = self._spill_path(network_id)
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _spill_path(self, network_id):
+        return os.path.join(self.spill_dir, quote(network_id, safe='') + '.json')
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_STORE_PATH = os.getenv(
+    "NETWORK_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db', 'network_store.sqlite3')
+)
+DEFAULT_MAX_VERSIONS = int(os.getenv("NETWORK_STORE_MAX_VERSIONS", "50"))
+MAX_PAGE_SIZE = 500
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS networks ("
+    "network_id TEXT PRIMARY KEY, version INTEGER, config_hash TEXT, "
+    "agent_count INTEGER, task_count INTEGER, created_at REAL, updated_at REAL)",
+    "CREATE INDEX IF NOT EXISTS networks_updated ON networks (updated_at, network_id)",
+    "CREATE TABLE IF NOT EXISTS network_versions ("
+    "network_id TEXT, version INTEGER, config TEXT, saved_at REAL, "
+    "PRIMARY KEY (network_id, version))",
+    # One row per distinct (kind, domain, type) of a network's latest version, for filtering
+    "CREATE TABLE IF NOT EXISTS network_types ("
+    "network_id TEXT, kind TEXT, domain TEXT, type TEXT, "
+    "PRIMARY KEY (network_id, kind, domain, type))",
+    "CREATE INDEX IF NOT EXISTS network_types_type ON network_types (kind, type, network_id)",
+    "CREATE INDEX IF NOT EXISTS network_types_domain ON network_types (domain, network_id)",
+]
+
+def hash_config(config):
+    """Hash a network config independently of key order.
+
+    Args:
+        config (dict): The network config, as produced by to_frontend_data.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+def index_types(config):
+    """Get the distinct agent and task types of a network config.
+
+    Returns:
+        set: (kind, domain, type) tuples, kind being "agent" or "task".
+    """
+    types = set()
+    for kind, nodes in (("agent", config.get("agents", [])), ("task", config.get("tasks", []))):
+        for node in nodes:
+            types.add((kind, node.get("domain", "corporate"), node.get("type")))
+    return types
+
+class NetworkStore:
+    """SQLite-backed store of saved network configs with version history.
+
+    Every save of a changed config adds a version; the latest version of each
+    network is indexed by update time, domain and agent/task types so saved
+    networks can be listed and filtered without loading their configs.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, max_versions=DEFAULT_MAX_VERSIONS):
+        """Open the store, creating the database if needed.
+
+        Args:
+            path (str): The SQLite database file, or ":memory:".
+            max_versions (int): Versions kept per network before the oldest are pruned.
+        """
+        self.path = path
+        self.max_versions = max_versions
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def save(self, network_id, config):
+        """Save a network config as a new version.
+
+        Saving a config identical to the latest version does not add a version.
+
+        Args:
+            network_id (str): The ID of the network.
+            config (dict): The network config, as produced by to_frontend_data.
+
+        Returns:
+            dict: The network ID, its version and whether a new version was written.
+        """
+        now = time.time()
+        config_hash = hash_config(config)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, config_hash FROM networks WHERE network_id = ?", (network_id,)
+            ).fetchone()
+            if row is not None and row[1] == config_hash:
+                return {"network_id": network_id, "version": row[0], "changed": False}
+
+            version = row[0] + 1 if row else 1
+            with self._conn:
+                self._conn.execute(
+                    "INSERT INTO network_versions (network_id, version, config, saved_at) VALUES (?, ?, ?, ?)",
+                    (network_id, version, json.dumps(config), now)
+                )
+                self._conn.execute(
+                    "INSERT INTO networks (network_id, version, config_hash, agent_count, task_count, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (network_id) DO UPDATE SET version = excluded.version, "
+                    "config_hash = excluded.config_hash, agent_count = excluded.agent_count, "
+                    "task_count = excluded.task_count, updated_at = excluded.updated_at",
+                    (network_id, version, config_hash, len(config.get("agents", [])),
+                     len(config.get("tasks", [])), now, now)
+                )
+                self._conn.execute("DELETE FROM network_types WHERE network_id = ?", (network_id,))
+                self._conn.executemany(
+                    "INSERT INTO network_types (network_id, kind, domain, type) VALUES (?, ?, ?, ?)",
+                    [(network_id, kind, domain, node_type) for kind, domain, node_type in index_types(config)]
+                )
+                if self.max_versions:
+                    self._conn.execute(
+                        "DELETE FROM network_versions WHERE network_id = ? AND version <= ?",
+                        (network_id, version - self.max_versions)
+                    )
+
+        return {"network_id": network_id, "version": version, "changed": True}
+
+    def load(self, network_id, version=None):
+        """Load a saved network config.
+
+        Args:
+            network_id (str): The ID of the network.
+            version (int): The version to load, defaults to the latest.
+
+        Returns:
+            dict: The network config, or None if the network or version is not stored.
+        """
+        with self._lock:
+            if version is None:
+                row = self._conn.execute(
+                    "SELECT v.config FROM networks n JOIN network_versions v "
+                    "ON v.network_id = n.network_id AND v.version = n.version WHERE n.network_id = ?",
+                    (network_id,)
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT config FROM network_versions WHERE network_id = ? AND version = ?",
+                    (network_id, version)
+                ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete(self, network_id):
+        """Delete a network and its history.
+
+        Returns:
+            bool: Whether the network was stored.
+        """
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM networks WHERE network_id = ?", (network_id,)).rowcount
+            self._conn.execute("DELETE FROM network_versions WHERE network_id = ?", (network_id,))
+            self._conn.execute("DELETE FROM network_types WHERE network_id = ?", (network_id,))
+        return bool(deleted)
+
+    def versions(self, network_id):
+        """List the stored versions of a network, newest first.
+
+        Returns:
+            list: The version numbers and save times.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT version, saved_at FROM network_versions WHERE network_id = ? ORDER BY version DESC",
+                (network_id,)
+            ).fetchall()
+        return [{"version": version, "saved_at": saved_at} for version, saved_at in rows]
+
+    def list(self, domain=None, agent_type=None, task_type=None, search=None, limit=50, cursor=None):
+        """List saved networks, most recently updated first.
+
+        Pages are fetched by keyset on (updated_at, network_id), so each page
+        costs the same however deep into the listing it is.
+
+        Args:
+            domain (str): Only networks with an agent or task in this domain.
+            agent_type (str): Only networks using this agent type.
+            task_type (str): Only networks using this task type.
+            search (str): Only networks whose ID contains this text.
+            limit (int): Page size, at most MAX_PAGE_SIZE.
+            cursor (str): The next_cursor returned with the previous page.
+
+        Returns:
+            dict: The networks of the page and the cursor of the next page (None on the last page).
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        clauses, args = [], []
+        if domain:
+            clauses.append("n.network_id IN (SELECT network_id FROM network_types WHERE domain = ?)")
+            args.append(domain)
+        if agent_type:
+            clauses.append("n.network_id IN (SELECT network_id FROM network_types WHERE kind = 'agent' AND type = ?)")
+            args.append(agent_type)
+        if task_type:
+            clauses.append("n.network_id IN (SELECT network_id FROM network_types WHERE kind = 'task' AND type = ?)")
+            args.append(task_type)
+        if search:
+            clauses.append("instr(n.network_id, ?) > 0")
+            args.append(search)
+        if cursor:
+            updated_at, network_id = decode_cursor(cursor)
+            clauses.append("(n.updated_at < ? OR (n.updated_at = ? AND n.network_id < ?))")
+            args.extend([updated_at, updated_at, network_id])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT n.network_id, n.version, n.agent_count, n.task_count, n.created_at, n.updated_at "
+                f"FROM networks n {where} ORDER BY n.updated_at DESC, n.network_id DESC LIMIT ?",
+                args + [limit + 1]
+            ).fetchall()
+            page = rows[:limit]
+            types = self._types_of([row[0] for row in page])
+
+        networks = [{
+            "network_id": network_id,
+            "version": version,
+            "agents": agent_count,
+            "tasks": task_count,
+            "created_at": created_at,
+            "updated_at": updated_at,
+            **types.get(network_id, {"domains": [], "agent_types": [], "task_types": []})
+        } for network_id, version, agent_count, task_count, created_at, updated_at in page]
+
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(page[-1][5], page[-1][0])
+        return {"networks": networks, "next_cursor": next_cursor}
+
+    def _types_of(self, network_ids):
+        """Get the domains and agent/task types of networks. Caller holds the lock."""
+        types = {}
+        if not network_ids:
+            return types
+        placeholders = ", ".join("?" for _ in network_ids)
+        for network_id, kind, domain, node_type in self._conn.execute(
+            f"SELECT network_id, kind, domain, type FROM network_types WHERE network_id IN ({placeholders}) "
+            "ORDER BY type", network_ids
+        ):
+            entry = types.setdefault(network_id, {"domains": [], "agent_types": [], "task_types": []})
+            if domain not in entry["domains"]:
+                entry["domains"].append(domain)
+            if node_type not in entry[f"{kind}_types"]:
+                entry[f"{kind}_types"].append(node_type)
+        return types
+
+def encode_cursor(updated_at, network_id):
+    return f"{updated_at!r}:{network_id}"
+
+def decode_cursor(cursor):
+    try:
+        updated_at, network_id = cursor.split(":", 1)
+        return float(updated_at), network_id
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor}")
@@ -0,0 +1,307 @@
+import contextvars
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+from metrics import current_agent_type
+from tracing import span
+
+# Provider quota shared by every agent using the same model and API key
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+DEFAULT_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "1000000"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+# Retries of a call rejected with a rate limit error, with exponential backoff and jitter
+DEFAULT_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+DEFAULT_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1"))
+DEFAULT_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60"))
+
+# Priority classes: lower values are served first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+@contextmanager
+def llm_priority(priority):
+    """Set the priority class of the LLM calls made in this context.
+
+    Args:
+        priority (int): INTERACTIVE or BATCH.
+    """
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+def estimate_tokens(messages):
+    """Roughly estimate the number of tokens of a prompt or response (about 4 characters per token).
+
+    Args:
+        messages (str or list): A prompt, a response or chat messages.
+
+    Returns:
+        int: The estimated token count.
+    """
+    if isinstance(messages, str):
+        text = messages
+    elif isinstance(messages, list):
+        text = "".join(str(m.get("content", "")) if isinstance(m, dict) else str(m) for m in messages)
+    else:
+        text = json.dumps(messages, default=str)
+    return max(1, len(text) // 4)
+
+def is_rate_limit_error(error):
+    """Check whether an exception is a provider's rate limit (HTTP 429) rejection."""
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    message = str(error).lower()
+    return (
+        type(error).__name__ == "RateLimitError"
+        or "429" in message
+        or "rate limit" in message
+        or "resource_exhausted" in message
+    )
+
+class TokenBucket:
+    """Bucket refilled continuously at a per-minute rate, holding at most one minute of capacity.
+
+    The level may go negative when more is consumed than was available, e.g.
+    when a response turns out longer than estimated; that debt is paid back
+    before anything else is allowed through.
+    """
+
+    def __init__(self, per_minute, now):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = now
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount, now):
+        """Get the seconds until `amount` is available (capped at capacity, so huge requests still pass)."""
+        self.refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing / self.rate) if self.rate else 0.0
+
+    def take(self, amount, now):
+        self.refill(now)
+        self.level -= amount
+
+class RateLimiter:
+    """Process-wide governor of the calls made against one LLM quota.
+
+    Calls wait until the request and token buckets have capacity and fewer
+    than max_concurrency calls are in flight. Waiting calls are admitted by
+    priority class, then in arrival order, so interactive runs overtake queued
+    batch items. A call rejected with a rate limit error pauses the limiter
+    for an exponential backoff with full jitter and is retried.
+    """
+
+    def __init__(self, name="llm", requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute=DEFAULT_TOKENS_PER_MINUTE, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE, backoff_max=DEFAULT_BACKOFF_MAX):
+        """Initialize the limiter.
+
+        Args:
+            name (str): Name reported in statistics, usually the model.
+            requests_per_minute (float): Requests allowed per minute.
+            tokens_per_minute (float): Prompt and response tokens allowed per minute.
+            max_concurrency (int): Maximum number of calls in flight.
+            max_retries (int): Retries of a call rejected with a rate limit error.
+            backoff_base (float): Backoff ceiling of the first retry, in seconds; doubles with each retry.
+            backoff_max (float): Maximum backoff ceiling, in seconds.
+        """
+        now = time.monotonic()
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._requests = TokenBucket(requests_per_minute, now)
+        self._tokens = TokenBucket(tokens_per_minute, now)
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._queued = {priority: 0 for priority in PRIORITY_NAMES}
+        self._in_flight = 0
+        self._paused_until = 0.0
+
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    def call(self, func, tokens=1, priority=None):
+        """Call func once the quota allows it, retrying rate limit errors.
+
+        Args:
+            func (callable): Performs the LLM call.
+            tokens (int): Estimated prompt tokens of the call.
+            priority (int): Priority class; defaults to the one set with llm_priority.
+
+        Returns:
+            The result of func.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority)
+            try:
+                result = func()
+            except Exception as e:
+                self.release()
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self.rate_limited += 1
+                self.retries += 1
+                self.pause(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+                continue
+
+            self.release(estimate_tokens(result) if isinstance(result, str) else 0)
+            return result
+
+    def acquire(self, tokens=1, priority=None):
+        """Wait for a slot and for request and token capacity.
+
+        Args:
+            tokens (int): Estimated tokens of the call.
+            priority (int): Priority class; defaults to the one set with llm_priority.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        priority = _priority.get() if priority is None else priority
+        start = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, ticket)
+            self._queued[priority] = self._queued.get(priority, 0) + 1
+            try:
+                while True:
+                    if self._waiters[0] == ticket:
+                        delay = self._delay(tokens, time.monotonic())
+                        if delay == 0:
+                            break
+                    else:
+                        delay = None
+                    self._cond.wait(delay)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._queued[priority] -= 1
+
+            now = time.monotonic()
+            self._requests.take(1, now)
+            self._tokens.take(tokens, now)
+            self._in_flight += 1
+            self.calls += 1
+            waited = now - start
+            if waited > 0.001:
+                self.throttled += 1
+                self.wait_seconds += waited
+            # The next waiter may be admissible too
+            self._cond.notify_all()
+        return waited
+
+    def release(self, extra_tokens=0):
+        """Free the slot of a finished call.
+
+        Args:
+            extra_tokens (int): Tokens used beyond the estimate passed to acquire (e.g. the response).
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if extra_tokens:
+                self._tokens.take(extra_tokens, time.monotonic())
+            self._cond.notify_all()
+
+    def pause(self, seconds):
+        """Stop admitting calls for a while, e.g. after the provider rejected one."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Get queue depth, throughput and throttling statistics.
+
+        Returns:
+            dict: Queued calls per priority class, calls in flight, bucket levels and counters.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            return {
+                "name": self.name,
+                "queued": {PRIORITY_NAMES.get(p, str(p)): count for p, count in self._queued.items()},
+                "in_flight": self._in_flight,
+                "max_concurrency": self.max_concurrency,
+                "requests_available": self._requests.level,
+                "requests_per_minute": self._requests.capacity,
+                "tokens_available": self._tokens.level,
+                "tokens_per_minute": self._tokens.capacity,
+                "paused_seconds": max(0.0, self._paused_until - now),
+                "calls": self.calls,
+                "throttled": self.throttled,
+                "wait_seconds": self.wait_seconds,
+                "rate_limited": self.rate_limited,
+                "retries": self.retries
+            }
+
+    def _delay(self, tokens, now):
+        """Seconds until a call may start, or None to wait for a slot. Caller holds the lock."""
+        if self._in_flight >= self.max_concurrency:
+            return None
+        return max(
+            self._paused_until - now,
+            self._requests.wait_time(1, now),
+            self._tokens.wait_time(tokens, now),
+            0.0
+        )
+
+_rate_limited_llm_classes = {}
+
+def get_rate_limited_llm_class(base=None):
+    """Get an LLM wrapper subclass whose calls go through a RateLimiter.
+
+    Built on first use so crewai is only imported when an LLM is actually needed.
+
+    Args:
+        base (type): The wrapper class to extend, defaults to LLMWrapper. Pass a
+            MeteredLLM so every attempt, including retries, is recorded.
+    """
+    if base is None:
+        from llm_wrapper import get_llm_wrapper_class
+        base = get_llm_wrapper_class()
+
+    if base not in _rate_limited_llm_classes:
+        class RateLimitedLLM(base):
+            """An LLM client that waits for its quota and retries rate limit errors.
+
+            crewai also retries the outermost client's call on rate limit
+            errors, but not the calls nested inside it, so every rejection of
+            the provider reaches the limiter and pauses the other callers.
+            """
+
+            rate_limiter: Any = None
+
+            def call(self, messages, tools=None, *args, **kwargs):
+                parent = super()
+                prompt_tokens = estimate_tokens(messages)
+                agent_type = current_agent_type()
+
+                # The llm_call span includes the time spent waiting for quota and backing off
+                with span("llm_call", model=self.model, agent_type=agent_type, prompt_tokens=prompt_tokens):
+                    return self.rate_limiter.call(lambda: parent.call(messages, tools, *args, **kwargs), tokens=prompt_tokens)
+
+        _rate_limited_llm_classes[base] = RateLimitedLLM
+    return _rate_limited_llm_classes[base]
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import threading
+from llm_cache import get_cached_llm_class, response_cache
+from metrics import instrument_tool
+from llm_metrics import get_metered_llm_class
+from rate_limiter import RateLimiter, get_rate_limited_llm_class
+
+# Model used when an agent does not ask for a specific one
+DEFAULT_MODEL = "gemini/gemini-2.0-flash"
+
+# Environment variable holding the API key for each provider prefix of a model name
+PROVIDER_API_KEYS = {
+    "gemini": "GEMINI_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "groq": "GROQ_API_KEY",
+}
+
+def resolve_api_key(model):
+    """Get the API key for a model from the environment.
+
+    Args:
+        model (str): The model name, optionally prefixed with its provider (e.g. gemini/gemini-2.0-flash).
+
+    Returns:
+        str: The API key, or None to let the LLM client resolve it.
+    """
+    provider = model.split('/', 1)[0] if '/' in model else "openai"
+    env_var = PROVIDER_API_KEYS.get(provider)
+    return os.getenv(env_var) if env_var else None
+
+def create_llm(model, api_key):
+    """Create the provider's client for a model.
+
+    crewai's LLM(...) returns the model's native provider client (e.g.
+    GeminiCompletion), which the pool then wraps.
+    """
+    from crewai import LLM
+    return LLM(model=model, api_key=api_key)
+
+def create_serper_tool():
+    from crewai_tools import SerperDevTool
+    return SerperDevTool()
+
+def create_scrape_tool():
+    from crewai_tools import ScrapeWebsiteTool
+    return ScrapeWebsiteTool()
+
+class ResourcePool:
+    """Process-wide pool of LLM clients and tools shared by every domain factory.
+
+    LLM clients and tools are built on first use and reused by every network.
+    LLM clients are keyed by model and credentials, so agents asking for the
+    same model share one client, and every call made with that client goes
+    through the client's rate limiter. The provider's client, created with
+    llm_factory, is wrapped in the metrics, rate limiting and response cache
+    layers.
+    """
+
+    def __init__(self, response_cache=None, rate_limit=True):
+        """Initialize the pool.
+
+        Args:
+            response_cache (ResponseCache): When given, LLM clients reuse cached responses.
+            rate_limit (bool): Whether LLM calls are governed by a RateLimiter per model and API key.
+        """
+        self.response_cache = response_cache
+        self.rate_limit = rate_limit
+        self.rate_limiters = {}
+        self.llm_factory = create_llm
+        self.tool_factories = {
+            "serper": create_serper_tool,
+            "scrape": create_scrape_tool,
+        }
+        self._llms = {}
+        self._tools = {}
+        self._lock = threading.Lock()
+
+    def get_llm(self, model=None, api_key=None):
+        """Get the shared LLM client for a model.
+
+        Args:
+            model (str): The model name. Defaults to DEFAULT_MODEL.
+            api_key (str): The API key. Defaults to the provider's key from the environment.
+
+        Returns:
+            BaseLLM: The pooled LLM client.
+        """
+        model = model or DEFAULT_MODEL
+        if api_key is None:
+            api_key = resolve_api_key(model)
+
+        # Key on a fingerprint so credentials are not kept around as dict keys
+        fingerprint = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16] if api_key else None
+        key = (model, fingerprint)
+
+        llm = self._llms.get(key)
+        if llm is None:
+            with self._lock:
+                llm = self._llms.get(key)
+                if llm is None:
+                    # Metrics wrap the provider call itself, so every attempt is recorded with or without rate limiting
+                    llm_class, kwargs = get_metered_llm_class(), {}
+                    if self.rate_limit:
+                        # Cache hits are served before the limiter, so they don't use quota
+                        llm_class = get_rate_limited_llm_class(llm_class)
+                        kwargs["rate_limiter"] = self.rate_limiters.setdefault(key, RateLimiter(name=model))
+                    if self.response_cache is not None:
+                        llm_class = get_cached_llm_class(llm_class)
+                        kwargs["response_cache"] = self.response_cache
+                    llm = llm_class(self.llm_factory(model, api_key), **kwargs)
+                    self._llms[key] = llm
+        return llm
+
+    def get_tool(self, name):
+        """Get a shared tool instance.
+
+        Args:
+            name (str): The name of the tool (e.g. serper, scrape).
+
+        Returns:
+            BaseTool: The pooled tool.
+        """
+        if name not in self.tool_factories:
+            raise ValueError(f"Unknown tool {name}")
+
+        tool = self._tools.get(name)
+        if tool is None:
+            with self._lock:
+                tool = self._tools.get(name)
+                if tool is None:
+                    tool = instrument_tool(self.tool_factories[name](), name)
+                    self._tools[name] = tool
+        return tool
+
+    def stats(self):
+        """Get the number of pooled clients and tools.
+
+        Returns:
+            dict: The pooled LLM models and tool names.
+        """
+        return {
+            "llms": sorted(model for model, _ in self._llms),
+            "tools": sorted(self._tools)
+        }
+
+    def rate_limit_stats(self):
+        """Get the queue depth and throttling statistics of every LLM rate limiter.
+
+        Returns:
+            list: The statistics of each limiter, one per model and API key.
+        """
+        return [limiter.stats() for limiter in list(self.rate_limiters.values())]
+
+# Shared pool used by the agent factories
+pool = ResourcePool(response_cache=response_cache)
@@ -0,0 +1,69 @@
+"""Startup timings and deferred loading of the agent stack.
+
+The server starts without importing crewai, so catalog and health routes are
+served as soon as the app is imported. crewai, crewai_tools and the LLM client
+classes are loaded by the first run, or ahead of it by a background warm-up
+started once the app is ready.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from metrics import startup_duration
+
+# Import the agent stack in the background right after startup instead of on the first run
+AGENT_STACK_WARMUP = os.getenv("AGENT_STACK_WARMUP", "true").lower() in ("1", "true", "yes")
+
+# Seconds spent in each startup phase, as reported by /health
+timings = {}
+
+_stack_lock = threading.Lock()
+_stack_loaded = threading.Event()
+
+def record(phase, seconds):
+    """Record how long a startup phase took."""
+    timings[phase] = round(seconds, 4)
+    startup_duration.set(seconds, phase=phase)
+
+@contextmanager
+def timed(phase):
+    """Record the duration of the code within this context as a startup phase."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(phase, time.perf_counter() - start)
+
+def agent_stack_loaded():
+    return _stack_loaded.is_set()
+
+def load_agent_stack():
+    """Import crewai, its tools and the pooled LLM client classes.
+
+    Runs once; later calls return immediately. Runs do not need to call this,
+    since the same imports happen on first use, but they are then paid by the
+    first request.
+    """
+    if _stack_loaded.is_set():
+        return
+    with _stack_lock:
+        if _stack_loaded.is_set():
+            return
+        with timed("agent_stack_import"):
+            import crewai
+            import crewai_tools
+            from llm_cache import get_cached_llm_class
+            from llm_metrics import get_metered_llm_class
+            from rate_limiter import get_rate_limited_llm_class
+            get_cached_llm_class(get_rate_limited_llm_class(get_metered_llm_class()))
+        _stack_loaded.set()
+
+def warm_up_in_background():
+    """Load the agent stack in a daemon thread, so the first run doesn't pay for the imports.
+
+    Returns:
+        threading.Thread: The warm-up thread.
+    """
+    thread = threading.Thread(target=load_agent_stack, name="agent-stack-warmup", daemon=True)
+    thread.start()
+    return thread
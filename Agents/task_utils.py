@@ -1,5 +1,4 @@
-import os
-import re
+from definition_registry import registry
 
 def load_task_definition(domain, task_type, params=None):
     """
@@ -14,60 +13,16 @@ def load_task_definition(domain, task_type, params=None):
     Returns:
         dict: A dictionary with description and expected_output keys
     """
-    folder_name = f"{domain}_tasks"
-    file_path = os.path.join(os.path.dirname(__file__), 'task_definitions', folder_name, f'{task_type}.md')
+    definition = registry.get_task_definition(domain, task_type)
     
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"Task definition file not found: {file_path}")
+    description = definition.description
+    expected_output = definition.expected_output
     
-    with open(file_path, 'r') as file:
-        content = file.read()
-    
-    # Extract description and expected_output using regex
-    description_match = re.search(r'## Description\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    expected_output_match = re.search(r'## Expected Output\s*\n(.*?)(?=\n##|\Z)', content, re.DOTALL)
-    
-    description = description_match.group(1).strip() if description_match else ""
-    expected_output = expected_output_match.group(1).strip() if expected_output_match else ""
-    
-    # Process conditional sections with {#if param} ... {/if}
+    # Render placeholders and {#if param} ... {/if} blocks in a single pass
     if params:
-        # Replace parameters
-        for key, value in params.items():
-            placeholder = '{' + key + '}'
-            description = description.replace(placeholder, str(value) if value is not None else "")
-        
-        # Handle conditional blocks
-        description = process_conditionals(description, params)
+        description = definition.description_template.render(params)
     
     return {
         'description': description,
         'expected_output': expected_output
     }
-
-def process_conditionals(text, params):
-    """
-    Process conditional blocks in the format {#if param}...{/if}
-    
-    Args:
-        text (str): The text containing conditional blocks
-        params (dict): Dictionary of parameters
-        
-    Returns:
-        str: Processed text with conditional blocks evaluated
-    """
-    # Find all conditional blocks
-    pattern = r'{#if (\w+)}(.*?){\/if}'
-    
-    def replace_conditional(match):
-        param_name = match.group(1)
-        content = match.group(2)
-        
-        # If parameter exists and has a truthy value, include the content
-        if param_name in params and params[param_name]:
-            return content
-        return ""  # Otherwise, remove the block
-    
-    # Replace all conditional blocks using regex substitution
-    processed_text = re.sub(pattern, replace_conditional, text, flags=re.DOTALL)
-    return processed_text 
\ No newline at end of file
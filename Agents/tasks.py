@@ -1,6 +1,6 @@
 # tasks.py
-from crewai import Task
 from textwrap import dedent
+# crewai is imported in the factory methods, so loading the catalog doesn't import it
 from task_utils import load_task_definition
 
 class CorporateTasks:
@@ -16,6 +16,7 @@ class CorporateTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('corporate', 'meeting_summarization', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -29,6 +30,7 @@ class CorporateTasks:
             params['email_content'] = email_content
             
         task_def = load_task_definition('corporate', 'smart_email_management', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -45,6 +47,7 @@ class CorporateTasks:
                 params['competitors'] = competitors
         
         task_def = load_task_definition('corporate', 'competitor_watchdog', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -62,6 +65,7 @@ class CorporateTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('corporate', 'customer_feedback_analysis', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -87,6 +91,7 @@ class MarketingTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('marketing', 'seo_optimization', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -107,6 +112,7 @@ class MarketingTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('marketing', 'competitor_watchdog', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -124,6 +130,7 @@ class MarketingTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('marketing', 'product_recommendation', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -145,6 +152,7 @@ class MarketingTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('marketing', 'post_creation', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
@@ -164,6 +172,7 @@ class MarketingTasks:
             params['pdf_path'] = pdf_path
             
         task_def = load_task_definition('marketing', 'email_campaign', params)
+        from crewai import Task
         return Task(
             description=dedent(task_def['description']),
             agent=agent,
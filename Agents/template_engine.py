@@ -0,0 +1,145 @@
+import re
+from collections import ChainMap
+
+# Matches every template tag in one pass:
+#   {#if param} / {#each param} open a block, {/if} / {/each} close it, {param} is a placeholder.
+# Anything else in braces (e.g. JSON examples in the markdown) is kept as literal text.
+TAG_PATTERN = re.compile(r'\{(?:#(if|each) (\w+)|/(if|each)|(\w+))\}')
+
+class TextNode:
+    def __init__(self, text):
+        self.text = text
+
+    def render(self, params, out):
+        out.append(self.text)
+
+class PlaceholderNode:
+    def __init__(self, name):
+        self.name = name
+
+    def render(self, params, out):
+        if self.name in params:
+            value = params[self.name]
+            out.append(str(value) if value is not None else "")
+        else:
+            # Unknown placeholders are left untouched, as with plain str.replace
+            out.append('{' + self.name + '}')
+
+class BlockNode:
+    def __init__(self, kind, name, source):
+        self.kind = kind
+        self.name = name
+        self.source = source
+        self.children = []
+
+    def render(self, params, out):
+        value = params.get(self.name)
+        if not value:
+            return
+
+        if self.kind == 'if':
+            for child in self.children:
+                child.render(params, out)
+            return
+
+        # {#each param} renders its body once per item, with the item available as {this}
+        if isinstance(value, str):
+            items = [item.strip() for item in value.split(',')]
+        elif isinstance(value, (list, tuple, set)):
+            items = value
+        else:
+            items = [value]
+        for item in items:
+            scope = ChainMap({'this': item}, params)
+            for child in self.children:
+                child.render(scope, out)
+
+class Template:
+    """A task description compiled into a tree of text, placeholders and blocks.
+
+    Supported syntax:
+        {param}                     replaced with the parameter's value
+        {#if param}...{/if}         kept only when the parameter is set and truthy; may be nested
+        {#each param}...{/each}     repeated for each item of a list (or comma-separated string),
+                                    with the current item available as {this}
+
+    Compiling walks the source once; rendering walks the tree once and never
+    touches text inside blocks that are skipped.
+    """
+
+    def __init__(self, source):
+        """Compile a template.
+
+        Args:
+            source (str): The template text.
+        """
+        self.source = source
+        self.variables = set()
+        self.conditionals = set()
+        self.nodes = self._compile(source)
+
+    def render(self, params):
+        """Render the template.
+
+        Args:
+            params (dict): The parameter values.
+
+        Returns:
+            str: The rendered text.
+        """
+        out = []
+        for node in self.nodes:
+            node.render(params, out)
+        return "".join(out)
+
+    def _compile(self, source):
+        root = []
+        stack = []
+        children = root
+        position = 0
+
+        for match in TAG_PATTERN.finditer(source):
+            if match.start() > position:
+                children.append(TextNode(source[position:match.start()]))
+            position = match.end()
+
+            open_kind, open_name, close_kind, placeholder = match.groups()
+            if placeholder:
+                children.append(PlaceholderNode(placeholder))
+                if placeholder != 'this':
+                    self.variables.add(placeholder)
+            elif open_kind:
+                block = BlockNode(open_kind, open_name, match.group(0))
+                children.append(block)
+                stack.append((block, children))
+                children = block.children
+                self.variables.add(open_name)
+                if open_kind == 'if':
+                    self.conditionals.add(open_name)
+            elif stack and stack[-1][0].kind == close_kind:
+                children = stack.pop()[1]
+            else:
+                # A closing tag without a matching block is plain text
+                children.append(TextNode(match.group(0)))
+
+        if position < len(source):
+            children.append(TextNode(source[position:]))
+
+        # Blocks that are never closed are kept as literal text
+        while stack:
+            block, parent = stack.pop()
+            index = parent.index(block)
+            parent[index:index + 1] = [TextNode(block.source)] + block.children
+
+        return root
+
+def compile_template(source):
+    """Compile template text into a Template.
+
+    Args:
+        source (str): The template text.
+
+    Returns:
+        Template: The compiled template.
+    """
+    return Template(source)
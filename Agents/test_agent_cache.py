@@ -0,0 +1,95 @@
+import gc
+from agent_cache import AgentCache, make_agent_key
+
+class FakeAgent:
+    def __init__(self):
+        self.tools_results = []
+
+def test_released_agents_are_reused():
+    cache = AgentCache(max_size=4)
+    key = make_agent_key('corporate', 'meeting_summarizer', {'llm': 'gpt-4'}, 'hash1')
+    same_key = make_agent_key('corporate', 'meeting_summarizer', {'llm': 'gpt-4'}, 'hash1')
+
+    first = cache.checkout(key, FakeAgent)
+    first.tools_results.append({'tool': 'serper'})
+    cache.release([first])
+    second = cache.checkout(same_key, FakeAgent)
+
+    assert first is second
+    assert second.tools_results == []
+    assert cache.stats()['hits'] == 1
+
+def test_changed_params_or_definition_create_new_agents():
+    cache = AgentCache(max_size=4)
+    base = cache.checkout(make_agent_key('corporate', 'competitor_watchdog', {}, 'hash1'), FakeAgent)
+    cache.release([base])
+    other_params = cache.checkout(make_agent_key('corporate', 'competitor_watchdog', {'llm': 'gpt-4'}, 'hash1'), FakeAgent)
+    other_definition = cache.checkout(make_agent_key('corporate', 'competitor_watchdog', {}, 'hash2'), FakeAgent)
+
+    assert len({id(base), id(other_params), id(other_definition)}) == 3
+
+def test_checked_out_agents_are_not_shared():
+    cache = AgentCache()
+    key = make_agent_key('corporate', 'a', {}, 'hash')
+    running = cache.checkout(key, FakeAgent)
+    running.tools_results.append({'tool': 'serper'})
+
+    # Another run gets its own agent instead of waiting, and the running one is untouched
+    other = cache.checkout(key, FakeAgent)
+    assert other is not running and running.tools_results == [{'tool': 'serper'}]
+    assert cache.stats()['checked_out'] == 2
+
+    cache.release([running, other])
+    assert cache.stats()['size'] == 2
+    assert {id(cache.checkout(key, FakeAgent)) for _ in range(2)} == {id(running), id(other)}
+    assert cache.stats()['misses'] == 2
+
+def test_least_recently_released_agents_are_evicted():
+    cache = AgentCache(max_size=2)
+    keys = [make_agent_key('marketing', agent_type, {}, 'hash') for agent_type in ('a', 'b', 'c')]
+    agents = [cache.checkout(key, FakeAgent) for key in keys]
+    cache.release([agents[1]])
+    cache.release([agents[0]])
+    cache.release([agents[2]])
+
+    assert cache.stats()['size'] == 2
+    assert cache.stats()['evictions'] == 1
+    assert cache.checkout(keys[0], FakeAgent) is agents[0]
+    assert cache.checkout(keys[1], FakeAgent) is not agents[1]
+
+def test_releasing_is_idempotent_and_ignores_unknown_agents():
+    cache = AgentCache()
+    agent = cache.checkout(make_agent_key('corporate', 'a', {}, 'hash'), FakeAgent)
+    cache.release([agent, FakeAgent()])
+    cache.release([agent])
+
+    assert cache.stats()['size'] == 1 and cache.stats()['checked_out'] == 0
+
+def test_agents_checked_out_before_a_clear_are_dropped():
+    cache = AgentCache()
+    key = make_agent_key('corporate', 'a', {}, 'hash')
+    idle = cache.checkout(key, FakeAgent)
+    cache.release([idle])
+    running = cache.checkout(key, FakeAgent)
+    cache.clear()
+
+    cache.release([running])
+    assert cache.stats()['size'] == 0
+    assert cache.checkout(key, FakeAgent) is not running
+
+def test_collected_agents_are_forgotten():
+    cache = AgentCache()
+    cache.checkout(make_agent_key('corporate', 'a', {}, 'hash'), FakeAgent)
+    gc.collect()
+
+    assert cache.stats()['checked_out'] == 0 and not cache._keys
+
+if __name__ == "__main__":
+    test_released_agents_are_reused()
+    test_changed_params_or_definition_create_new_agents()
+    test_checked_out_agents_are_not_shared()
+    test_least_recently_released_agents_are_evicted()
+    test_releasing_is_idempotent_and_ignores_unknown_agents()
+    test_agents_checked_out_before_a_clear_are_dropped()
+    test_collected_agents_are_forgotten()
+    print("✅ All agent cache tests passed!")
@@ -0,0 +1,49 @@
+import tempfile
+from api import CrewAPI
+from network_store import NetworkStore
+from test_network_patch import build_network
+
+def make_api(directory):
+    api = CrewAPI(store=NetworkStore(f"{directory}/networks.sqlite3"), spill_dir=f"{directory}/spill")
+    api.active_networks["net"] = build_network()
+    return api
+
+def test_edits_during_a_run_are_applied_when_it_ends():
+    with tempfile.TemporaryDirectory() as directory:
+        api = make_api(directory)
+        running = api.active_networks["net"]
+
+        with api._running("net"):
+            response = api.patch_network("net", [{"op": "update_task", "id": "task2", "params": {"feedback_data": "Terrible"}}])
+            assert response["status"] == "queued" and response["invalidated_tasks"] == ["task2"]
+            assert api.patch_network("net", [{"op": "remove_task", "id": "missing"}])["error"]
+
+            # The run keeps the network it started with, and stores its outputs there
+            assert running.task_nodes["task2"].params == {"feedback_data": "Great"}
+            running.task_results["task1"] = ("key1", "output1")
+
+        network = api.active_networks["net"]
+        assert network is not running
+        assert network.task_nodes["task2"].params == {"feedback_data": "Terrible"}
+        assert network.task_results["task1"] == ("key1", "output1")
+        assert api.patch_network("net", [{"op": "remove_connection", "from": "task1", "to": "task3"}])["status"] == "patched"
+
+def test_the_latest_update_during_a_run_wins():
+    with tempfile.TemporaryDirectory() as directory:
+        api = make_api(directory)
+        data = api.save_network("net")["config"]
+
+        with api._running("net"):
+            for feedback in ("Good", "Terrible"):
+                data["tasks"][1]["params"] = {"feedback_data": feedback}
+                assert api.update_network("net", data)["status"] == "queued"
+            # Saving keeps what the user sees, not the network being run
+            assert api.save_network("net")["config"]["tasks"][1]["params"] == {"feedback_data": "Terrible"}
+
+        assert api.active_networks["net"].task_nodes["task2"].params == {"feedback_data": "Terrible"}
+        assert api.update_network("net", data)["status"] == "updated"
+
+if __name__ == "__main__":
+    test_edits_during_a_run_are_applied_when_it_ends()
+    test_the_latest_update_during_a_run_wins()
+    print("✅ All API tests passed!")
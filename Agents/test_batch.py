@@ -0,0 +1,98 @@
+import threading
+import time
+from batch import BatchRun, build_item_network
+from main import from_frontend_data
+
+def build_template():
+    return from_frontend_data({
+        "agents": [
+            {"id": "agent1", "type": "customer_feedback_analyzer", "domain": "corporate"},
+            {"id": "agent2", "type": "smart_email_manager", "domain": "corporate"}
+        ],
+        "tasks": [
+            {"id": "task1", "type": "customer_feedback_analysis", "agent_id": "agent1", "params": {"feedback_data": "Default"}},
+            {"id": "task2", "type": "smart_email_management", "agent_id": "agent2", "params": {"email_content": "Reply"}}
+        ],
+        "connections": [{"from": "task1", "to": "task2"}]
+    })
+
+class FakeTask:
+    """Task double that records the agent running it and how many run at once."""
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, params, agent):
+        self.params = params
+        self.agent = agent
+
+    def execute_sync(self, agent=None, context=None):
+        with FakeTask.lock:
+            FakeTask.active += 1
+            FakeTask.peak = max(FakeTask.peak, FakeTask.active)
+        time.sleep(0.02)
+        with FakeTask.lock:
+            FakeTask.active -= 1
+        if self.params.get("feedback_data") == "boom":
+            raise RuntimeError("LLM error")
+
+        class Output:
+            raw = f"{self.params}|{context}"
+        return Output()
+
+def use_fake_tasks(network):
+    def instantiate_tasks():
+        for node in network.task_nodes.values():
+            node.task_instance = FakeTask(node.params, node.agent_node.agent_instance)
+    network.instantiate_tasks = instantiate_tasks
+    return network
+
+def test_item_network_merges_overrides_and_keeps_dependencies():
+    template = build_template()
+    agents = {"agent1": object(), "agent2": object()}
+    network = build_item_network(template, {"task1": {"feedback_data": "Great", "pdf_path": "a.pdf"}}, agents)
+
+    assert network.task_nodes["task1"].params == {"feedback_data": "Great", "pdf_path": "a.pdf"}
+    assert network.task_nodes["task2"].params == {"email_content": "Reply"}
+    assert [dep.id for dep in network.task_nodes["task2"].dependencies] == ["task1"]
+    assert network.agent_nodes["agent1"].agent_instance is agents["agent1"]
+    assert template.task_nodes["task1"].params == {"feedback_data": "Default"}
+
+def test_failed_items_are_isolated():
+    import batch
+    original = batch.build_item_network
+    batch.build_item_network = lambda *args: use_fake_tasks(original(*args))
+    try:
+        items = [{"task1": {"feedback_data": f"Review {i}"}} for i in range(6)]
+        items[2] = {"task1": {"feedback_data": "boom"}}
+        items[4] = {"missing": {}}
+        finished = []
+        FakeTask.peak = 0
+
+        result = BatchRun(build_template(), items, concurrency=3, on_item=finished.append).run()
+    finally:
+        batch.build_item_network = original
+
+    statuses = [item["status"] for item in result["items"]]
+    assert statuses == ["succeeded", "succeeded", "failed", "succeeded", "failed", "succeeded"]
+    assert "LLM error" in result["items"][2]["error"]
+    assert "missing" in result["items"][4]["error"]
+    assert "Review 3" in result["items"][3]["outputs"]["task2"]
+    assert sorted(item["index"] for item in finished) == list(range(6))
+
+    stats = result["stats"]
+    assert (stats["succeeded"], stats["failed"], stats["agent_sets"]) == (4, 2, 3)
+    assert FakeTask.peak == 3 and stats["items_per_second"] > 0
+
+def test_cancelled_batch_skips_remaining_items():
+    cancel_event = threading.Event()
+    cancel_event.set()
+    result = BatchRun(build_template(), [{}, {}], cancel_event=cancel_event).run()
+    assert [item["status"] for item in result["items"]] == ["cancelled", "cancelled"]
+
+if __name__ == "__main__":
+    test_item_network_merges_overrides_and_keeps_dependencies()
+    test_failed_items_are_isolated()
+    test_cancelled_batch_skips_remaining_items()
+    print("✅ All batch tests passed!")
@@ -0,0 +1,74 @@
+import os
+import tempfile
+from catalog import Catalog, build_catalog
+from definition_registry import DefinitionRegistry
+
+def write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as file:
+        file.write(content)
+
+def make_definitions(root):
+    write(os.path.join(root, 'agents', 'marketing_agents', 'seo_optimizer_agent.md'),
+          "## Role\nSEO Specialist\n\n## Goal\nRank\n\n## Backstory\nAn expert\n\n## Task\nseo_optimization")
+    write(os.path.join(root, 'tasks', 'marketing_tasks', 'seo_optimization.md'),
+          "## Description\nOptimize {website_url} for {keywords}.\n{#if pdf_path}Read {pdf_path}.{/if}\n\n## Expected Output\nA plan")
+    return DefinitionRegistry(agent_root=os.path.join(root, 'agents'), task_root=os.path.join(root, 'tasks'))
+
+def test_catalog_is_derived_from_the_definition_files():
+    with tempfile.TemporaryDirectory() as root:
+        data = Catalog(make_definitions(root), check_interval=0).get()
+
+        assert data["agent_types"] == {"marketing": ["seo_optimizer"]}
+        assert data["task_types"] == {"marketing": ["seo_optimization"]}
+        assert data["task_params"]["marketing"]["seo_optimization"] == ["website_url", "keywords", "pdf_path"]
+        assert data["agents"] == [{
+            "id": "seo_optimizer", "name": "Seo Optimizer", "description": "SEO Specialist", "type": "marketing",
+            "task_type": "seo_optimization", "parameters": {"website_url": "", "keywords": "", "pdf_path": ""}
+        }]
+
+def test_responses_are_cached_until_a_definition_changes():
+    with tempfile.TemporaryDirectory() as root:
+        catalog = Catalog(make_definitions(root), check_interval=0)
+        key = ("task_params", "marketing", "seo_optimization")
+        select = lambda: catalog.get()["task_params"]["marketing"]["seo_optimization"]
+
+        body, etag = catalog.render(key, select)
+        assert catalog.render(key, lambda: None) == (body, etag)
+        assert catalog.builds == 1
+
+        write(os.path.join(root, 'tasks', 'marketing_tasks', 'email_campaign.md'),
+              "## Description\nEmail {audience_segment}\n\n## Expected Output\nA campaign")
+        assert catalog.get()["task_types"]["marketing"] == ["email_campaign", "seo_optimization"]
+        assert catalog.builds == 2
+        assert catalog.render(key, select) == (body, etag)
+        assert catalog.render(("task_types",), lambda: catalog.get()["task_types"])[1] != etag
+
+def test_agent_task_types_are_declared_in_the_definitions():
+    with tempfile.TemporaryDirectory() as root:
+        definitions = make_definitions(root)
+        write(os.path.join(root, 'agents', 'marketing_agents', 'trend_scout_agent.md'),
+              "## Role\nScout\n\n## Goal\nFind trends\n\n## Backstory\nCurious")
+        agents = {agent["id"]: agent for agent in build_catalog(definitions)["agents"]}
+        assert definitions.get_agent_definition('marketing_agents', 'seo_optimizer').backstory == "An expert"
+        assert agents["trend_scout"]["task_type"] is None and agents["trend_scout"]["parameters"] == {}
+
+        write(os.path.join(root, 'agents', 'marketing_agents', 'trend_scout_agent.md'),
+              "## Role\nScout\n\n## Task\ntrend_report")
+        try:
+            build_catalog(definitions)
+        except ValueError as e:
+            assert "trend_report" in str(e)
+        else:
+            raise AssertionError("an undefined task type should be rejected")
+
+def test_every_shipped_agent_declares_an_existing_task():
+    agents = build_catalog(DefinitionRegistry())["agents"]
+    assert agents and all(agent["task_type"] for agent in agents)
+
+if __name__ == "__main__":
+    test_catalog_is_derived_from_the_definition_files()
+    test_responses_are_cached_until_a_definition_changes()
+    test_agent_task_types_are_declared_in_the_definitions()
+    test_every_shipped_agent_declares_an_existing_task()
+    print("✅ All catalog tests passed!")
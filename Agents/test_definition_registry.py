@@ -0,0 +1,60 @@
+import os
+import tempfile
+from definition_registry import DefinitionRegistry
+
+def write_task(root, content):
+    folder = os.path.join(root, 'corporate_tasks')
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, 'meeting_summarization.md')
+    with open(path, 'w') as file:
+        file.write(content)
+    return path
+
+def test_definition_is_parsed_once():
+    with tempfile.TemporaryDirectory() as root:
+        write_task(root, "## Description\nSummarize {meeting_text}\n\n## Expected Output\nA summary")
+        registry = DefinitionRegistry(agent_root=root, task_root=root)
+
+        first = registry.get_task_definition('corporate', 'meeting_summarization')
+        second = registry.get_task_definition('corporate', 'meeting_summarization')
+
+        assert first is second
+        assert first.description == "Summarize {meeting_text}"
+        assert first.expected_output == "A summary"
+        assert (registry.hits, registry.misses) == (1, 1)
+
+def test_definition_is_reloaded_when_file_changes():
+    with tempfile.TemporaryDirectory() as root:
+        path = write_task(root, "## Description\nOld\n\n## Expected Output\nA summary")
+        registry = DefinitionRegistry(agent_root=root, task_root=root)
+        old = registry.get_task_definition('corporate', 'meeting_summarization')
+
+        write_task(root, "## Description\nNew\n\n## Expected Output\nA summary")
+        os.utime(path, ns=(old.mtime + 10**9, old.mtime + 10**9))
+        new = registry.get_task_definition('corporate', 'meeting_summarization')
+
+        assert new.description == "New"
+        assert new.content_hash != old.content_hash
+
+def test_missing_definition_raises():
+    with tempfile.TemporaryDirectory() as root:
+        registry = DefinitionRegistry(agent_root=root, task_root=root)
+        try:
+            registry.get_agent_definition('corporate_agents', 'missing')
+        except FileNotFoundError as e:
+            assert "Agent definition file not found" in str(e)
+        else:
+            raise AssertionError("a missing definition should raise FileNotFoundError")
+
+def test_preload_parses_shipped_definitions():
+    registry = DefinitionRegistry()
+    assert registry.preload() == registry.misses
+    assert registry.get_agent_definition('corporate_agents', 'meeting_summarizer').role
+    assert registry.hits == 1
+
+if __name__ == "__main__":
+    test_definition_is_parsed_once()
+    test_definition_is_reloaded_when_file_changes()
+    test_missing_definition_raises()
+    test_preload_parses_shipped_definitions()
+    print("✅ All definition registry tests passed!")
@@ -0,0 +1,151 @@
+import time
+from executor import DAGExecutor
+
+class FakeOutput:
+    def __init__(self, raw):
+        self.raw = raw
+
+class FakeTask:
+    """Stands in for a crewai Task: sleeps, then echoes the context it was given."""
+
+    def __init__(self, task_id, delay, log):
+        self.task_id = task_id
+        self.delay = delay
+        self.log = log
+
+    def execute_sync(self, agent=None, context=None):
+        self.log.append(("start", self.task_id, time.perf_counter()))
+        time.sleep(self.delay)
+        self.log.append(("end", self.task_id, time.perf_counter()))
+        return FakeOutput(f"{self.task_id}<{context or ''}>")
+
+class FakeAgentNode:
+    def __init__(self, id):
+        self.id = id
+        self.agent_type = "fake"
+        self.agent_instance = object()
+
+class FakeTaskNode:
+    def __init__(self, id, agent_node, task_instance):
+        self.id = id
+        self.task_type = "fake"
+        self.agent_node = agent_node
+        self.task_instance = task_instance
+        self.dependencies = []
+
+class FakeNetwork:
+    def __init__(self):
+        self.agent_nodes = {}
+        self.task_nodes = {}
+
+def build_diamond(delay=0.2):
+    """Two independent branches feeding one final task, each with its own agent."""
+    log = []
+    network = FakeNetwork()
+    for task_id in ["watchdog", "feedback", "email"]:
+        agent_node = FakeAgentNode(f"agent_{task_id}")
+        network.agent_nodes[agent_node.id] = agent_node
+        network.task_nodes[task_id] = FakeTaskNode(task_id, agent_node, FakeTask(task_id, delay, log))
+    network.task_nodes["email"].dependencies = [network.task_nodes["watchdog"], network.task_nodes["feedback"]]
+    return network, log
+
+def test_independent_branches_run_concurrently():
+    """The two branches should overlap, so the run takes critical-path time."""
+    network, log = build_diamond(delay=0.2)
+
+    start = time.perf_counter()
+    outputs = DAGExecutor(network, max_workers=4).run()
+    elapsed = time.perf_counter() - start
+
+    assert set(outputs) == {"watchdog", "feedback", "email"}
+    assert elapsed < 0.55, f"expected ~0.4s critical path, took {elapsed:.2f}s"
+
+def test_downstream_task_receives_upstream_outputs():
+    network, _ = build_diamond(delay=0)
+    outputs = DAGExecutor(network).run()
+
+    assert "watchdog<>" in outputs["email"]
+    assert "feedback<>" in outputs["email"]
+    assert list(outputs)[-1] == "email"
+
+def test_shared_agent_never_runs_two_tasks_at_once():
+    network, log = build_diamond(delay=0.1)
+    shared = FakeAgentNode("shared")
+    network.agent_nodes = {"shared": shared}
+    for node in network.task_nodes.values():
+        node.agent_node = shared
+
+    DAGExecutor(network, max_workers=4).run()
+
+    active = 0
+    for event, _, _ in sorted(log, key=lambda entry: entry[2]):
+        active += 1 if event == "start" else -1
+        assert active <= 1
+
+def test_events_are_emitted_for_each_task():
+    network, _ = build_diamond(delay=0)
+    events = []
+    DAGExecutor(network, on_event=events.append).run()
+
+    started = [e["task_id"] for e in events if e["event"] == "task_started"]
+    completed = {e["task_id"]: e for e in events if e["event"] == "task_completed"}
+    assert sorted(started) == ["email", "feedback", "watchdog"]
+    assert completed["email"]["agent_id"] == "agent_email"
+    assert completed["email"]["output"].startswith("email<")
+    assert completed["email"]["duration"] >= 0
+
+def set_real_types(network):
+    """Give the fake nodes real task and agent types so their definitions can be hashed."""
+    types = {
+        "watchdog": ("competitor_watchdog", "competitor_watchdog"),
+        "feedback": ("customer_feedback_analysis", "customer_feedback_analyzer"),
+        "email": ("smart_email_management", "smart_email_manager"),
+    }
+    for task_id, (task_type, agent_type) in types.items():
+        node = network.task_nodes[task_id]
+        node.task_type, node.domain, node.params = task_type, "corporate", {}
+        node.agent_node.agent_type, node.agent_node.domain, node.agent_node.params = agent_type, "corporate", {}
+
+def test_rerun_only_executes_changed_tasks_and_their_dependents():
+    network, log = build_diamond(delay=0)
+    set_real_types(network)
+    results = {}
+    DAGExecutor(network, results=results).run()
+    assert len([e for e in log if e[0] == "start"]) == 3
+
+    # Unchanged network: everything is reused
+    log.clear()
+    executor = DAGExecutor(network, results=results)
+    executor.run()
+    assert log == []
+    assert sorted(executor.reused) == ["email", "feedback", "watchdog"]
+
+    # Editing one task re-runs it and, as its output changed, its dependent
+    log.clear()
+    network.task_nodes["feedback"].params = {"feedback_data": "new reviews"}
+    network.task_nodes["feedback"].task_instance = FakeTask("feedback_v2", 0, log)
+    executor = DAGExecutor(network, results=results)
+    outputs = executor.run()
+    assert sorted(task_id for event, task_id, _ in log if event == "start") == ["email", "feedback_v2"]
+    assert executor.reused == ["watchdog"]
+    assert "feedback_v2<>" in outputs["email"]
+
+def test_cycle_is_rejected():
+    network, _ = build_diamond(delay=0)
+    network.task_nodes["watchdog"].dependencies = [network.task_nodes["email"]]
+
+    try:
+        DAGExecutor(network).run()
+    except ValueError as e:
+        assert "watchdog" in str(e) and "email" in str(e)
+    else:
+        raise AssertionError("a cyclic network should not run")
+
+if __name__ == "__main__":
+    test_independent_branches_run_concurrently()
+    test_downstream_task_receives_upstream_outputs()
+    test_shared_agent_never_runs_two_tasks_at_once()
+    test_events_are_emitted_for_each_task()
+    test_rerun_only_executes_changed_tasks_and_their_dependents()
+    test_cycle_is_rejected()
+    print("✅ All executor tests passed!")
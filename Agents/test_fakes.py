@@ -0,0 +1,41 @@
+from fakes import FakeResourcePool, fake_text, use_resource_pool
+from main import get_domain_factories
+from benchmark_suite import generate_config
+
+def test_fake_llm_answers_are_deterministic():
+    fake_pool = FakeResourcePool(output_tokens=12)
+    llm = fake_pool.get_llm()
+    assert llm is fake_pool.get_llm()
+
+    answer = llm.call("Summarize the meeting")
+    assert answer == llm.call("Summarize the meeting")
+    assert answer.startswith("Thought: I now know the final answer\nFinal Answer: ")
+    assert len(answer.split("Final Answer: ")[1].split()) == 12
+    assert fake_text("a", 5) != fake_text("b", 5)
+    assert fake_pool.llm_calls() == 2
+
+def test_fake_tools_return_canned_results():
+    fake_pool = FakeResourcePool()
+    assert "Snippet:" in fake_pool.get_tool("serper")._run("Acme Corp")
+    assert fake_pool.get_tool("scrape")._run("https://example.com") == fake_text("https://example.com", 200)
+
+def test_use_resource_pool_restores_the_factories():
+    factories = get_domain_factories()["corporate"]["agents"]
+    original = factories.pool
+    fake_pool = FakeResourcePool()
+    with use_resource_pool(fake_pool):
+        assert factories.pool is fake_pool
+    assert factories.pool is original
+
+def test_synthetic_networks_are_seeded():
+    config = generate_config(120, width=50)
+    assert config == generate_config(120, width=50)
+    assert len(config["tasks"]) == len(config["agents"]) == 120
+    assert all(int(c["from"].split("_")[1]) < int(c["to"].split("_")[1]) for c in config["connections"])
+
+if __name__ == "__main__":
+    test_fake_llm_answers_are_deterministic()
+    test_fake_tools_return_canned_results()
+    test_use_resource_pool_restores_the_factories()
+    test_synthetic_networks_are_seeded()
+    print("✅ All fakes tests passed!")
@@ -0,0 +1,61 @@
+from graph_utils import CycleError, topological_order, execution_levels
+
+class FakeTaskNode:
+    def __init__(self, id):
+        self.id = id
+        self.dependencies = []
+
+def build_network(edges, task_ids):
+    """Build task nodes from (from, to) connections, as sent by the frontend."""
+    task_nodes = {task_id: FakeTaskNode(task_id) for task_id in task_ids}
+    for from_id, to_id in edges:
+        task_nodes[to_id].dependencies.append(task_nodes[from_id])
+    return task_nodes
+
+def test_topological_order_respects_dependencies():
+    task_nodes = build_network(
+        [("watchdog", "email"), ("feedback", "email"), ("summary", "watchdog")],
+        ["email", "watchdog", "feedback", "summary"]
+    )
+    ordering = topological_order(task_nodes)
+
+    assert sorted(ordering) == sorted(task_nodes)
+    position = {task_id: i for i, task_id in enumerate(ordering)}
+    for task_id, node in task_nodes.items():
+        for dep in node.dependencies:
+            assert position[dep.id] < position[task_id]
+
+def test_execution_levels_group_independent_tasks():
+    task_nodes = build_network(
+        [("watchdog", "email"), ("feedback", "email")],
+        ["watchdog", "feedback", "email"]
+    )
+    assert execution_levels(task_nodes) == [["watchdog", "feedback"], ["email"]]
+
+def test_long_chain_does_not_hit_recursion_limit():
+    task_ids = [f"task{i}" for i in range(20000)]
+    task_nodes = build_network(zip(task_ids, task_ids[1:]), task_ids)
+
+    assert topological_order(task_nodes) == task_ids
+    assert len(execution_levels(task_nodes)) == len(task_ids)
+
+def test_cycle_error_names_the_cycle():
+    task_nodes = build_network(
+        [("a", "b"), ("b", "c"), ("c", "a"), ("c", "d")],
+        ["root", "a", "b", "c", "d"]
+    )
+    try:
+        topological_order(task_nodes)
+    except CycleError as e:
+        assert set(e.cycle) == {"a", "b", "c"}
+        assert e.cycle[0] == e.cycle[-1]
+        assert "a -> " in str(e) or "b -> " in str(e) or "c -> " in str(e)
+    else:
+        raise AssertionError("a cyclic network should be rejected")
+
+if __name__ == "__main__":
+    test_topological_order_respects_dependencies()
+    test_execution_levels_group_independent_tasks()
+    test_long_chain_does_not_hit_recursion_limit()
+    test_cycle_error_names_the_cycle()
+    print("✅ All graph tests passed!")
@@ -0,0 +1,73 @@
+import threading
+import time
+from jobs import JobManager
+
+def wait_for(job, statuses=("succeeded", "failed", "cancelled"), timeout=2.0):
+    deadline = time.time() + timeout
+    while job.status not in statuses and time.time() < deadline:
+        time.sleep(0.01)
+    return job.status
+
+def test_submit_returns_immediately_and_stores_result():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+
+    def run(network_id, cancel_event=None):
+        release.wait(1.0)
+        return {"network_id": network_id, "result": {"output": "done"}}
+
+    job = manager.submit("network_1", run, "network_1")
+    assert job.status in ("queued", "running")
+
+    release.set()
+    assert wait_for(job) == "succeeded"
+    assert manager.get(job.id).to_dict(include_result=True)["result"] == {"output": "done"}
+
+def test_error_response_marks_job_failed():
+    manager = JobManager(max_workers=1)
+    job = manager.submit("network_1", lambda cancel_event=None: {"error": "Network network_1 not found"})
+
+    assert wait_for(job) == "failed"
+    assert job.to_dict()["error"] == "Network network_1 not found"
+
+def test_queued_job_can_be_cancelled():
+    manager = JobManager(max_workers=1)
+    release = threading.Event()
+    blocker = manager.submit("network_1", lambda cancel_event=None: release.wait(1.0) and {})
+    queued = manager.submit("network_2", lambda cancel_event=None: {"result": "should not run"})
+
+    assert manager.cancel(queued.id).status == "cancelled"
+    release.set()
+    wait_for(blocker)
+    assert queued.result is None
+
+def test_running_job_sees_cancel_event():
+    manager = JobManager(max_workers=1)
+    started = threading.Event()
+
+    def run(cancel_event=None):
+        started.set()
+        cancel_event.wait(1.0)
+        return {"result": "partial"}
+
+    job = manager.submit("network_1", run)
+    started.wait(1.0)
+    manager.cancel(job.id)
+    assert wait_for(job) == "cancelled"
+
+def test_finished_jobs_are_bounded():
+    manager = JobManager(max_workers=2, max_finished=3)
+    jobs = [manager.submit("network_1", lambda cancel_event=None: {}) for _ in range(6)]
+    for job in jobs:
+        wait_for(job)
+
+    assert len(manager.list()) <= 3
+    assert manager.get(jobs[-1].id) is not None
+
+if __name__ == "__main__":
+    test_submit_returns_immediately_and_stores_result()
+    test_error_response_marks_job_failed()
+    test_queued_job_can_be_cancelled()
+    test_running_job_sees_cancel_event()
+    test_finished_jobs_are_bounded()
+    print("✅ All job tests passed!")
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import time
+from llm_cache import ResponseCache, make_cache_key
+
+def test_key_depends_on_model_and_messages():
+    messages = [{"role": "system", "content": "You are a Meeting Summarizer"}, {"role": "user", "content": "Summarize"}]
+    key = make_cache_key("gemini/gemini-2.0-flash", messages)
+
+    assert key == make_cache_key("gemini/gemini-2.0-flash", [dict(m) for m in messages])
+    assert key != make_cache_key("gpt-4", messages)
+    assert key != make_cache_key("gemini/gemini-2.0-flash", messages[:1])
+
+def test_hits_and_misses_are_counted():
+    cache = ResponseCache(path=":memory:")
+    assert cache.get("key") is None
+    cache.set("key", "gemini/gemini-2.0-flash", "summary")
+
+    assert cache.get("key") == "summary"
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+def test_expired_entries_are_not_served():
+    cache = ResponseCache(path=":memory:", ttl=0.05)
+    cache.set("key", "model", "summary")
+    time.sleep(0.1)
+
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResponseCache(path=":memory:", max_bytes=20)
+    cache.set("a", "model", "x" * 8)
+    time.sleep(0.01)
+    cache.set("b", "model", "y" * 8)
+    time.sleep(0.01)
+    cache.get("a")
+    cache.set("c", "model", "z" * 8)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "x" * 8
+    assert cache.stats()["evictions"] == 1
+
+def test_responses_persist_on_disk():
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "cache.sqlite3")
+        ResponseCache(path=path).set("key", "model", "summary")
+        assert ResponseCache(path=path).get("key") == "summary"
+
+if __name__ == "__main__":
+    test_key_depends_on_model_and_messages()
+    test_hits_and_misses_are_counted()
+    test_expired_entries_are_not_served()
+    test_least_recently_used_entries_are_evicted()
+    test_responses_persist_on_disk()
+    print("✅ All LLM cache tests passed!")
@@ -0,0 +1,107 @@
+import threading
+from llm_metrics import get_metered_llm_class, read_usage
+from metrics import agent_context, llm_calls, llm_tokens
+from rate_limiter import RateLimiter, get_rate_limited_llm_class
+
+class RateLimitError(Exception):
+    pass
+
+class ProviderLLM:
+    """Stands in for a provider's client: tracks the usage of each response like crewai's clients do."""
+
+    def __init__(self, model, usage=None, errors=0):
+        self.model = model
+        self.usage = usage
+        self.errors = errors
+        self.tracked = []
+
+    def call(self, messages, tools=None, **kwargs):
+        if self.errors:
+            self.errors -= 1
+            raise RateLimitError("429 rate limit")
+        usage = self.usage(messages) if callable(self.usage) else self.usage
+        if usage is not None:
+            self._track_token_usage_internal(usage)
+        return "x" * 40
+
+    def _track_token_usage_internal(self, usage):
+        self.tracked.append(usage)
+
+def rendered(metric):
+    return "\n".join(metric.render())
+
+def test_reported_usage_is_recorded():
+    llm = get_metered_llm_class()(ProviderLLM("reported-model", usage={"prompt_tokens": 120, "completion_tokens": 7}))
+    with agent_context("meeting_summarizer"):
+        assert llm.call("hello") == "x" * 40
+
+    tokens = rendered(llm_tokens)
+    labels = 'model="reported-model",agent_type="meeting_summarizer"'
+    assert f'llm_tokens_total{{{labels},kind="prompt",source="reported"}} 120' in tokens
+    assert f'llm_tokens_total{{{labels},kind="completion",source="reported"}} 7' in tokens
+    assert f'{labels},kind="prompt",source="estimated"' not in tokens
+    assert f'llm_calls_total{{{labels},status="succeeded"}} 1' in rendered(llm_calls)
+
+def test_unreported_usage_is_estimated():
+    llm = get_metered_llm_class()(ProviderLLM("silent-model"))
+    llm.call("a" * 400)
+
+    tokens = rendered(llm_tokens)
+    assert 'llm_tokens_total{model="silent-model",agent_type="none",kind="prompt",source="estimated"} 100' in tokens
+    assert 'llm_tokens_total{model="silent-model",agent_type="none",kind="completion",source="estimated"} 10' in tokens
+
+def test_rate_limited_attempts_are_recorded_per_attempt():
+    limiter = RateLimiter(requests_per_minute=6000, backoff_base=0.001, backoff_max=0.001)
+    llm_class = get_rate_limited_llm_class(get_metered_llm_class())
+    llm = llm_class(ProviderLLM("retried-model", usage={"prompt_tokens": 3, "completion_tokens": 2}, errors=2), rate_limiter=limiter)
+    llm.call("hello")
+
+    calls = rendered(llm_calls)
+    assert 'llm_calls_total{model="retried-model",agent_type="none",status="rate_limited"} 2' in calls
+    assert 'llm_calls_total{model="retried-model",agent_type="none",status="succeeded"} 1' in calls
+
+def test_concurrent_calls_record_their_own_usage():
+    barrier = threading.Barrier(2)
+
+    def usage(messages):
+        # Both calls report while the other is in flight
+        barrier.wait(timeout=5)
+        return {"prompt_tokens": len(messages), "completion_tokens": 1}
+
+    provider = ProviderLLM("shared-model", usage=usage)
+    llm = get_metered_llm_class()(provider)
+
+    def call(agent_type, prompt):
+        with agent_context(agent_type):
+            llm.call(prompt)
+
+    threads = [threading.Thread(target=call, args=("writer", "a" * 30)), threading.Thread(target=call, args=("critic", "b" * 70))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    tokens = rendered(llm_tokens)
+    assert 'llm_tokens_total{model="shared-model",agent_type="writer",kind="prompt",source="reported"} 30' in tokens
+    assert 'llm_tokens_total{model="shared-model",agent_type="critic",kind="prompt",source="reported"} 70' in tokens
+    # The provider's own tracking still sees every response
+    assert len(provider.tracked) == 2
+
+def test_usage_is_read_from_objects_and_dicts():
+    class Usage:
+        prompt_tokens = 5
+        completion_tokens = None
+
+    assert read_usage(Usage()) == (5, 0)
+    assert read_usage({"prompt_tokens": 1, "completion_tokens": 2}) == (1, 2)
+    assert read_usage({"prompt_token_count": 3, "candidates_token_count": 4, "total_tokens": 7}) == (3, 4)
+    assert read_usage({"input_tokens": 8, "output_tokens": 9}) == (8, 9)
+    assert read_usage({"total_tokens": 0}) is None
+
+if __name__ == "__main__":
+    test_reported_usage_is_recorded()
+    test_unreported_usage_is_estimated()
+    test_rate_limited_attempts_are_recorded_per_attempt()
+    test_concurrent_calls_record_their_own_usage()
+    test_usage_is_read_from_objects_and_dicts()
+    print("✅ All LLM metrics tests passed!")
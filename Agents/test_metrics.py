@@ -0,0 +1,60 @@
+from metrics import MetricsRegistry, agent_context, instrument_tool, tool_calls
+
+def test_counters_and_gauges_render_one_series_per_label_set():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ("model",))
+    depth = registry.gauge("queue_depth", "Depth.")
+    calls.inc(model="gemini")
+    calls.inc(2, model="gemini")
+    calls.inc(model='say "hi"')
+    depth.set(3)
+
+    output = registry.render()
+    assert "# TYPE calls_total counter" in output
+    assert 'calls_total{model="gemini"} 3' in output
+    assert 'calls_total{model="say \\"hi\\""} 1' in output
+    assert "queue_depth 3" in output
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 0.7, 5):
+        latency.observe(value, route="/run")
+
+    output = registry.render()
+    assert 'latency_seconds_bucket{route="/run",le="0.1"} 1' in output
+    assert 'latency_seconds_bucket{route="/run",le="1.0"} 3' in output
+    assert 'latency_seconds_bucket{route="/run",le="+Inf"} 4' in output
+    assert 'latency_seconds_count{route="/run"} 4' in output
+    assert 'latency_seconds_sum{route="/run"} 6.25' in output
+
+def test_collectors_run_before_rendering_and_labels_are_checked():
+    registry = MetricsRegistry()
+    active = registry.gauge("active", "Active.")
+    registry.on_collect(lambda: active.set(7))
+    assert "active 7" in registry.render()
+
+    try:
+        active.set(1, unexpected="label")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("unknown labels should be rejected")
+
+def test_tool_calls_are_attributed_to_the_running_agent():
+    class SearchTool:
+        def _run(self, query):
+            return f"results for {query}"
+
+    tool = instrument_tool(SearchTool(), "fake_search")
+    with agent_context("competitor_watchdog"):
+        assert tool._run("Acme") == "results for Acme"
+
+    assert 'tool_calls_total{tool="fake_search",agent_type="competitor_watchdog",status="succeeded"} 1' in "\n".join(tool_calls.render())
+
+if __name__ == "__main__":
+    test_counters_and_gauges_render_one_series_per_label_set()
+    test_histogram_buckets_are_cumulative()
+    test_collectors_run_before_rendering_and_labels_are_checked()
+    test_tool_calls_are_attributed_to_the_running_agent()
+    print("✅ All metrics tests passed!")
@@ -0,0 +1,113 @@
+from main import from_frontend_data
+from network_patch import apply_operations
+
+def build_network():
+    return from_frontend_data({
+        "agents": [
+            {"id": "agent1", "type": "competitor_watchdog", "domain": "corporate"},
+            {"id": "agent2", "type": "customer_feedback_analyzer", "domain": "corporate"},
+            {"id": "agent3", "type": "smart_email_manager", "domain": "corporate"}
+        ],
+        "tasks": [
+            {"id": "task1", "type": "competitor_watchdog", "agent_id": "agent1", "params": {"competitors": "Acme"}},
+            {"id": "task2", "type": "customer_feedback_analysis", "agent_id": "agent2", "params": {"feedback_data": "Great"}},
+            {"id": "task3", "type": "smart_email_management", "agent_id": "agent3", "params": {"email_content": "Draft"}}
+        ],
+        "connections": [
+            {"from": "task1", "to": "task3"},
+            {"from": "task2", "to": "task3"}
+        ]
+    })
+
+def mark_instantiated(network):
+    for node in network.agent_nodes.values():
+        node.agent_instance = object()
+    for node in network.task_nodes.values():
+        node.task_instance = object()
+
+def test_param_edit_only_invalidates_that_task():
+    network = build_network()
+    mark_instantiated(network)
+
+    summary = apply_operations(network, [
+        {"op": "update_task", "id": "task2", "params": {"feedback_data": "Terrible", "pdf_path": "reviews.pdf"}}
+    ])
+
+    assert summary["invalidated_tasks"] == ["task2"]
+    assert network.task_nodes["task2"].params == {"feedback_data": "Terrible", "pdf_path": "reviews.pdf"}
+    assert network.task_nodes["task2"].task_instance is None
+    assert network.task_nodes["task1"].task_instance is not None
+    assert all(node.agent_instance is not None for node in network.agent_nodes.values())
+
+def test_null_param_removes_it():
+    network = build_network()
+    apply_operations(network, [{"op": "update_task", "id": "task1", "params": {"competitors": None}}])
+    assert network.task_nodes["task1"].params == {}
+
+def test_agent_edit_invalidates_its_tasks():
+    network = build_network()
+    mark_instantiated(network)
+
+    summary = apply_operations(network, [{"op": "update_agent", "id": "agent3", "params": {"llm": "gpt-4"}}])
+
+    assert summary["invalidated_agents"] == ["agent3"]
+    assert summary["invalidated_tasks"] == ["task3"]
+    assert network.agent_nodes["agent3"].params == {"llm": "gpt-4"}
+
+def test_add_and_remove_nodes_and_connections():
+    network = build_network()
+    apply_operations(network, [
+        {"op": "add_agent", "agent": {"id": "agent4", "type": "meeting_summarizer", "domain": "corporate"}},
+        {"op": "add_task", "task": {"id": "task4", "type": "meeting_summarization", "agent_id": "agent4"}},
+        {"op": "add_connection", "from": "task4", "to": "task1"},
+        {"op": "remove_connection", "from": "task2", "to": "task3"},
+        {"op": "remove_task", "id": "task2"},
+        {"op": "remove_agent", "id": "agent2"}
+    ])
+
+    assert sorted(network.task_nodes) == ["task1", "task3", "task4"]
+    assert sorted(network.agent_nodes) == ["agent1", "agent3", "agent4"]
+    assert [dep.id for dep in network.task_nodes["task1"].dependencies] == ["task4"]
+    assert [dep.id for dep in network.task_nodes["task3"].dependencies] == ["task1"]
+
+def test_failed_patch_leaves_network_unchanged():
+    network = build_network()
+    before = build_network()
+
+    try:
+        apply_operations(network, [
+            {"op": "update_task", "id": "task1", "params": {"competitors": "Globex"}},
+            {"op": "remove_task", "id": "task2"},
+            {"op": "add_connection", "from": "task3", "to": "task1"}
+        ])
+    except ValueError as e:
+        assert "Operation 2" in str(e) and "cycle" in str(e)
+    else:
+        raise AssertionError("a connection creating a cycle should be rejected")
+
+    assert sorted(network.task_nodes) == sorted(before.task_nodes)
+    assert network.task_nodes["task1"].params == {"competitors": "Acme"}
+    assert [dep.id for dep in network.task_nodes["task3"].dependencies] == ["task1", "task2"]
+
+def test_malformed_operations_are_rejected_and_rolled_back():
+    for malformed in ("bogus", {"op": "update_task", "id": "task1", "params": ["competitors"]},
+                      {"op": "add_agent", "agent": "agent4"}):
+        network = build_network()
+        try:
+            apply_operations(network, [{"op": "remove_task", "id": "task3"}, {"op": "remove_agent", "id": "agent3"}, malformed])
+        except ValueError as e:
+            assert "Operation 2" in str(e)
+        else:
+            raise AssertionError(f"{malformed!r} should be rejected")
+
+        assert "agent3" in network.agent_nodes and "task3" in network.task_nodes
+        assert network.task_nodes["task1"].params == {"competitors": "Acme"}
+
+if __name__ == "__main__":
+    test_param_edit_only_invalidates_that_task()
+    test_null_param_removes_it()
+    test_agent_edit_invalidates_its_tasks()
+    test_add_and_remove_nodes_and_connections()
+    test_failed_patch_leaves_network_unchanged()
+    test_malformed_operations_are_rejected_and_rolled_back()
+    print("✅ All network patch tests passed!")
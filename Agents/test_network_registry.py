@@ -0,0 +1,70 @@
+import os
+import tempfile
+import time
+from main import from_frontend_data
+from network_registry import NetworkRegistry
+
+def build_network(competitors="Acme"):
+    return from_frontend_data({
+        "agents": [{"id": "agent1", "type": "competitor_watchdog", "domain": "corporate"}],
+        "tasks": [{"id": "task1", "type": "competitor_watchdog", "agent_id": "agent1", "params": {"competitors": competitors}}]
+    })
+
+def test_least_recently_used_network_is_spilled_and_rehydrated():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        registry = NetworkRegistry(spill_dir=spill_dir, max_entries=2)
+        registry["a"] = build_network("A")
+        registry["b"] = build_network("B")
+        registry["a"]
+        registry["c"] = build_network("C")
+
+        stats = registry.stats()
+        assert (stats["in_memory"], stats["spilled"]) == (2, 1)
+        assert len(registry) == 3 and "b" in registry
+        assert os.listdir(spill_dir) == ["b.json"]
+
+        network = registry["b"]
+        assert network.task_nodes["task1"].params == {"competitors": "B"}
+        assert registry.stats()["rehydrations"] == 1
+
+def test_task_results_survive_a_spill():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        registry = NetworkRegistry(spill_dir=spill_dir, max_entries=1)
+        network = build_network()
+        network.task_results["task1"] = ("key", "output")
+        registry["a"] = network
+        registry["b"] = build_network()
+
+        assert registry["a"].task_results == {"task1": ("key", "output")}
+
+def test_idle_and_oversized_networks_are_evicted_unless_pinned():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        pinned = {"running"}
+        registry = NetworkRegistry(spill_dir=spill_dir, ttl=0.05, is_pinned=lambda network_id: network_id in pinned)
+        registry["idle"] = build_network()
+        registry["running"] = build_network()
+        time.sleep(0.1)
+        registry["new"] = build_network()
+
+        in_memory = {entry["network_id"] for entry in registry.stats()["networks"] if entry["in_memory"]}
+        assert in_memory == {"running", "new"}
+
+        registry.max_bytes = 1
+        registry.refresh("new")
+        assert registry.stats()["in_memory"] == 2
+
+def test_spilled_networks_are_found_after_restart():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        registry = NetworkRegistry(spill_dir=spill_dir, max_entries=1)
+        registry["network/1"] = build_network("First")
+        registry["network_2"] = build_network()
+
+        restarted = NetworkRegistry(spill_dir=spill_dir)
+        assert restarted["network/1"].task_nodes["task1"].params == {"competitors": "First"}
+
+if __name__ == "__main__":
+    test_least_recently_used_network_is_spilled_and_rehydrated()
+    test_task_results_survive_a_spill()
+    test_idle_and_oversized_networks_are_evicted_unless_pinned()
+    test_spilled_networks_are_found_after_restart()
+    print("✅ All network registry tests passed!")
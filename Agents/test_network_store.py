@@ -0,0 +1,67 @@
+import os
+import tempfile
+from network_store import NetworkStore
+
+def make_config(agent_type="competitor_watchdog", task_type="competitor_watchdog", domain="corporate", params=None):
+    return {
+        "agents": [{"id": "agent1", "type": agent_type, "domain": domain, "params": {}}],
+        "tasks": [{"id": "task1", "type": task_type, "domain": domain, "agent_id": "agent1", "params": params or {}}],
+        "connections": []
+    }
+
+def test_saves_add_versions_only_when_the_config_changes():
+    store = NetworkStore(path=":memory:")
+    assert store.save("net", make_config(params={"competitors": "Acme"}))["version"] == 1
+    assert store.save("net", make_config(params={"competitors": "Acme"})) == {"network_id": "net", "version": 1, "changed": False}
+    assert store.save("net", make_config(params={"competitors": "Globex"}))["version"] == 2
+
+    assert store.load("net")["tasks"][0]["params"] == {"competitors": "Globex"}
+    assert store.load("net", version=1)["tasks"][0]["params"] == {"competitors": "Acme"}
+    assert [v["version"] for v in store.versions("net")] == [2, 1]
+    assert store.load("missing") is None
+
+def test_old_versions_are_pruned():
+    store = NetworkStore(path=":memory:", max_versions=2)
+    for i in range(4):
+        store.save("net", make_config(params={"competitors": str(i)}))
+
+    assert [v["version"] for v in store.versions("net")] == [4, 3]
+    assert store.load("net", version=1) is None
+
+def test_list_filters_and_paginates():
+    store = NetworkStore(path=":memory:")
+    for i in range(5):
+        store.save(f"email_{i}", make_config("smart_email_manager", "smart_email_management"))
+    store.save("campaign", make_config("campaign_strategist", "campaign_strategy", domain="marketing"))
+
+    marketing = store.list(domain="marketing")["networks"]
+    assert [n["network_id"] for n in marketing] == ["campaign"]
+    assert marketing[0]["agent_types"] == ["campaign_strategist"]
+    assert len(store.list(task_type="smart_email_management")["networks"]) == 5
+    assert [n["network_id"] for n in store.list(search="_3")["networks"]] == ["email_3"]
+
+    seen, cursor = [], None
+    while True:
+        page = store.list(limit=2, cursor=cursor)
+        seen.extend(n["network_id"] for n in page["networks"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen[0] == "campaign" and sorted(seen) == sorted(["campaign"] + [f"email_{i}" for i in range(5)])
+
+def test_networks_persist_and_can_be_deleted():
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "networks.sqlite3")
+        NetworkStore(path=path).save("net", make_config())
+
+        store = NetworkStore(path=path)
+        assert store.load("net") == make_config()
+        assert store.delete("net") and not store.delete("net")
+        assert store.list()["networks"] == []
+
+if __name__ == "__main__":
+    test_saves_add_versions_only_when_the_config_changes()
+    test_old_versions_are_pruned()
+    test_list_filters_and_paginates()
+    test_networks_persist_and_can_be_deleted()
+    print("✅ All network store tests passed!")
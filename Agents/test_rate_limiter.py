@@ -0,0 +1,83 @@
+import threading
+import time
+from rate_limiter import BATCH, INTERACTIVE, RateLimiter, TokenBucket, is_rate_limit_error, llm_priority
+
+class RateLimitError(Exception):
+    pass
+
+def test_bucket_refills_at_its_per_minute_rate():
+    bucket = TokenBucket(60, now=0.0)
+    bucket.take(60, now=0.0)
+    assert bucket.wait_time(1, now=0.0) == 1.0
+    assert bucket.wait_time(1, now=0.5) == 0.5
+    assert bucket.wait_time(1, now=1.0) == 0.0
+
+    # Usage beyond the estimate is debt that must be paid back first
+    bucket.take(30, now=1.0)
+    assert bucket.wait_time(1, now=1.0) == 30.0
+
+def test_requests_beyond_the_quota_wait():
+    limiter = RateLimiter(requests_per_minute=1200, max_concurrency=10)
+    limiter._requests.level = 0
+    start = time.perf_counter()
+    limiter.call(lambda: "ok")
+    assert time.perf_counter() - start >= 0.04
+    assert limiter.stats()["throttled"] == 1
+
+def test_interactive_calls_overtake_queued_batch_calls():
+    limiter = RateLimiter(requests_per_minute=6000, max_concurrency=1)
+    limiter.acquire()
+    order = []
+
+    def wait(name, priority):
+        with llm_priority(priority):
+            limiter.call(lambda: order.append(name))
+
+    threads = [threading.Thread(target=wait, args=(f"batch{i}", BATCH)) for i in range(2)]
+    threads.append(threading.Thread(target=wait, args=("interactive", INTERACTIVE)))
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+
+    assert limiter.stats()["queued"] == {"interactive": 1, "batch": 2}
+    limiter.release()
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "batch0", "batch1"]
+
+def test_rate_limit_errors_are_retried_with_backoff():
+    limiter = RateLimiter(backoff_base=0.01, max_retries=3)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.perf_counter())
+        if len(attempts) < 3:
+            raise RateLimitError("429 RESOURCE_EXHAUSTED")
+        return "done"
+
+    assert limiter.call(flaky) == "done"
+    stats = limiter.stats()
+    assert (stats["retries"], stats["rate_limited"], stats["in_flight"]) == (2, 2, 0)
+
+def test_other_errors_are_not_retried():
+    limiter = RateLimiter(backoff_base=0.01)
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError("invalid prompt")
+
+    try:
+        limiter.call(broken)
+    except ValueError:
+        pass
+    assert len(calls) == 1 and limiter.stats()["in_flight"] == 0
+    assert is_rate_limit_error(RateLimitError("quota")) and not is_rate_limit_error(ValueError("bad"))
+
+if __name__ == "__main__":
+    test_bucket_refills_at_its_per_minute_rate()
+    test_requests_beyond_the_quota_wait()
+    test_interactive_calls_overtake_queued_batch_calls()
+    test_rate_limit_errors_are_retried_with_backoff()
+    test_other_errors_are_not_retried()
+    print("✅ All rate limiter tests passed!")
@@ -0,0 +1,84 @@
+import threading
+import time
+from crewai.llms.base_llm import BaseLLM
+from llm_cache import ResponseCache
+from metrics import agent_context, llm_tokens
+from resource_pool import ResourcePool
+
+class ProviderLLM(BaseLLM):
+    """Stands in for a native provider client, such as the GeminiCompletion crewai creates for gemini/ models."""
+
+    calls: int = 0
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        self.calls += 1
+        self._track_token_usage_internal({"prompt_tokens": 11, "completion_tokens": 3})
+        return f"answer to {messages}"
+
+def make_pool(**kwargs):
+    pool = ResourcePool(**kwargs)
+    pool.llm_factory = lambda model, api_key: ProviderLLM(model=model, api_key=api_key)
+    return pool
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+def test_pooled_llms_wrap_the_native_provider_client():
+    pool = ResourcePool()
+    llm = pool.get_llm("gemini/gemini-2.0-flash", api_key="test-key")
+
+    assert llm is pool.get_llm("gemini/gemini-2.0-flash", api_key="test-key")
+    assert list(pool.rate_limiters.values()) == [llm.rate_limiter]
+    # crewai creates the native provider's client, which the pool wraps
+    assert isinstance(llm.llm, BaseLLM) and not hasattr(llm.llm, "rate_limiter")
+    assert llm.model == llm.llm.model
+    assert llm.supports_function_calling() == llm.llm.supports_function_calling()
+
+def test_pooled_llm_calls_wait_for_the_rate_limiter():
+    pool = make_pool()
+    llm = pool.get_llm("gemini/gemini-2.0-flash", api_key="test-key")
+    limiter = llm.rate_limiter
+    limiter.max_concurrency = 1
+
+    limiter.acquire()
+    answers = []
+    caller = threading.Thread(target=lambda: answers.append(llm.call("hello")))
+    caller.start()
+    wait_until(lambda: limiter.stats()["queued"]["interactive"] == 1)
+    assert llm.llm.calls == 0
+
+    limiter.release()
+    caller.join()
+    assert answers == ["answer to hello"] and llm.llm.calls == 1
+    assert limiter.stats()["calls"] == 2
+
+def test_pooled_llms_serve_repeated_requests_from_the_response_cache():
+    cache = ResponseCache(path=":memory:")
+    llm = make_pool(response_cache=cache).get_llm("gemini/gemini-2.0-flash", api_key="test-key")
+    assert llm.response_cache is cache
+
+    assert llm.call("hello") == llm.call("hello") == "answer to hello"
+    assert llm.llm.calls == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["entries"] == 1
+    # Hits are served before the limiter, so they don't use quota
+    assert llm.rate_limiter.stats()["calls"] == 1
+
+def test_pooled_llms_record_the_usage_their_provider_reports():
+    llm = make_pool().get_llm("pool-usage-model", api_key="test-key")
+    with agent_context("seo_optimizer"):
+        llm.call("hello")
+
+    tokens = "\n".join(llm_tokens.render())
+    assert 'llm_tokens_total{model="pool-usage-model",agent_type="seo_optimizer",kind="prompt",source="reported"} 11' in tokens
+    assert llm.get_token_usage_summary().prompt_tokens == 11
+
+if __name__ == "__main__":
+    test_pooled_llms_wrap_the_native_provider_client()
+    test_pooled_llm_calls_wait_for_the_rate_limiter()
+    test_pooled_llms_serve_repeated_requests_from_the_response_cache()
+    test_pooled_llms_record_the_usage_their_provider_reports()
+    print("✅ All resource pool tests passed!")
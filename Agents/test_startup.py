@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+import startup
+
+AGENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def imported_modules(code):
+    """Run code in a fresh interpreter and return the names of the modules it imported."""
+    output = subprocess.check_output([sys.executable, "-c", code + "\nimport sys; print(' '.join(sys.modules))"], cwd=AGENTS_DIR)
+    return set(output.decode().split())
+
+def test_api_and_catalog_load_without_crewai():
+    modules = imported_modules(
+        "import api\n"
+        "from main import get_domain_factories\n"
+        "[f['agents'].get_available_agents() for f in get_domain_factories().values()]"
+    )
+    assert "api" in modules
+    assert not {"crewai", "crewai_tools"} & modules
+
+def test_agent_stack_is_loaded_once():
+    startup.load_agent_stack()
+    assert startup.agent_stack_loaded()
+    first = startup.timings["agent_stack_import"]
+
+    startup.warm_up_in_background().join()
+    assert startup.timings["agent_stack_import"] == first
+    assert "crewai" in sys.modules
+
+if __name__ == "__main__":
+    test_api_and_catalog_load_without_crewai()
+    test_agent_stack_is_loaded_once()
+    print("✅ All startup tests passed!")
@@ -0,0 +1,51 @@
+from template_engine import compile_template
+
+def test_placeholders_are_substituted():
+    template = compile_template("Analyze {competitors} for {company}. Keep {unknown} as is.")
+    rendered = template.render({'competitors': 'Acme, Globex', 'company': 'TechCorp'})
+    assert rendered == "Analyze Acme, Globex for TechCorp. Keep {unknown} as is."
+
+def test_none_renders_as_empty_string():
+    assert compile_template("[{pdf_path}]").render({'pdf_path': None}) == "[]"
+
+def test_conditionals_follow_truthiness():
+    template = compile_template("{#if pdf_path}PDF at {pdf_path}{/if}{#if meeting_text}Text{/if}")
+    assert template.render({'pdf_path': 'notes.pdf'}) == "PDF at notes.pdf"
+    assert template.render({'pdf_path': '', 'meeting_text': 'hi'}) == "Text"
+
+def test_nested_conditionals():
+    template = compile_template("{#if a}A{#if b}B{/if}a{/if}!")
+    assert template.render({'a': 1, 'b': 1}) == "ABa!"
+    assert template.render({'a': 1}) == "Aa!"
+    assert template.render({'b': 1}) == "!"
+
+def test_each_over_list_and_comma_separated_string():
+    template = compile_template("{#each keywords}- {this} ({company})\n{/each}")
+    expected = "- seo (X)\n- ads (X)\n"
+    assert template.render({'keywords': ['seo', 'ads'], 'company': 'X'}) == expected
+    assert template.render({'keywords': 'seo, ads', 'company': 'X'}) == expected
+
+def test_skipped_block_values_are_not_substituted_into_output():
+    template = compile_template("{#if pdf_path}{meeting_text}{/if}")
+    assert template.render({'meeting_text': 'x' * 1000}) == ""
+
+def test_literal_braces_and_unbalanced_tags_are_kept():
+    source = '{"type": string} {/if} {#if open}never closed'
+    template = compile_template(source)
+    assert template.render({'open': True}) == source
+
+def test_variables_are_collected():
+    template = compile_template("{#if pdf_path}{pdf_path}{/if}{#each competitors}{this}{/each}{company}")
+    assert template.variables == {'pdf_path', 'competitors', 'company'}
+    assert template.conditionals == {'pdf_path'}
+
+if __name__ == "__main__":
+    test_placeholders_are_substituted()
+    test_none_renders_as_empty_string()
+    test_conditionals_follow_truthiness()
+    test_nested_conditionals()
+    test_each_over_list_and_comma_separated_string()
+    test_skipped_block_values_are_not_substituted_into_output()
+    test_literal_braces_and_unbalanced_tags_are_kept()
+    test_variables_are_collected()
+    print("✅ All template engine tests passed!")
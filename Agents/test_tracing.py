@@ -0,0 +1,65 @@
+import contextvars
+import os
+import tempfile
+import threading
+from tracing import TraceStore, span, trace_run
+
+def record_run(store):
+    with trace_run("run1", "run_network", store=store, network_id="net"):
+        with span("instantiate_agents", agents=2):
+            pass
+        with span("task", task_id="task1"):
+            # Worker threads run in a copy of the caller's context, as in DAGExecutor
+            worker = threading.Thread(target=contextvars.copy_context().run, args=(record_llm_call,))
+            worker.start()
+            worker.join()
+        try:
+            with span("task", task_id="task2"):
+                raise RuntimeError("Serper quota exceeded")
+        except RuntimeError:
+            pass
+
+def record_llm_call():
+    with span("llm_call", model="gemini/gemini-2.0-flash"):
+        with span("tool:serper"):
+            pass
+
+def test_spans_nest_across_threads():
+    store = TraceStore(directory=None)
+    record_run(store)
+
+    events = {(event["name"], event["args"].get("task_id")): event for event in store.get("run1")["traceEvents"]}
+    assert set(events) == {
+        ("run_network", None), ("instantiate_agents", None), ("task", "task1"),
+        ("task", "task2"), ("llm_call", None), ("tool:serper", None)
+    }
+    assert events[("task", "task2")]["args"]["error"] == "Serper quota exceeded"
+    assert events[("llm_call", None)]["tid"] != events[("task", "task1")]["tid"]
+
+    spans = {span["name"] + str(index): span for index, span in enumerate(
+        store.get("run1", "otlp")["resourceSpans"][0]["scopeSpans"][0]["spans"])}
+    by_id = {span["spanId"]: span for span in spans.values()}
+    tool = next(span for span in spans.values() if span["name"] == "tool:serper")
+    llm = by_id[tool["parentSpanId"]]
+    task = by_id[llm["parentSpanId"]]
+    assert (llm["name"], task["name"], by_id[task["parentSpanId"]]["name"]) == ("llm_call", "task", "run_network")
+    assert len({span["traceId"] for span in spans.values()}) == 1
+
+def test_spans_outside_a_run_are_not_recorded():
+    with span("task") as current:
+        assert current is None
+
+def test_traces_are_written_to_disk():
+    with tempfile.TemporaryDirectory() as root:
+        record_run(TraceStore(directory=root))
+        assert sorted(os.listdir(root)) == ["run1.chrome.json", "run1.otlp.json"]
+
+        restarted = TraceStore(directory=root)
+        assert len(restarted.get("run1")["traceEvents"]) == 6
+        assert restarted.get("../run1") is None and restarted.get("missing") is None
+
+if __name__ == "__main__":
+    test_spans_nest_across_threads()
+    test_spans_outside_a_run_are_not_recorded()
+    test_traces_are_written_to_disk()
+    print("✅ All tracing tests passed!")
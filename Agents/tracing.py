@@ -0,0 +1,294 @@
+"""Per-run span tracing.
+
+A run opens a trace with `trace_run`; code executed within it records nested
+spans with `span`. The current span is kept in a context variable, so spans
+opened in executor worker threads (which run in a copy of the caller's
+context) attach to the right parent. Outside a traced run, `span` does
+nothing.
+
+Finished traces are kept in memory and written to the trace directory as
+Chrome trace_event JSON (load it in chrome://tracing or Perfetto) and as
+OTLP-style JSON.
+"""
+import contextvars
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+DEFAULT_TRACE_DIR = os.getenv(
+    "TRACE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db', 'traces')
+)
+# Finished traces kept in memory and on disk
+DEFAULT_MAX_TRACES = int(os.getenv("TRACE_MAX_IN_MEMORY", "100"))
+DEFAULT_MAX_TRACE_FILES = int(os.getenv("TRACE_MAX_FILES", "1000"))
+
+SERVICE_NAME = "crew-agents"
+RUN_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+FORMATS = ("chrome", "otlp")
+
+_current_span = contextvars.ContextVar("tracing_span", default=None)
+
+class Span:
+    """A timed operation within a trace."""
+
+    def __init__(self, trace, name, parent_id, attributes):
+        self.trace = trace
+        self.name = name
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.error = None
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def finish(self, error=None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = str(error) or type(error).__name__
+        self.trace.add(self)
+
+class Trace:
+    """The spans recorded during one run."""
+
+    def __init__(self, run_id, name):
+        self.run_id = run_id
+        self.name = name
+        self.trace_id = secrets.token_hex(16)
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def export(self, format):
+        """Export the trace.
+
+        Args:
+            format (str): "chrome" for Chrome trace_event JSON, "otlp" for OTLP-style JSON.
+
+        Returns:
+            dict: The exported trace.
+        """
+        if format == "chrome":
+            return self.to_chrome()
+        if format == "otlp":
+            return self.to_otlp()
+        raise ValueError(f"Unknown trace format {format}, expected one of {', '.join(FORMATS)}")
+
+    def to_chrome(self):
+        """Export as Chrome trace_event JSON, one complete ("X") event per span."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        threads = {}
+        events = []
+        for span in spans:
+            args = dict(span.attributes)
+            if span.error:
+                args["error"] = span.error
+            events.append({
+                "name": span.name,
+                "cat": span.name.split(':', 1)[0],
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": 1,
+                # Small thread numbers read better than thread idents in the viewer
+                "tid": threads.setdefault(span.thread_id, len(threads) + 1),
+                "args": args
+            })
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"run_id": self.run_id, "trace_id": self.trace_id}
+        }
+
+    def to_otlp(self):
+        """Export in the OTLP JSON layout (resourceSpans / scopeSpans / spans)."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start_ns)
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    otlp_attribute("service.name", SERVICE_NAME),
+                    otlp_attribute("run.id", self.run_id)
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "crew.tracing"},
+                    "spans": [{
+                        "traceId": self.trace_id,
+                        "spanId": span.span_id,
+                        "parentSpanId": span.parent_id or "",
+                        "name": span.name,
+                        "kind": 1,
+                        "startTimeUnixNano": str(span.start_ns),
+                        "endTimeUnixNano": str(span.end_ns),
+                        "attributes": [otlp_attribute(key, value) for key, value in span.attributes.items()],
+                        "status": {"code": 2, "message": span.error} if span.error else {"code": 1}
+                    } for span in spans]
+                }]
+            }]
+        }
+
+def otlp_attribute(key, value):
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+class TraceStore:
+    """Keeps recent traces in memory and writes every finished trace to disk."""
+
+    def __init__(self, directory=DEFAULT_TRACE_DIR, max_traces=DEFAULT_MAX_TRACES, max_files=DEFAULT_MAX_TRACE_FILES):
+        """Initialize the store.
+
+        Args:
+            directory (str): Directory the exported traces are written to, or None to keep them in memory only.
+            max_traces (int): Number of recent traces kept in memory.
+            max_files (int): Number of runs whose trace files are kept on disk.
+        """
+        self.directory = directory
+        self.max_traces = max_traces
+        self.max_files = max_files
+        self._traces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def save(self, trace):
+        """Store a finished trace and write its exports."""
+        with self._lock:
+            self._traces[trace.run_id] = trace
+            while len(self._traces) > self.max_traces:
+                self._traces.popitem(last=False)
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            for format in FORMATS:
+                path = self._path(trace.run_id, format)
+                with open(path + '.tmp', 'w') as f:
+                    json.dump(trace.export(format), f, default=str)
+                os.replace(path + '.tmp', path)
+            self._prune_files()
+
+    def get(self, run_id, format="chrome"):
+        """Get the export of a run's trace.
+
+        Args:
+            run_id (str): The run ID.
+            format (str): "chrome" or "otlp".
+
+        Returns:
+            dict: The exported trace, or None if the run is unknown.
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unknown trace format {format}, expected one of {', '.join(FORMATS)}")
+        if not RUN_ID_PATTERN.match(run_id):
+            return None
+
+        with self._lock:
+            trace = self._traces.get(run_id)
+        if trace is not None:
+            return trace.export(format)
+
+        if self.directory:
+            path = self._path(run_id, format)
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    return json.load(f)
+        return None
+
+    def _path(self, run_id, format):
+        return os.path.join(self.directory, f"{run_id}.{format}.json")
+
+    def _prune_files(self):
+        """Delete the trace files of the oldest runs beyond max_files."""
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.chrome.json')]
+        if len(paths) <= self.max_files:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.max_files]:
+            run_id = os.path.basename(path)[:-len('.chrome.json')]
+            for format in FORMATS:
+                try:
+                    os.remove(self._path(run_id, format))
+                except FileNotFoundError:
+                    pass
+
+@contextmanager
+def trace_run(run_id, name, store=None, **attributes):
+    """Record a trace of everything executed within this context.
+
+    Args:
+        run_id (str): The ID the trace is stored under.
+        name (str): The name of the root span.
+        store (TraceStore): Where the finished trace is saved, defaults to trace_store.
+        **attributes: Attributes of the root span.
+
+    Yields:
+        Trace: The trace being recorded, or None when tracing is disabled.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    trace = Trace(run_id, name)
+    root = Span(trace, name, None, attributes)
+    token = _current_span.set(root)
+    error = None
+    try:
+        yield trace
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        root.finish(error)
+        (store or trace_store).save(trace)
+
+@contextmanager
+def span(name, **attributes):
+    """Record a span, nested in the current one, around this context.
+
+    Does nothing outside a traced run.
+
+    Args:
+        name (str): The span name, e.g. "task" or "tool:serper".
+        **attributes: Attributes of the span.
+
+    Yields:
+        Span: The span, or None outside a traced run.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    current = Span(parent.trace, name, parent.span_id, attributes)
+    token = _current_span.set(current)
+    error = None
+    try:
+        yield current
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish(error)
+
+# Shared store served by /runs/<run_id>/trace
+trace_store = TraceStore()
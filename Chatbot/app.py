@@ -5,8 +5,11 @@ from flask import Flask, request, jsonify
 from langchain_google_genai.embeddings import GoogleGenerativeAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import PyPDFLoader
-from pinecone import Pinecone
-from langchain_pinecone import PineconeVectorStore
+from ingest import IngestionPipeline
+from ingest_jobs import IngestionQueue, JournalLocked
+from manifest import IngestManifest, hash_file
+from embedding_cache import EMBEDDING_CACHE_ENABLED, CachedEmbeddings, EmbeddingStore
+from vector_store import BACKENDS, VECTOR_STORE_BACKEND, PineconeStore
 
 # Load environment variables from .env file if it exists
 load_dotenv()
@@ -21,7 +24,11 @@ GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 print(f"PINECONE_API_KEY present: {'Yes' if PINECONE_API_KEY else 'No'}")
 print(f"GOOGLE_API_KEY present: {'Yes' if GOOGLE_API_KEY else 'No'}")
 
-if not PINECONE_API_KEY:
+if VECTOR_STORE_BACKEND not in BACKENDS:
+    print(f"ERROR: Unknown VECTOR_STORE '{VECTOR_STORE_BACKEND}', expected one of {', '.join(BACKENDS)}")
+    sys.exit(1)
+
+if VECTOR_STORE_BACKEND == "pinecone" and not PINECONE_API_KEY:
     print("ERROR: PINECONE_API_KEY environment variable is not set")
     print("Please set your Pinecone API key by using:")
     print("    set PINECONE_API_KEY=your-api-key (Windows CMD)")
@@ -37,10 +44,12 @@ if not GOOGLE_API_KEY:
     print("Or create a .env file with GOOGLE_API_KEY=your-api-key")
     sys.exit(1)
 
+EMBEDDING_MODEL = "models/embedding-001"
+
 # Initialize embedding model
 try:
     embeddings = GoogleGenerativeAIEmbeddings(
-        model="models/embedding-001",
+        model=EMBEDDING_MODEL,
         google_api_key=GOOGLE_API_KEY
     )
     print("Successfully initialized Google Embeddings model")
@@ -48,36 +57,90 @@ except Exception as e:
     print(f"Error initializing Google Embeddings: {str(e)}")
     sys.exit(1)
 
-# Initialize Pinecone with the new API style
-try:
-    print("Attempting to connect to Pinecone...")
-    pc = Pinecone(api_key=PINECONE_API_KEY)
-    
-    # Check if index exists
-    index_name = "d2k"
-    available_indexes = pc.list_indexes().names()
-    print(f"Available Pinecone indexes: {available_indexes}")
-    
-    if index_name not in available_indexes:
-        print(f"Error: Index '{index_name}' not found in your Pinecone account")
-        print("Available indexes:", available_indexes)
-        print("Please create the index first or use an existing one")
+# Reuse the vectors of texts embedded before, for both uploads and queries
+embedding_cache = None
+if EMBEDDING_CACHE_ENABLED:
+    embedding_cache = EmbeddingStore()
+    embeddings = CachedEmbeddings(embeddings, embedding_cache, EMBEDDING_MODEL)
+    print(f"Embedding cache enabled at {embedding_cache.path}")
+
+if VECTOR_STORE_BACKEND == "local":
+    # In-process index persisted under db/, for deployments that cannot reach Pinecone
+    from local_vector_store import LocalVectorStore
+    store = LocalVectorStore(embeddings, text_key="text")
+    print(f"Using local vector store at {store.path} ({store.stats()['vectors']} vectors)")
+else:
+    # Initialize Pinecone with the new API style
+    try:
+        from pinecone import Pinecone
+        print("Attempting to connect to Pinecone...")
+        pc = Pinecone(api_key=PINECONE_API_KEY)
+        
+        # Check if index exists
+        index_name = "d2k"
+        available_indexes = pc.list_indexes().names()
+        print(f"Available Pinecone indexes: {available_indexes}")
+        
+        if index_name not in available_indexes:
+            print(f"Error: Index '{index_name}' not found in your Pinecone account")
+            print("Available indexes:", available_indexes)
+            print("Please create the index first or use an existing one")
+            sys.exit(1)
+        
+        # Connect to the index and initialize vector store
+        store = PineconeStore(pc.Index(index_name), embeddings, index_name, text_key="text")
+        print(f"Successfully connected to Pinecone index: {index_name}")
+        
+    except Exception as e:
+        print(f"Error connecting to Pinecone: {str(e)}")
         sys.exit(1)
+
+text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
+
+# Documents and chunks already in the index, so re-uploads are skipped
+manifest = IngestManifest(store.name)
+
+def forget_if_store_emptied():
+    """Clear the manifest if the vector store was emptied outside the app, e.g. its index was reset
     
-    # Connect to the index
-    index = pc.Index(index_name)
+    Only safe before any ingestion job starts: Pinecone's count lags behind upserts,
+    so a job writing its first vectors would look like an emptied store.
+    """
+    if manifest.stats()["chunks"] and store.count() == 0:
+        manifest.clear()
+        print("The vector store is empty; cleared the ingestion manifest")
+
+# Checked once at startup; while the app runs, the index is reset through /index/reset
+forget_if_store_emptied()
+
+def ingest_file(job, on_progress):
+    """Stream a spooled PDF's pages through chunking, embedding and upserting"""
+    document_hash = hash_file(job.path)
+    indexed = manifest.get_document(document_hash)
+    if indexed is not None:
+        return {"pages": 0, "chunks": 0, "vectors": 0, "skipped": indexed["chunks"]}
     
-    # Initialize vector store
-    db = PineconeVectorStore(
-        index=index,
-        embedding=embeddings,
-        text_key="text"
+    pipeline = IngestionPipeline(
+        splitter=text_splitter,
+        embeddings=embeddings,
+        upsert=store.upsert,
+        text_key="text",
+        manifest=manifest
     )
-    print(f"Successfully connected to Pinecone index: {index_name}")
-    
-except Exception as e:
-    print(f"Error connecting to Pinecone: {str(e)}")
-    sys.exit(1)
+    counts = pipeline.run(PyPDFLoader(job.path).lazy_load(), on_progress=on_progress)
+    manifest.add_document(document_hash, job.filename, counts["chunks"] + counts["skipped"])
+    return counts
+
+# Uploads are ingested in the background; jobs left unfinished by a restart are resumed
+ingestion_queue = IngestionQueue(ingest_file)
+# The debug reloader also imports this module in its watcher process, which must not ingest anything
+if __name__ != '__main__' or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+    # Job status is kept in memory, so the app must run in a single worker process
+    try:
+        print(f"Resumed {ingestion_queue.resume()} unfinished ingestion jobs")
+    except JournalLocked as e:
+        print(f"ERROR: {str(e)}")
+        sys.exit(1)
 
 @app.route('/upload', methods=['POST'])
 def upload_pdf():
@@ -88,28 +151,23 @@ def upload_pdf():
     if file.filename == '':
         return jsonify({"error": "No selected file"}), 400
     
-    # Create uploads directory if it doesn't exist
-    os.makedirs("uploads", exist_ok=True)
-    
-    file_path = os.path.join("uploads", file.filename)
-    file.save(file_path)
-    
     try:
-        loader = PyPDFLoader(file_path)
-        documents = loader.load()
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
-        texts = text_splitter.split_documents(documents)
-        
-        # Add documents to the vector store
-        db.add_documents(texts)
-        
-        return jsonify({"message": f"File {file.filename} uploaded and processed successfully"})
+        job = ingestion_queue.submit(file.filename, file.save)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        # Clean up the uploaded file
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    
+    return jsonify({
+        "message": f"File {file.filename} uploaded and queued for processing",
+        "job_id": job.id,
+        "status": job.status
+    }), 202
+
+@app.route('/upload/<job_id>', methods=['GET'])
+def upload_status(job_id):
+    job = ingestion_queue.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Upload job {job_id} not found"}), 404
+    return jsonify(job.to_dict())
 
 @app.route('/query', methods=['POST'])
 def query():
@@ -122,22 +180,41 @@ def query():
         return jsonify({"error": "Query text is required"}), 400
     
     try:
-        results = db.similarity_search(query_text, k=5)
+        results = store.search(query_text, k=5)
         return jsonify({
-            "results": [doc.page_content for doc in results]
+            "results": [result.text for result in results]
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/index/reset', methods=['POST'])
+def reset_index():
+    """Delete every vector and forget which documents were indexed, so they can be uploaded again"""
+    counts = ingestion_queue.counts()
+    if counts["queued"] or counts["running"]:
+        return jsonify({"error": "Uploads are still being ingested", "ingestion_jobs": counts}), 409
+    
+    try:
+        store.clear()
+        manifest.clear()
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    
+    return jsonify({"status": "reset", "indexed": manifest.stats()})
+
 @app.route('/status', methods=['GET'])
 def status():
     return jsonify({
         "status": "online",
-        "pinecone_index": "d2k",
+        "pinecone_index": store.name if VECTOR_STORE_BACKEND == "pinecone" else None,
+        "vector_store": store.stats(),
         "pinecone_api_key_present": bool(PINECONE_API_KEY),
-        "google_api_key_present": bool(GOOGLE_API_KEY)
+        "google_api_key_present": bool(GOOGLE_API_KEY),
+        "ingestion_jobs": ingestion_queue.counts(),
+        "indexed": manifest.stats(),
+        "embedding_cache": embedding_cache.stats() if embedding_cache is not None else None
     })
 
 if __name__ == '__main__':
-    print("Starting Flask app on port 5551 with Pinecone")
+    print(f"Starting Flask app on port 5551 with the {VECTOR_STORE_BACKEND} vector store")
     app.run(debug=True, port=5551)
\ No newline at end of file
@@ -0,0 +1,240 @@
+"""Persistent cache of embeddings.
+
+`CachedEmbeddings` wraps an embedding model and only sends it the texts it
+has not embedded before. Vectors are stored in SQLite, keyed by model name,
+kind (documents and queries are embedded differently) and the SHA-256 of the
+text, as float32 blobs. Once the cache exceeds its size limit, the least
+recently used vectors are evicted.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from langchain_core.embeddings import Embeddings
+
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+DEFAULT_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("db", "embedding_cache.sqlite3"))
+DEFAULT_MAX_BYTES = int(float(os.getenv("EMBEDDING_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+DOCUMENT = "document"
+QUERY = "query"
+
+# SQLite limits the number of parameters of a statement
+LOOKUP_BATCH_SIZE = 500
+# Least recently used entries examined per eviction query
+EVICTION_BATCH_SIZE = 1000
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+class EmbeddingStore:
+    """SQLite-backed store of embedding vectors with size-bounded LRU eviction."""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        """Open the store, creating the database if needed.
+
+        Args:
+            path (str): The SQLite database file, or ":memory:".
+            max_bytes (int): Total vector size kept before least recently used vectors are evicted.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT, kind TEXT, text_hash TEXT, vector BLOB, size INTEGER, accessed_at REAL, "
+            "PRIMARY KEY (model, kind, text_hash))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed_at)")
+        self._conn.commit()
+        # Kept up to date on every write, so eviction doesn't sum the table
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model, kind, hashes):
+        """Get cached vectors.
+
+        Args:
+            model (str): The embedding model name.
+            kind (str): DOCUMENT or QUERY.
+            hashes (list): Text hashes as returned by text_hash.
+
+        Returns:
+            dict: The cached vectors (lists of floats) keyed by text hash.
+        """
+        found = {}
+        hashes = list(hashes)
+        now = time.time()
+        with self._lock:
+            for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+                batch = hashes[start:start + LOOKUP_BATCH_SIZE]
+                rows = self._conn.execute(
+                    "SELECT text_hash, vector FROM embeddings WHERE model = ? AND kind = ? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    [model, kind] + batch
+                ).fetchall()
+                for hash, blob in rows:
+                    vector = array('f')
+                    vector.frombytes(blob)
+                    found[hash] = vector.tolist()
+            if found:
+                self._conn.executemany(
+                    "UPDATE embeddings SET accessed_at = ? WHERE model = ? AND kind = ? AND text_hash = ?",
+                    [(now, model, kind, hash) for hash in found]
+                )
+                self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(set(hashes)) - len(found)
+        return found
+
+    def set_many(self, model, kind, vectors):
+        """Store vectors and evict least recently used ones beyond the size limit.
+
+        Args:
+            model (str): The embedding model name.
+            kind (str): DOCUMENT or QUERY.
+            vectors (dict): Vectors keyed by text hash.
+        """
+        now = time.time()
+        with self._lock:
+            for hash, vector in vectors.items():
+                blob = array('f', vector).tobytes()
+                inserted = self._conn.execute(
+                    "INSERT OR IGNORE INTO embeddings (model, kind, text_hash, vector, size, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (model, kind, hash, blob, len(blob), now)
+                ).rowcount
+                if inserted:
+                    self._bytes += len(blob)
+            self._evict()
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every cached vector."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._bytes = 0
+
+    def stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: Entry count, total size, hits, misses, hit rate and evictions.
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
+
+    def _evict(self):
+        """Drop the least recently used vectors until under max_bytes. Caller holds the lock."""
+        while self._bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT model, kind, text_hash, size FROM embeddings ORDER BY accessed_at LIMIT ?",
+                (EVICTION_BATCH_SIZE,)
+            ).fetchall()
+            if not rows:
+                self._bytes = 0
+                return
+            for model, kind, hash, size in rows:
+                if self._bytes <= self.max_bytes:
+                    return
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE model = ? AND kind = ? AND text_hash = ?", (model, kind, hash)
+                )
+                self._bytes -= size
+                self.evictions += 1
+
+class CachedEmbeddings(Embeddings):
+    """An embedding model whose vectors are reused from an EmbeddingStore.
+
+    A LangChain Embeddings implementation, so it can be passed wherever the
+    wrapped model was. The async methods use the same cache and send the
+    missing texts to the wrapped model's async methods.
+    """
+
+    def __init__(self, embeddings, store, model_name):
+        """Wrap an embedding model.
+
+        Args:
+            embeddings (Embeddings): The embedding model.
+            store (EmbeddingStore): Where vectors are cached.
+            model_name (str): The model's name, part of the cache key.
+        """
+        self.embeddings = embeddings
+        self.store = store
+        self.model_name = model_name
+
+    def embed_documents(self, texts):
+        """Embed texts for indexing, only sending the model those not cached.
+
+        Returns:
+            list: One vector per text, in order.
+        """
+        hashes, vectors, missing = self._lookup_documents(texts)
+        if missing:
+            self._store_documents(vectors, missing, self.embeddings.embed_documents(list(missing.values())))
+        return [vectors[hash] for hash in hashes]
+
+    def embed_query(self, text):
+        """Embed a search query, reusing the vector of an identical earlier query."""
+        hash, vector = self._lookup_query(text)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self.store.set_many(self.model_name, QUERY, {hash: vector})
+        return vector
+
+    async def aembed_documents(self, texts):
+        """Async version of embed_documents."""
+        hashes, vectors, missing = self._lookup_documents(texts)
+        if missing:
+            self._store_documents(vectors, missing, await self.embeddings.aembed_documents(list(missing.values())))
+        return [vectors[hash] for hash in hashes]
+
+    async def aembed_query(self, text):
+        """Async version of embed_query."""
+        hash, vector = self._lookup_query(text)
+        if vector is None:
+            vector = await self.embeddings.aembed_query(text)
+            self.store.set_many(self.model_name, QUERY, {hash: vector})
+        return vector
+
+    def _lookup_documents(self, texts):
+        """Get the texts' hashes, their cached vectors, and the missing texts keyed by hash."""
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.store.get_many(self.model_name, DOCUMENT, hashes)
+
+        # Embed each missing text once, even if it appears several times
+        missing = {}
+        for hash, text in zip(hashes, texts):
+            if hash not in vectors:
+                missing.setdefault(hash, text)
+        return hashes, vectors, missing
+
+    def _store_documents(self, vectors, missing, embedded):
+        """Cache the vectors of the missing texts and add them to vectors."""
+        embedded = dict(zip(missing, embedded))
+        self.store.set_many(self.model_name, DOCUMENT, embedded)
+        vectors.update(embedded)
+
+    def _lookup_query(self, text):
+        hash = text_hash(text)
+        return hash, self.store.get_many(self.model_name, QUERY, [hash]).get(hash)
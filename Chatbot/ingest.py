@@ -0,0 +1,206 @@
+"""Streaming ingestion of documents into the vector index.
+
+Pages flow through three stages connected by bounded queues:
+
+    pages -> chunker -> embedder -> upserter
+
+The caller's thread reads pages one at a time and splits them into chunks.
+A worker thread embeds the chunks in batches, and another upserts the
+vectors in batches. Embedding and upserting therefore overlap with parsing.
+Every queue holds at most a few batches, so memory stays flat however long
+the document is: a slow stage makes the stages before it wait.
+
+Vector IDs are derived from the chunk text, so writing a chunk again
+overwrites its vector. With a manifest, chunks already in the index (or seen
+earlier in the same document) are skipped before they are embedded.
+"""
+import os
+import queue
+import threading
+from manifest import chunk_id
+
+# Chunks per embedding request
+EMBED_BATCH_SIZE = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+# Vectors per upsert request
+UPSERT_BATCH_SIZE = int(os.getenv("INGEST_UPSERT_BATCH_SIZE", "100"))
+# Batches buffered between two stages
+QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "4"))
+
+# Marks the end of a stage's output
+_DONE = object()
+
+class IngestionCancelled(Exception):
+    """Raised inside a stage when another stage failed."""
+
+class IngestionPipeline:
+    """Chunks, embeds and upserts the pages of one document."""
+
+    def __init__(self, splitter, embeddings, upsert, text_key="text", manifest=None,
+                 embed_batch_size=EMBED_BATCH_SIZE, upsert_batch_size=UPSERT_BATCH_SIZE, queue_size=QUEUE_SIZE):
+        """Initialize the pipeline.
+
+        Args:
+            splitter (TextSplitter): Splits a list of page documents into chunk documents.
+            embeddings (Embeddings): The embedding model, called with embed_documents(texts).
+            upsert (callable): Writes a list of (id, vector, metadata) tuples to the index.
+            text_key (str): The metadata key the chunk text is stored under, as the vector store expects.
+            manifest (IngestManifest): Records written chunks, so chunks already indexed are skipped.
+            embed_batch_size (int): Chunks per embedding request.
+            upsert_batch_size (int): Vectors per upsert request.
+            queue_size (int): Batches buffered between two stages.
+        """
+        self.splitter = splitter
+        self.embeddings = embeddings
+        self.upsert = upsert
+        self.text_key = text_key
+        self.manifest = manifest
+        self.embed_batch_size = embed_batch_size
+        self.upsert_batch_size = upsert_batch_size
+        self.queue_size = queue_size
+
+    def run(self, pages, on_progress=None):
+        """Ingest a document.
+
+        Args:
+            pages (iterable): The page documents, e.g. PyPDFLoader(path).lazy_load().
+            on_progress (callable): Called with the counters every time a stage finishes a page or batch.
+
+        Returns:
+            dict: The number of pages parsed, chunks embedded, vectors written and
+                chunks skipped because they were already indexed.
+
+        Raises:
+            Exception: The first error raised by any stage; the other stages stop.
+        """
+        run = _Run(on_progress)
+        chunk_batches = queue.Queue(maxsize=self.queue_size)
+        vector_batches = queue.Queue(maxsize=self.queue_size)
+        workers = [
+            threading.Thread(target=run.stage, args=(self._embed, chunk_batches, vector_batches), name="ingest-embed", daemon=True),
+            threading.Thread(target=run.stage, args=(self._write, vector_batches, None), name="ingest-upsert", daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            batch = []
+            for page in pages:
+                run.check()
+                batch.extend(self.splitter.split_documents([page]))
+                run.add("pages", 1)
+                while len(batch) >= self.embed_batch_size:
+                    run.put(chunk_batches, batch[:self.embed_batch_size])
+                    batch = batch[self.embed_batch_size:]
+            if batch:
+                run.put(chunk_batches, batch)
+            run.put(chunk_batches, _DONE)
+        except BaseException as e:
+            run.fail(e)
+        finally:
+            for worker in workers:
+                worker.join()
+
+        run.raise_error()
+        return run.counts()
+
+    def _embed(self, chunks, run):
+        ids = [chunk_id(chunk.page_content) for chunk in chunks]
+        indexed = self.manifest.indexed_chunks(ids) if self.manifest is not None else set()
+        new = []
+        for id, chunk in zip(ids, chunks):
+            # Only this stage touches run.seen, so it needs no lock
+            if id not in indexed and id not in run.seen:
+                run.seen.add(id)
+                new.append((id, chunk))
+        if len(new) < len(chunks):
+            run.add("skipped", len(chunks) - len(new))
+        if not new:
+            return []
+
+        vectors = self.embeddings.embed_documents([chunk.page_content for _, chunk in new])
+        run.add("chunks", len(new))
+        # Split into upsert batches here, so the upserter never holds more than one
+        records = []
+        for (id, chunk), vector in zip(new, vectors):
+            metadata = dict(chunk.metadata)
+            metadata[self.text_key] = chunk.page_content
+            records.append((id, vector, metadata))
+        return [records[i:i + self.upsert_batch_size] for i in range(0, len(records), self.upsert_batch_size)]
+
+    def _write(self, records, run):
+        self.upsert(records)
+        if self.manifest is not None:
+            self.manifest.add_chunks([id for id, _, _ in records])
+        run.add("vectors", len(records))
+        return []
+
+class _Run:
+    """Counters, error and stop signal shared by the stages of one run."""
+
+    def __init__(self, on_progress):
+        self.on_progress = on_progress
+        self.pages = 0
+        self.chunks = 0
+        self.vectors = 0
+        self.skipped = 0
+        self.seen = set()
+        self.error = None
+        self.stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def counts(self):
+        return {"pages": self.pages, "chunks": self.chunks, "vectors": self.vectors, "skipped": self.skipped}
+
+    def add(self, counter, amount):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+            counts = self.counts()
+        if self.on_progress:
+            self.on_progress(counts)
+
+    def fail(self, error):
+        with self._lock:
+            if self.error is None and not isinstance(error, IngestionCancelled):
+                self.error = error
+        self.stopped.set()
+
+    def check(self):
+        if self.stopped.is_set():
+            raise IngestionCancelled()
+
+    def put(self, target, item):
+        """Put an item on a bounded queue, giving up if another stage failed."""
+        while True:
+            self.check()
+            try:
+                target.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def get(self, source):
+        """Take an item from a queue, giving up if another stage failed."""
+        while True:
+            self.check()
+            try:
+                return source.get(timeout=0.1)
+            except queue.Empty:
+                pass
+
+    def stage(self, process, source, target):
+        """Run a stage: process every batch from source and put the resulting batches on target."""
+        try:
+            while True:
+                item = self.get(source)
+                if item is _DONE:
+                    break
+                for batch in process(item, self):
+                    self.put(target, batch)
+            if target is not None:
+                self.put(target, _DONE)
+        except BaseException as e:
+            self.fail(e)
+
+    def raise_error(self):
+        if self.error is not None:
+            raise self.error
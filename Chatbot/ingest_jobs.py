@@ -0,0 +1,319 @@
+"""Background ingestion of uploaded documents.
+
+An upload is spooled to disk and queued. A bounded pool of workers ingests
+the queued files, and each job's progress (pages parsed, chunks embedded,
+vectors written, chunks skipped as already indexed) can be polled. Every status change is appended to a journal
+file, which is rewritten with one record per tracked job once enough lines
+were appended. On startup the journal is replayed by `resume`, so jobs that
+were queued or running when the process stopped are queued again.
+
+A journal belongs to a single process: `resume` takes an exclusive lock on
+it, held until the process exits or the queue is shut down, and raises
+JournalLocked when another process already owns it. Deployments must
+therefore run the app in a single worker process.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+# Number of documents ingested at the same time
+DEFAULT_INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+DEFAULT_SPOOL_DIR = os.getenv("INGEST_SPOOL_DIR", "uploads")
+DEFAULT_JOURNAL_PATH = os.getenv("INGEST_JOURNAL_PATH", os.path.join(DEFAULT_SPOOL_DIR, "ingest_jobs.jsonl"))
+# Finished jobs kept for status queries, in memory and in the journal
+DEFAULT_MAX_FINISHED_JOBS = int(os.getenv("INGEST_MAX_FINISHED_JOBS", "1000"))
+# The journal is compacted once this many times max_finished lines were appended to it
+JOURNAL_COMPACT_FACTOR = 4
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+class JournalLocked(RuntimeError):
+    """Raised when another process owns the ingestion journal."""
+
+def format_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else None
+
+class IngestionJob:
+    """A document waiting to be, or being, ingested."""
+
+    def __init__(self, filename, path, id=None):
+        """Initialize the job.
+
+        Args:
+            filename (str): The name of the uploaded file.
+            path (str): Where the upload is spooled.
+            id (str): The job ID, generated if not given.
+        """
+        self.id = id or uuid.uuid4().hex
+        self.filename = filename
+        self.path = path
+        self.status = QUEUED
+        self.pages = 0
+        self.chunks = 0
+        self.vectors = 0
+        self.skipped = 0
+        self.attempts = 0
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_record(self):
+        """Serialize the job for the journal."""
+        return {
+            "id": self.id, "filename": self.filename, "path": self.path, "status": self.status,
+            "pages": self.pages, "chunks": self.chunks, "vectors": self.vectors, "skipped": self.skipped,
+            "attempts": self.attempts,
+            "error": self.error, "created_at": self.created_at, "started_at": self.started_at,
+            "finished_at": self.finished_at
+        }
+
+    @classmethod
+    def from_record(cls, record):
+        """Restore a job from its latest journal record."""
+        job = cls(record["filename"], record["path"], id=record["id"])
+        for key in ("status", "pages", "chunks", "vectors", "skipped", "attempts", "error", "created_at", "started_at", "finished_at"):
+            setattr(job, key, record.get(key, getattr(job, key)))
+        return job
+
+    def to_dict(self):
+        """Serialize the job's status and progress.
+
+        Returns:
+            dict: The status, progress counters and timings.
+        """
+        data = {
+            "job_id": self.id,
+            "filename": self.filename,
+            "status": self.status,
+            "pages_parsed": self.pages,
+            "chunks_embedded": self.chunks,
+            "vectors_written": self.vectors,
+            "chunks_skipped": self.skipped,
+            "attempts": self.attempts,
+            "created_at": format_timestamp(self.created_at),
+            "started_at": format_timestamp(self.started_at),
+            "finished_at": format_timestamp(self.finished_at),
+        }
+        if self.started_at:
+            data["duration"] = (self.finished_at or time.time()) - self.started_at
+        if self.error:
+            data["error"] = self.error
+        return data
+
+class IngestionQueue:
+    """Runs ingestion jobs on a bounded worker pool and journals their status."""
+
+    def __init__(self, ingest, spool_dir=DEFAULT_SPOOL_DIR, journal_path=DEFAULT_JOURNAL_PATH,
+                 max_workers=DEFAULT_INGEST_WORKERS, max_finished=DEFAULT_MAX_FINISHED_JOBS):
+        """Initialize the queue. Call resume() to pick up the jobs of a previous process.
+
+        Args:
+            ingest (callable): Ingests a job's spooled file. Called with the job and a progress
+                callback taking the pipeline's counters; returns the final counters.
+            spool_dir (str): Directory uploads are spooled to until they are ingested.
+            journal_path (str): File the job status changes are appended to.
+            max_workers (int): Maximum number of documents ingested at the same time.
+            max_finished (int): Maximum number of finished jobs kept for status queries.
+        """
+        self.ingest = ingest
+        self.spool_dir = spool_dir
+        self.journal_path = journal_path
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest-job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._journal_lock = threading.Lock()
+        # Lines appended to the journal since it was last compacted
+        self._appended = 0
+        self._owner_file = None
+        os.makedirs(spool_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(journal_path) or '.', exist_ok=True)
+
+    def submit(self, filename, save):
+        """Spool an upload and queue it for ingestion.
+
+        Args:
+            filename (str): The name of the uploaded file.
+            save (callable): Writes the upload to the path it is called with.
+
+        Returns:
+            IngestionJob: The queued job.
+        """
+        job_id = uuid.uuid4().hex
+        job = IngestionJob(filename, os.path.join(self.spool_dir, f"{job_id}.pdf"), id=job_id)
+        save(job.path)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._journal(job)
+        self._executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        """Get a job by ID.
+
+        Returns:
+            IngestionJob: The job, or None if it is unknown or was discarded.
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def counts(self):
+        """Get the number of tracked jobs by status."""
+        counts = {status: 0 for status in (QUEUED, RUNNING, SUCCEEDED, FAILED)}
+        with self._lock:
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs and optionally wait for the running ones to finish.
+
+        Args:
+            wait (bool): Whether to block until every queued and running job is done.
+        """
+        self._executor.shutdown(wait=wait)
+        if self._owner_file is not None:
+            # Closing the file releases the lock
+            self._owner_file.close()
+            self._owner_file = None
+
+    def _run(self, job):
+        job.status = RUNNING
+        job.attempts += 1
+        job.started_at = time.time()
+        job.pages = job.chunks = job.vectors = job.skipped = 0
+        self._journal(job)
+
+        def on_progress(counts):
+            job.pages, job.chunks, job.vectors = counts["pages"], counts["chunks"], counts["vectors"]
+            job.skipped = counts.get("skipped", 0)
+
+        try:
+            on_progress(self.ingest(job, on_progress))
+            job.status = SUCCEEDED
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+        job.finished_at = time.time()
+
+        # Journaled before the spooled file is removed; a crash in between only leaves the file behind
+        self._journal(job)
+        try:
+            os.remove(job.path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._prune()
+        if self._appended > JOURNAL_COMPACT_FACTOR * max(self.max_finished, 1):
+            self._compact()
+
+    def _journal(self, job):
+        """Append the job's current state to the journal."""
+        line = json.dumps(job.to_record()) + "\n"
+        with self._journal_lock:
+            with open(self.journal_path, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self._appended += 1
+
+    def _compact(self):
+        """Rewrite the journal with one record per tracked job."""
+        with self._journal_lock:
+            # Records are taken from the live jobs while appends wait, so none is newer than the rewrite
+            with self._lock:
+                records = [job.to_record() for job in self._jobs.values()]
+            with open(self.journal_path + '.tmp', 'w') as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(self.journal_path + '.tmp', self.journal_path)
+            self._appended = 0
+
+    def resume(self):
+        """Replay the journal, compact it, and queue the jobs that never finished.
+
+        Returns:
+            int: The number of jobs queued again.
+
+        Raises:
+            JournalLocked: Another process owns the journal, e.g. another worker of a multi-process server.
+        """
+        self._own_journal()
+        records = OrderedDict()
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    records[record["id"]] = record
+
+        resumed = []
+        with self._lock:
+            for record in records.values():
+                job = IngestionJob.from_record(record)
+                spooled = os.path.exists(job.path)
+                if job.status in FINISHED_STATUSES:
+                    if spooled:
+                        os.remove(job.path)
+                elif spooled:
+                    job.status = QUEUED
+                    resumed.append(job)
+                else:
+                    job.status = FAILED
+                    job.error = "The spooled upload was lost before it was ingested"
+                    job.finished_at = time.time()
+                self._jobs[job.id] = job
+            self._prune()
+
+        self._compact()
+
+        for job in resumed:
+            self._executor.submit(self._run, job)
+        return len(resumed)
+
+    def _own_journal(self):
+        """Take the journal's exclusive lock, unless this queue already holds it."""
+        if self._owner_file is not None:
+            return
+        owner_file = open(self.journal_path + '.lock', 'a+')
+        try:
+            if fcntl is not None:
+                fcntl.flock(owner_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(owner_file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            owner_file.close()
+            raise JournalLocked(
+                f"The ingestion journal {self.journal_path} is owned by another process; "
+                "run the app in a single worker process"
+            )
+        self._owner_file = owner_file
+
+    def _prune(self):
+        """Discard the oldest finished jobs beyond max_finished. Caller holds the lock."""
+        finished = [job for job in self._jobs.values() if job.status in FINISHED_STATUSES]
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job.id]
@@ -0,0 +1,214 @@
+"""In-process vector store backed by a NumPy matrix.
+
+Vectors are normalized and kept as the rows of one contiguous float32 matrix,
+so a query is a single matrix-vector product (cosine similarity) followed by
+argpartition to pick the top k without sorting every score. IDs, chunk texts
+and metadata are kept in lists parallel to the matrix rows.
+
+The store lives in a directory holding a snapshot (snapshot.npz) and a
+journal of the upserts made since (upserts.jsonl). Every upsert is appended
+to the journal and synced before it is applied, so a crash loses nothing;
+on startup the journal is replayed on top of the snapshot. Once the journal
+holds LOCAL_VECTOR_STORE_COMPACT_EVERY records, the matrix is snapshotted and
+the journal emptied.
+"""
+import json
+import os
+import threading
+import numpy as np
+from vector_store import SearchResult, VectorStore
+
+DEFAULT_STORE_PATH = os.getenv("LOCAL_VECTOR_STORE_PATH", os.path.join("db", "local_vectors"))
+# Journaled upserts before the matrix is snapshotted
+DEFAULT_COMPACT_EVERY = int(os.getenv("LOCAL_VECTOR_STORE_COMPACT_EVERY", "10000"))
+
+# Rows allocated for the first vectors; the matrix doubles whenever it is full
+INITIAL_CAPACITY = 1024
+
+def normalize(vectors):
+    """Scale vectors (the rows of a matrix, or a single vector) to unit length."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class LocalVectorStore(VectorStore):
+    """Vector store held in memory and persisted to a local directory."""
+
+    def __init__(self, embeddings, path=DEFAULT_STORE_PATH, text_key="text", compact_every=DEFAULT_COMPACT_EVERY):
+        """Open the store, loading its snapshot and replaying its journal.
+
+        Args:
+            embeddings (Embeddings): The embedding model queries are embedded with.
+            path (str): The directory the snapshot and journal are kept in.
+            text_key (str): The metadata key the chunk text is stored under.
+            compact_every (int): Journaled upserts before the matrix is snapshotted.
+        """
+        self.embeddings = embeddings
+        self.path = path
+        self.name = f"local:{os.path.abspath(path)}"
+        self.text_key = text_key
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(path, "snapshot.npz")
+        self.journal_path = os.path.join(path, "upserts.jsonl")
+
+        self._vectors = None
+        self._size = 0
+        self._ids = []
+        self._texts = []
+        self._metadata = []
+        self._rows = {}
+        self._journaled = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        self._load()
+
+    def upsert(self, records):
+        records = list(records)
+        if not records:
+            return
+        with self._lock:
+            # Checked before journaling, so a rejected upsert is never replayed
+            vectors = self._normalized(records)
+            self._journal(records)
+            self._apply(records, vectors)
+            self._journaled += len(records)
+            if self._journaled >= self.compact_every:
+                self._snapshot()
+
+    def search(self, query, k=5):
+        query_vector = normalize(np.asarray(self.embeddings.embed_query(query), dtype=np.float32))
+        with self._lock:
+            if self._size == 0 or k <= 0:
+                return []
+            scores = self._vectors[:self._size] @ query_vector
+            if k < self._size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(self._size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                SearchResult(self._ids[row], self._texts[row], dict(self._metadata[row]), float(scores[row]))
+                for row in top
+            ]
+
+    def count(self):
+        with self._lock:
+            return self._size
+
+    def clear(self):
+        with self._lock:
+            self._vectors = None
+            self._size = 0
+            self._ids = []
+            self._texts = []
+            self._metadata = []
+            self._rows = {}
+            # An empty snapshot also empties the journal
+            self._snapshot()
+
+    def snapshot(self):
+        """Write the matrix and its metadata to disk and empty the journal."""
+        with self._lock:
+            self._snapshot()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": "local",
+                "path": self.path,
+                "vectors": self._size,
+                "dimension": self._vectors.shape[1] if self._vectors is not None else None,
+                "journaled": self._journaled
+            }
+
+    def _normalized(self, records):
+        """Get the normalized vectors of records as a matrix, checking their dimension. Caller holds the lock."""
+        vectors = normalize(np.asarray([vector for _, vector, _ in records], dtype=np.float32))
+        if self._vectors is not None and vectors.shape[1] != self._vectors.shape[1]:
+            raise ValueError(f"Expected vectors of dimension {self._vectors.shape[1]}, got {vectors.shape[1]}")
+        return vectors
+
+    def _apply(self, records, vectors):
+        """Write records and their normalized vectors to the matrix and the parallel lists. Caller holds the lock."""
+        if self._vectors is None:
+            self._vectors = np.empty((INITIAL_CAPACITY, vectors.shape[1]), dtype=np.float32)
+
+        rows = []
+        for id, _, metadata in records:
+            metadata = dict(metadata)
+            text = metadata.pop(self.text_key, "")
+            row = self._rows.get(id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._rows[id] = row
+                self._ids.append(id)
+                self._texts.append(text)
+                self._metadata.append(metadata)
+            else:
+                self._texts[row] = text
+                self._metadata[row] = metadata
+            rows.append(row)
+
+        self._reserve(self._size)
+        self._vectors[rows] = vectors
+
+    def _reserve(self, size):
+        """Grow the matrix to hold at least size rows. Caller holds the lock."""
+        capacity = self._vectors.shape[0]
+        if size <= capacity:
+            return
+        grown = np.empty((max(size, capacity * 2), self._vectors.shape[1]), dtype=np.float32)
+        grown[:capacity] = self._vectors
+        self._vectors = grown
+
+    def _journal(self, records):
+        """Append records to the journal. Caller holds the lock."""
+        with open(self.journal_path, 'a') as f:
+            for id, vector, metadata in records:
+                f.write(json.dumps({"id": id, "vector": [float(x) for x in vector], "metadata": metadata}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _snapshot(self):
+        """Write the snapshot, then empty the journal. Caller holds the lock."""
+        vectors = self._vectors[:self._size] if self._vectors is not None else np.empty((0, 0), dtype=np.float32)
+        # Stored as JSON bytes rather than object arrays, so loading needs no pickle
+        records = json.dumps({"ids": self._ids, "texts": self._texts, "metadata": self._metadata}).encode('utf-8')
+        with open(self.snapshot_path + '.tmp', 'wb') as f:
+            np.savez(f, vectors=vectors, records=np.frombuffer(records, dtype=np.uint8))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.snapshot_path + '.tmp', self.snapshot_path)
+        # A crash before this only replays upserts already in the snapshot, which is harmless
+        open(self.journal_path, 'w').close()
+        self._journaled = 0
+
+    def _load(self):
+        """Load the snapshot and replay the journal. Called before the store is shared."""
+        if os.path.exists(self.snapshot_path):
+            with np.load(self.snapshot_path, allow_pickle=False) as data:
+                vectors = data["vectors"]
+                records = json.loads(data["records"].tobytes().decode('utf-8'))
+            if len(vectors):
+                self._vectors = np.array(vectors, dtype=np.float32)
+                self._size = len(vectors)
+                self._ids = records["ids"]
+                self._texts = records["texts"]
+                self._metadata = records["metadata"]
+                self._rows = {id: row for row, id in enumerate(self._ids)}
+
+        if os.path.exists(self.journal_path):
+            records = []
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A line cut short by a crash
+                        continue
+                    records.append((record["id"], record["vector"], record["metadata"]))
+            if records:
+                self._apply(records, self._normalized(records))
+            self._journaled = len(records)
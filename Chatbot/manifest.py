@@ -0,0 +1,137 @@
+"""Manifest of the documents and chunks already written to a vector index.
+
+Documents are identified by the SHA-256 of their file and chunks by the
+SHA-256 of their text, which is also used as the chunk's vector ID. Uploading
+a document again is therefore skipped entirely, and chunks shared between
+documents (boilerplate pages, repeated sections) are embedded and written
+only once. Entries are scoped by index name, so switching to another index
+starts from an empty manifest.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MANIFEST_PATH = os.getenv("INGEST_MANIFEST_PATH", os.path.join("db", "ingest_manifest.sqlite3"))
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS documents ("
+    "index_name TEXT, document_hash TEXT, filename TEXT, chunks INTEGER, indexed_at REAL, "
+    "PRIMARY KEY (index_name, document_hash))",
+    "CREATE TABLE IF NOT EXISTS chunks ("
+    "index_name TEXT, chunk_id TEXT, indexed_at REAL, "
+    "PRIMARY KEY (index_name, chunk_id))",
+]
+
+# SQLite limits the number of parameters of a statement
+LOOKUP_BATCH_SIZE = 500
+
+def chunk_id(text):
+    """Get the deterministic vector ID of a chunk's text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def hash_file(path, block_size=1024 * 1024):
+    """Get the SHA-256 hex digest of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class IngestManifest:
+    """SQLite-backed record of the documents and chunks written to one vector index."""
+
+    def __init__(self, index_name, path=DEFAULT_MANIFEST_PATH):
+        """Open the manifest, creating the database if needed.
+
+        Args:
+            index_name (str): The vector index the entries belong to.
+            path (str): The SQLite database file, or ":memory:".
+        """
+        self.index_name = index_name
+        self.path = path
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    def get_document(self, document_hash):
+        """Look up an indexed document.
+
+        Returns:
+            dict: The filename, chunk count and indexing time, or None if the document was never fully indexed.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT filename, chunks, indexed_at FROM documents WHERE index_name = ? AND document_hash = ?",
+                (self.index_name, document_hash)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"filename": row[0], "chunks": row[1], "indexed_at": row[2]}
+
+    def add_document(self, document_hash, filename, chunks):
+        """Record a document whose chunks were all written.
+
+        Args:
+            document_hash (str): The SHA-256 of the document file.
+            filename (str): The name it was uploaded as.
+            chunks (int): The number of chunks it was split into.
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documents (index_name, document_hash, filename, chunks, indexed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.index_name, document_hash, filename, chunks, time.time())
+            )
+
+    def indexed_chunks(self, chunk_ids):
+        """Find which chunks are already written.
+
+        Args:
+            chunk_ids (list): Chunk IDs as returned by chunk_id.
+
+        Returns:
+            set: The IDs among chunk_ids that are in the index.
+        """
+        found = set()
+        chunk_ids = list(chunk_ids)
+        with self._lock:
+            for start in range(0, len(chunk_ids), LOOKUP_BATCH_SIZE):
+                batch = chunk_ids[start:start + LOOKUP_BATCH_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT chunk_id FROM chunks WHERE index_name = ? AND chunk_id IN ({','.join('?' * len(batch))})",
+                    [self.index_name] + batch
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def add_chunks(self, chunk_ids):
+        """Record chunks whose vectors were written."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO chunks (index_name, chunk_id, indexed_at) VALUES (?, ?, ?)",
+                [(self.index_name, id, now) for id in chunk_ids]
+            )
+
+    def clear(self):
+        """Forget every entry of this index, e.g. after the index was emptied."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM documents WHERE index_name = ?", (self.index_name,))
+            self._conn.execute("DELETE FROM chunks WHERE index_name = ?", (self.index_name,))
+
+    def stats(self):
+        """Get the number of indexed documents and chunks."""
+        with self._lock:
+            documents = self._conn.execute(
+                "SELECT COUNT(*) FROM documents WHERE index_name = ?", (self.index_name,)).fetchone()[0]
+            chunks = self._conn.execute(
+                "SELECT COUNT(*) FROM chunks WHERE index_name = ?", (self.index_name,)).fetchone()[0]
+        return {"documents": documents, "chunks": chunks}
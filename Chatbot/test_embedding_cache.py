@@ -0,0 +1,97 @@
+import asyncio
+import os
+import tempfile
+from langchain_core.embeddings import Embeddings
+from embedding_cache import CachedEmbeddings, EmbeddingStore
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.embedded = []
+        self.queries = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text):
+        self.queries.append(text)
+        return [float(len(text)), -0.5]
+
+    async def aembed_documents(self, texts):
+        return self.embed_documents(texts)
+
+    async def aembed_query(self, text):
+        return self.embed_query(text)
+
+def test_only_new_texts_are_embedded():
+    model = FakeEmbeddings()
+    cached = CachedEmbeddings(model, EmbeddingStore(":memory:"), "fake-model")
+
+    assert cached.embed_documents(["alpha", "beta", "alpha"]) == [[5.0, 0.5], [4.0, 0.5], [5.0, 0.5]]
+    assert model.embedded == ["alpha", "beta"]
+
+    assert cached.embed_documents(["beta", "gamma"]) == [[4.0, 0.5], [5.0, 0.5]]
+    assert model.embedded == ["alpha", "beta", "gamma"]
+    stats = cached.store.stats()
+    assert stats["entries"] == 3 and stats["hits"] == 1 and stats["misses"] == 3
+
+def test_queries_models_and_documents_are_cached_separately():
+    store = EmbeddingStore(":memory:")
+    model = FakeEmbeddings()
+    cached = CachedEmbeddings(model, store, "fake-model")
+
+    cached.embed_documents(["alpha"])
+    assert cached.embed_query("alpha") == [5.0, -0.5]
+    assert cached.embed_query("alpha") == [5.0, -0.5]
+    assert model.queries == ["alpha"]
+
+    other = FakeEmbeddings()
+    CachedEmbeddings(other, store, "other-model").embed_documents(["alpha"])
+    assert other.embedded == ["alpha"]
+
+def test_cache_persists_across_restarts():
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "db", "embeddings.sqlite3")
+        CachedEmbeddings(FakeEmbeddings(), EmbeddingStore(path), "fake-model").embed_documents(["alpha", "beta"])
+
+        model = FakeEmbeddings()
+        store = EmbeddingStore(path)
+        assert CachedEmbeddings(model, store, "fake-model").embed_documents(["beta"]) == [[4.0, 0.5]]
+        assert model.embedded == []
+        assert store.stats()["bytes"] == 16
+
+def test_least_recently_used_vectors_are_evicted():
+    # Every vector is two float32 values, 8 bytes
+    store = EmbeddingStore(":memory:", max_bytes=16)
+    model = FakeEmbeddings()
+    cached = CachedEmbeddings(model, store, "fake-model")
+
+    cached.embed_documents(["alpha"])
+    cached.embed_documents(["beta"])
+    cached.embed_documents(["alpha"])
+    cached.embed_documents(["gamma"])
+
+    stats = store.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 16 and stats["evictions"] == 1
+    cached.embed_documents(["alpha", "beta"])
+    assert model.embedded == ["alpha", "beta", "gamma", "beta"]
+
+def test_async_calls_share_the_cache():
+    model = FakeEmbeddings()
+    cached = CachedEmbeddings(model, EmbeddingStore(":memory:"), "fake-model")
+    assert isinstance(cached, Embeddings)
+
+    cached.embed_documents(["alpha"])
+    assert asyncio.run(cached.aembed_documents(["alpha", "beta"])) == [[5.0, 0.5], [4.0, 0.5]]
+    assert model.embedded == ["alpha", "beta"]
+
+    assert asyncio.run(cached.aembed_query("gamma")) == cached.embed_query("gamma") == [5.0, -0.5]
+    assert model.queries == ["gamma"]
+
+if __name__ == "__main__":
+    test_only_new_texts_are_embedded()
+    test_queries_models_and_documents_are_cached_separately()
+    test_cache_persists_across_restarts()
+    test_least_recently_used_vectors_are_evicted()
+    test_async_calls_share_the_cache()
+    print("✅ All embedding cache tests passed!")
@@ -0,0 +1,97 @@
+import threading
+from ingest import IngestionPipeline
+from manifest import IngestManifest, chunk_id
+
+class Doc:
+    def __init__(self, page_content, metadata):
+        self.page_content = page_content
+        self.metadata = metadata
+
+class WordSplitter:
+    """Splits every page into one chunk per word."""
+
+    def split_documents(self, documents):
+        return [Doc(word, dict(doc.metadata)) for doc in documents for word in doc.page_content.split()]
+
+class FakeEmbeddings:
+    def __init__(self, fail_after=None):
+        self.calls = 0
+        self.fail_after = fail_after
+
+    def embed_documents(self, texts):
+        self.calls += 1
+        if self.fail_after is not None and self.calls > self.fail_after:
+            raise RuntimeError("quota exceeded")
+        return [[float(len(text))] for text in texts]
+
+def pages(count, produced=None):
+    for number in range(count):
+        if produced is not None:
+            produced.append(number)
+        yield Doc(f"alpha{number} beta{number} gamma{number}", {"source": "report.pdf", "page": number})
+
+def test_every_chunk_is_embedded_and_written():
+    written = []
+    lock = threading.Lock()
+
+    def upsert(vectors):
+        with lock:
+            written.extend(vectors)
+
+    pipeline = IngestionPipeline(WordSplitter(), FakeEmbeddings(), upsert, embed_batch_size=4, upsert_batch_size=3)
+    counts = pipeline.run(pages(10))
+
+    assert counts == {"pages": 10, "chunks": 30, "vectors": 30, "skipped": 0}
+    assert len({vector_id for vector_id, _, _ in written}) == 30
+    _, vector, metadata = written[0]
+    assert vector == [6.0] and metadata == {"source": "report.pdf", "page": 0, "text": "alpha0"}
+
+def test_indexed_and_repeated_chunks_are_skipped():
+    written = []
+    manifest = IngestManifest("test", path=":memory:")
+    pipeline = IngestionPipeline(WordSplitter(), FakeEmbeddings(), written.extend, manifest=manifest, embed_batch_size=4)
+
+    pages_with_repeats = [Doc("alpha beta alpha", {"page": 0}), Doc("beta gamma", {"page": 1})]
+    assert pipeline.run(pages_with_repeats) == {"pages": 2, "chunks": 3, "vectors": 3, "skipped": 2}
+    assert sorted(id for id, _, _ in written) == sorted(chunk_id(word) for word in ("alpha", "beta", "gamma"))
+
+    # Uploading the same content again writes nothing
+    assert pipeline.run(pages_with_repeats) == {"pages": 2, "chunks": 0, "vectors": 0, "skipped": 5}
+    assert len(written) == 3 and manifest.stats()["chunks"] == 3
+
+def test_parsing_waits_for_a_slow_upserter():
+    produced = []
+    release = threading.Event()
+
+    def upsert(vectors):
+        release.wait()
+
+    pipeline = IngestionPipeline(WordSplitter(), FakeEmbeddings(), upsert, embed_batch_size=3, upsert_batch_size=3, queue_size=1)
+    runner = threading.Thread(target=pipeline.run, args=(pages(1000, produced),))
+    runner.start()
+    runner.join(0.5)
+
+    # Only a few batches fit between the stages while the upserter is stuck
+    assert len(produced) < 10
+    release.set()
+    runner.join()
+    assert len(produced) == 1000
+
+def test_a_failing_stage_stops_the_pipeline():
+    produced = []
+    pipeline = IngestionPipeline(WordSplitter(), FakeEmbeddings(fail_after=2), lambda vectors: None,
+                                 embed_batch_size=3, queue_size=1)
+    try:
+        pipeline.run(pages(1000, produced))
+    except RuntimeError as e:
+        assert str(e) == "quota exceeded"
+    else:
+        raise AssertionError("the embedding error should be raised")
+    assert len(produced) < 1000
+
+if __name__ == "__main__":
+    test_every_chunk_is_embedded_and_written()
+    test_indexed_and_repeated_chunks_are_skipped()
+    test_parsing_waits_for_a_slow_upserter()
+    test_a_failing_stage_stops_the_pipeline()
+    print("✅ All ingestion tests passed!")
@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from ingest_jobs import IngestionQueue, JournalLocked, SUCCEEDED, FAILED
+
+def wait_for(queue, job_id, status, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job is not None and job.status == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not reach {status}")
+
+def save_pdf(path):
+    with open(path, 'wb') as f:
+        f.write(b"%PDF-1.4 fake")
+
+def test_uploads_are_ingested_in_the_background():
+    with tempfile.TemporaryDirectory() as root:
+        def ingest(job, on_progress):
+            on_progress({"pages": 1, "chunks": 0, "vectors": 0})
+            return {"pages": 2, "chunks": 5, "vectors": 5}
+
+        queue = IngestionQueue(ingest, spool_dir=root, journal_path=os.path.join(root, "journal.jsonl"))
+        job = queue.submit("report.pdf", save_pdf)
+        status = wait_for(queue, job.id, SUCCEEDED).to_dict()
+
+        assert (status["pages_parsed"], status["chunks_embedded"], status["vectors_written"]) == (2, 5, 5)
+        assert not os.path.exists(job.path)
+
+def test_failures_are_reported():
+    with tempfile.TemporaryDirectory() as root:
+        def ingest(job, on_progress):
+            raise RuntimeError("quota exceeded")
+
+        queue = IngestionQueue(ingest, spool_dir=root, journal_path=os.path.join(root, "journal.jsonl"))
+        job = queue.submit("report.pdf", save_pdf)
+        assert wait_for(queue, job.id, FAILED).to_dict()["error"] == "quota exceeded"
+
+def test_unfinished_jobs_are_resumed_after_a_restart():
+    with tempfile.TemporaryDirectory() as root:
+        journal = os.path.join(root, "journal.jsonl")
+        started = threading.Event()
+        never = threading.Event()
+
+        def stuck(job, on_progress):
+            started.set()
+            never.wait(5)
+            raise RuntimeError("worker stopped")
+
+        # The first process dies while the job is running
+        first = IngestionQueue(stuck, spool_dir=root, journal_path=journal, max_workers=1)
+        job = first.submit("report.pdf", save_pdf)
+        started.wait(5)
+
+        ingested = []
+        second = IngestionQueue(lambda job, on_progress: ingested.append(job.id) or {"pages": 1, "chunks": 1, "vectors": 1},
+                                spool_dir=root, journal_path=journal)
+        assert second.resume() == 1
+        resumed = wait_for(second, job.id, SUCCEEDED)
+        assert ingested == [job.id] and resumed.attempts == 2
+
+        with open(journal) as f:
+            records = [json.loads(line) for line in f]
+        assert records[0]["status"] == "queued" and records[-1]["status"] == SUCCEEDED
+
+        # Let the first queue's worker finish before the directory is removed
+        never.set()
+        first.shutdown()
+
+def test_a_journal_is_owned_by_one_queue():
+    with tempfile.TemporaryDirectory() as root:
+        journal = os.path.join(root, "journal.jsonl")
+        owner = IngestionQueue(lambda job, on_progress: {}, spool_dir=root, journal_path=journal)
+        assert owner.resume() == 0
+
+        other = IngestionQueue(lambda job, on_progress: {}, spool_dir=root, journal_path=journal)
+        try:
+            other.resume()
+        except JournalLocked:
+            pass
+        else:
+            raise AssertionError("a second queue should not resume an owned journal")
+
+        owner.shutdown()
+        assert other.resume() == 0
+        other.shutdown()
+
+def test_the_journal_is_compacted_while_jobs_run():
+    with tempfile.TemporaryDirectory() as root:
+        journal = os.path.join(root, "journal.jsonl")
+        queue = IngestionQueue(lambda job, on_progress: {"pages": 1, "chunks": 1, "vectors": 1},
+                               spool_dir=root, journal_path=journal, max_workers=1, max_finished=2)
+        # Each job appends three lines: queued, running and succeeded
+        jobs = []
+        for index in range(20):
+            jobs.append(queue.submit(f"report{index}.pdf", save_pdf))
+            wait_for(queue, jobs[-1].id, SUCCEEDED)
+        queue.shutdown()
+
+        with open(journal) as f:
+            records = [json.loads(line) for line in f]
+        assert len(records) <= 4 * 2 + 3
+        assert jobs[-1].id in {record["id"] for record in records}
+
+        restarted = IngestionQueue(lambda job, on_progress: {}, spool_dir=root, journal_path=journal)
+        assert restarted.resume() == 0
+        assert restarted.get(jobs[-1].id).status == SUCCEEDED
+        assert restarted.get(jobs[0].id) is None
+        restarted.shutdown()
+
+if __name__ == "__main__":
+    test_uploads_are_ingested_in_the_background()
+    test_failures_are_reported()
+    test_unfinished_jobs_are_resumed_after_a_restart()
+    test_a_journal_is_owned_by_one_queue()
+    test_the_journal_is_compacted_while_jobs_run()
+    print("✅ All ingestion job tests passed!")
@@ -0,0 +1,105 @@
+import os
+import tempfile
+from local_vector_store import LocalVectorStore
+
+class FakeEmbeddings:
+    """Embeds a query by looking it up among known vectors."""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_query(self, text):
+        return self.vectors[text]
+
+QUERIES = {"north": [0.0, 1.0, 0.0], "east": [1.0, 0.0, 0.0], "up": [0.0, 0.0, 1.0]}
+
+def record(id, vector, text, page=0):
+    return (id, vector, {"text": text, "page": page})
+
+def test_results_are_ranked_by_cosine_similarity():
+    with tempfile.TemporaryDirectory() as tempdir:
+        store = LocalVectorStore(FakeEmbeddings(QUERIES), path=tempdir)
+        store.upsert([
+            record("a", [0.0, 10.0, 0.0], "due north"),
+            record("b", [1.0, 1.0, 0.0], "north east"),
+            record("c", [3.0, 0.0, 0.0], "due east"),
+            record("d", [0.0, -1.0, 0.0], "due south"),
+        ])
+
+        results = store.search("north", k=2)
+        assert [result.id for result in results] == ["a", "b"]
+        assert results[0].text == "due north" and results[0].metadata == {"page": 0}
+        assert abs(results[0].score - 1.0) < 1e-6 and abs(results[1].score - 0.5 ** 0.5) < 1e-6
+
+        assert [result.id for result in store.search("east", k=10)] == ["c", "b", "a", "d"]
+        assert store.search("north", k=0) == []
+
+def test_upserting_an_id_again_replaces_its_vector():
+    with tempfile.TemporaryDirectory() as tempdir:
+        store = LocalVectorStore(FakeEmbeddings(QUERIES), path=tempdir)
+        store.upsert([record("a", [0.0, 1.0, 0.0], "old")])
+        store.upsert([record("a", [0.0, 0.0, 1.0], "new")])
+
+        assert store.stats()["vectors"] == 1
+        result, = store.search("up", k=5)
+        assert result.text == "new" and abs(result.score - 1.0) < 1e-6
+
+def test_matrix_grows_past_its_initial_capacity():
+    with tempfile.TemporaryDirectory() as tempdir:
+        store = LocalVectorStore(FakeEmbeddings(QUERIES), path=tempdir, compact_every=1000000)
+        store.upsert([record(str(i), [1.0, i / 5000.0, 0.0], f"chunk {i}") for i in range(3000)])
+
+        assert store.stats()["vectors"] == 3000
+        assert [result.id for result in store.search("north", k=3)] == ["2999", "2998", "2997"]
+
+def test_store_is_restored_from_snapshot_and_journal():
+    with tempfile.TemporaryDirectory() as tempdir:
+        path = os.path.join(tempdir, "db", "local_vectors")
+        store = LocalVectorStore(FakeEmbeddings(QUERIES), path=path, compact_every=2)
+        store.upsert([record("a", [0.0, 1.0, 0.0], "due north"), record("b", [1.0, 0.0, 0.0], "due east")])
+        assert store.stats()["journaled"] == 0
+        store.upsert([record("c", [0.0, 0.0, 1.0], "straight up", page=3)])
+        assert store.stats()["journaled"] == 1
+
+        # The snapshot holds a and b, the journal holds c
+        restored = LocalVectorStore(FakeEmbeddings(QUERIES), path=path, compact_every=2)
+        assert restored.stats()["vectors"] == 3
+        assert restored.search("north", k=1)[0].id == "a"
+        up, = restored.search("up", k=1)
+        assert (up.id, up.text, up.metadata) == ("c", "straight up", {"page": 3})
+
+        restored.snapshot()
+        assert LocalVectorStore(FakeEmbeddings(QUERIES), path=path).stats()["vectors"] == 3
+
+def test_vectors_of_another_dimension_are_rejected():
+    with tempfile.TemporaryDirectory() as tempdir:
+        store = LocalVectorStore(FakeEmbeddings(QUERIES), path=tempdir)
+        store.upsert([record("a", [0.0, 1.0, 0.0], "due north")])
+        try:
+            store.upsert([record("b", [1.0, 0.0], "flat")])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("a vector of another dimension should be rejected")
+
+def test_clearing_empties_the_store_on_disk():
+    with tempfile.TemporaryDirectory() as tempdir:
+        store = LocalVectorStore(FakeEmbeddings(QUERIES), path=tempdir)
+        store.upsert([record("a", [0.0, 1.0, 0.0], "due north")])
+        store.clear()
+
+        assert store.count() == 0 and store.search("north") == []
+        restored = LocalVectorStore(FakeEmbeddings(QUERIES), path=tempdir)
+        assert restored.count() == 0
+        # A cleared store accepts vectors of another dimension, e.g. after switching models
+        restored.upsert([record("b", [1.0, 0.0], "flat")])
+        assert restored.count() == 1
+
+if __name__ == "__main__":
+    test_results_are_ranked_by_cosine_similarity()
+    test_upserting_an_id_again_replaces_its_vector()
+    test_matrix_grows_past_its_initial_capacity()
+    test_store_is_restored_from_snapshot_and_journal()
+    test_vectors_of_another_dimension_are_rejected()
+    test_clearing_empties_the_store_on_disk()
+    print("✅ All local vector store tests passed!")
@@ -0,0 +1,94 @@
+"""Vector store backends the chatbot writes chunks to and searches.
+
+The backend is chosen with the VECTOR_STORE environment variable:
+
+    pinecone  The hosted Pinecone index (default).
+    local     LocalVectorStore, an in-process NumPy index persisted under db/,
+              for deployments without network access to Pinecone.
+
+Every backend takes chunks as (id, vector, metadata) records, with the chunk
+text stored in the metadata under text_key, and answers queries with
+SearchResult tuples ordered by decreasing similarity.
+"""
+import os
+from collections import namedtuple
+
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE", "pinecone").lower()
+BACKENDS = ("pinecone", "local")
+
+SearchResult = namedtuple("SearchResult", ["id", "text", "metadata", "score"])
+
+class VectorStore:
+    """Interface of the vector store backends."""
+
+    # Scopes the ingestion manifest, so each store has its own record of indexed chunks
+    name = None
+
+    def upsert(self, records):
+        """Write vectors, replacing those with the same ID.
+
+        Args:
+            records (list): (id, vector, metadata) tuples, with the chunk text in the metadata.
+        """
+        raise NotImplementedError
+
+    def search(self, query, k=5):
+        """Find the chunks most similar to a query.
+
+        Args:
+            query (str): The query text.
+            k (int): The maximum number of results.
+
+        Returns:
+            list: SearchResult tuples, most similar first.
+        """
+        raise NotImplementedError
+
+    def count(self):
+        """Get the number of vectors in the store."""
+        raise NotImplementedError
+
+    def clear(self):
+        """Delete every vector in the store."""
+        raise NotImplementedError
+
+    def stats(self):
+        """Get the backend name and a summary of its contents."""
+        raise NotImplementedError
+
+class PineconeStore(VectorStore):
+    """A Pinecone index, searched through LangChain's PineconeVectorStore."""
+
+    def __init__(self, index, embeddings, index_name, text_key="text"):
+        """Wrap a connected Pinecone index.
+
+        Args:
+            index (Index): The Pinecone index.
+            embeddings (Embeddings): The embedding model queries are embedded with.
+            index_name (str): The index's name.
+            text_key (str): The metadata key the chunk text is stored under.
+        """
+        from langchain_pinecone import PineconeVectorStore
+
+        self.index = index
+        self.name = index_name
+        self._store = PineconeVectorStore(index=index, embedding=embeddings, text_key=text_key)
+
+    def upsert(self, records):
+        self.index.upsert(vectors=records)
+
+    def search(self, query, k=5):
+        return [
+            SearchResult(getattr(doc, "id", None), doc.page_content, doc.metadata, score)
+            for doc, score in self._store.similarity_search_with_score(query, k=k)
+        ]
+
+    def count(self):
+        stats = self.index.describe_index_stats()
+        return stats["total_vector_count"] if isinstance(stats, dict) else stats.total_vector_count
+
+    def clear(self):
+        self.index.delete(delete_all=True)
+
+    def stats(self):
+        return {"backend": "pinecone", "index": self.name}